@@ -7,18 +7,179 @@ import zipfile
 import json
 import shutil
 import tkinter as tk
-from tkinter import ttk, filedialog, messagebox
+from tkinter import ttk, filedialog, messagebox, simpledialog
 import re
 import hashlib
 import configparser
 import ssl
 import certifi
+import argparse
+import http.server
+import http.client
+import urllib.parse
+import urllib.error
+import threading
+import time
+import collections
+import contextlib
+import cProfile
+import pstats
+import tracemalloc
+import mmap
+import marshal
+import queue
+import concurrent.futures
+import tarfile
+import tempfile
+import itertools
+import random
 
 # Define constants for directories and URLs
 MINECRAFT_DIR = os.path.expanduser("~/.minecraft")
 VERSIONS_DIR = os.path.join(MINECRAFT_DIR, "versions")
-JAVA_DIR = os.path.expanduser("~/.catlauncher/java")
+NATIVES_STORE_DIR = os.path.join(MINECRAFT_DIR, "natives-store")  # extracted natives jars, one dir per jar SHA1
+INSTANCES_DIR = os.path.join(MINECRAFT_DIR, "instances")
+DEFAULT_INSTANCE = "Default"
+INSTANCE_SUBDIRS = ["saves", "config", "mods", "resourcepacks", "screenshots"]
+INSTANCE_LOCK_NAME = ".instance.lock"
+
+# Dedicated servers, one directory per named server
+SERVERS_DIR = os.path.join(MINECRAFT_DIR, "servers")
+SERVER_SETTINGS_NAME = "catlauncher_server.json"
+SERVER_PROPERTIES_TEMPLATE = [
+    ("motd", "A CatLauncher server"),
+    ("server-port", "25565"),
+    ("max-players", "20"),
+    ("online-mode", "true"),
+    ("difficulty", "easy"),
+    ("gamemode", "survival"),
+    ("view-distance", "10"),
+    ("simulation-distance", "10"),
+    ("sync-chunk-writes", "false"),
+    ("network-compression-threshold", "256"),
+    ("enable-rcon", "false"),
+]
+# G1 tuned for a long-running server heap: short pauses, early mixed collections, young gen sized for churn
+SERVER_STOP_TIMEOUT = 60
+SERVER_GC_FLAGS = [
+    "-XX:+UseG1GC", "-XX:+ParallelRefProcEnabled", "-XX:MaxGCPauseMillis=200",
+    "-XX:+UnlockExperimentalVMOptions", "-XX:+DisableExplicitGC", "-XX:+AlwaysPreTouch",
+    "-XX:G1NewSizePercent=30", "-XX:G1MaxNewSizePercent=40", "-XX:G1HeapRegionSize=8M",
+    "-XX:G1ReservePercent=20", "-XX:G1HeapWastePercent=5", "-XX:G1MixedGCCountTarget=4",
+    "-XX:InitiatingHeapOccupancyPercent=15", "-XX:G1MixedGCLiveThresholdPercent=90",
+    "-XX:G1RSetUpdatingPauseTimePercent=5", "-XX:SurvivorRatio=32", "-XX:+PerfDisableSharedMem",
+    "-XX:MaxTenuringThreshold=1", "-Xlog:gc*:file=logs/gc.log:time,uptime:filecount=5,filesize=1M",
+]
+CATLAUNCHER_DIR = os.path.expanduser("~/.catlauncher")
+JAVA_DIR = os.path.join(CATLAUNCHER_DIR, "java")
+CONFIG_PATH = os.path.join(CATLAUNCHER_DIR, "launcher.ini")
+MANIFEST_CACHE_PATH = os.path.join(CATLAUNCHER_DIR, "version_manifest.json")
+# Compact marshal caches of parsed metadata; bump METADATA_FORMAT when a record's fields change
+MANIFEST_COMPACT_PATH = os.path.join(CATLAUNCHER_DIR, "version_manifest.bin")
+METADATA_CACHE_DIR = os.path.join(CATLAUNCHER_DIR, "metadata")
+METADATA_FORMAT = 1
+DIAGNOSTICS_DIR = os.path.join(CATLAUNCHER_DIR, "diagnostics")
+RSS_HISTORY_PATH = os.path.join(CATLAUNCHER_DIR, "rss_history.json")
+LIVE_HEAP_HISTORY_PATH = os.path.join(CATLAUNCHER_DIR, "live_heap_history.json")
+RSS_HISTORY_LENGTH = 20
+SERVER_HISTORY_PREFIX = "server:"  # servers pre-touch a fixed heap, so their history is kept apart from clients'
+
+# Heap sizing: era floors keyed by the releaseTime each era starts (ISO dates compare as strings),
+# i.e. 1.18's taller worlds and 1.13's flattening
+MEMINFO_PATH = "/proc/meminfo"
+HEAP_ERA_BASELINE_MB = (("2021-11-30", 4096), ("2018-07-18", 3072), ("", 2048))
+HEAP_PER_MOD_MB = 64
+HEAP_NON_HEAP_MB = 768  # metaspace, code cache, thread stacks and native/GL buffers beyond -Xmx
+HEAP_LIVE_SET_FACTOR = 2.0  # heap per byte still live after a full or mixed collection
+HEAP_OS_RESERVE_MB = 2048
+HEAP_MIN_MB = 1024
+HEAP_MAX_MB = 16384
+SUPERVISOR_SAMPLE_INTERVAL = 2.0
+GAME_OUTPUT_TAIL = 200
+GAME_ALERT_LIMIT = 20
+GC_PAUSE_WARN_MS = 500.0
+RULE_IDENTITY_CACHE_SIZE = 16384
+# Pause lines on stdout for the log analyzer; every Java this launcher runs games with is 9+
+GC_LOG_FLAG = "-Xlog:gc:stdout"
+GC_LOG_LINE = re.compile(r"^\[[^\]]*\]\[\w+\s*\]\[gc\b")  # kept from on_output, e.g. a server console
+# "Pause Young (Mixed) ... 812M->402M(4096M) 9.1ms"; full and mixed collections leave roughly the live set
+GC_HEAP_AFTER = re.compile(r"(\d+)M->(\d+)M\(\d+M\)")
+HASH_CHUNK_SIZE = 8 * 1024 * 1024
+VERIFY_WORKERS = os.cpu_count() or 4
+BUNDLE_INDEX_NAME = "bundle.json"
+BUNDLE_FORMAT = 1
+INSTALL_JOURNAL_NAME = "install_journal.json"
+JOURNAL_FLUSH_EVERY = 16
+
+# Background integrity scrubbing; launcher.ini [integrity] can override the rate and age
+SCRUB_CACHE_PATH = os.path.join(CATLAUNCHER_DIR, "scrub_cache.json")
+SCRUB_RATE_MB = 32  # MiB/s of hashing while idle
+SCRUB_MAX_AGE_DAYS = 7.0  # re-hash unchanged files this often to catch bit rot
+SCRUB_START_DELAY = 120.0
+SCRUB_INTERVAL = 900.0
+SCRUB_IDLE_POLL = 5.0
+SCRUB_SAVE_EVERY = 64
+
 VERSION_MANIFEST_URL = "https://launchermeta.mojang.com/mc/game/version_manifest.json"
+MAVEN_DEFAULT_REPOSITORY = "https://libraries.minecraft.net/"
+MAVEN_COORDINATE = re.compile(r"([\w-]+(?:\.[\w-]+)*):([\w.+-]+):([\w.+-]+)(?::([\w.+-]+))?(?:@(\w+))?")
+ASSET_OBJECTS_URL = "https://resources.download.minecraft.net"
+NETWORK_TIMEOUT = 30
+
+# Fetch policy; launcher.ini [network] can override each of these
+FETCH_RETRIES = 3
+FETCH_BACKOFF = 0.5  # seconds, doubled per attempt and jittered
+FETCH_BACKOFF_MAX = 8.0
+BREAKER_THRESHOLD = 5  # consecutive failures before a host is skipped
+BREAKER_COOLDOWN = 30.0
+
+# Download scheduling: lower numbers run first
+PRIORITY_CRITICAL = 0  # client jar and classpath libraries
+PRIORITY_NATIVES = 1
+PRIORITY_BACKGROUND = 2  # assets, which may finish after the game has started
+DOWNLOAD_WORKERS = 8
+DOWNLOAD_CHUNK_SIZE = 256 * 1024
+
+# Bundled JDK used when no system Java 21 is found
+JDK_DIRNAME = "jdk-21.0.5+11"
+JDK_CHECKSUM_SUFFIX = ".sha256.txt"  # Adoptium publishes "<sha256>  <file name>" next to each archive
+STREAM_CHUNK_SIZE = 1024 * 1024
+JDK_URLS = {
+    "Windows": "https://github.com/adoptium/temurin21-binaries/releases/download/jdk-21.0.5%2B11/OpenJDK21U-jdk_x64_windows_hotspot_21.0.5_11.zip",
+    "Linux": "https://github.com/adoptium/temurin21-binaries/releases/download/jdk-21.0.5%2B11/OpenJDK21U-jdk_x64_linux_hotspot_21.0.5_11.tar.gz",
+    "Darwin": "https://github.com/adoptium/temurin21-binaries/releases/download/jdk-21.0.5%2B11/OpenJDK21U-jdk_x64_mac_hotspot_21.0.5_11.tar.gz",
+}
+
+# LAN mirror settings; a seeding machine serves its .minecraft tree under /<upstream host>/<path>
+MIRROR_PORT = 8765
+MIRROR_INDEX_REFRESH = 30  # Minimum seconds between index rebuilds triggered by misses
+MIRROR_HOSTS = [
+    "launchermeta.mojang.com",
+    "piston-meta.mojang.com",
+    "piston-data.mojang.com",
+    "launcher.mojang.com",
+    "libraries.minecraft.net",
+    "resources.download.minecraft.net",
+]
+
+# Milestones and trouble in game output, one named group per marker; checked with a single search per line
+GAME_LOG_MARKERS = re.compile("|".join([
+    r"(?P<lwjgl>Backend library: LWJGL|LWJGL Version)",
+    r"(?P<user>Setting user: )",
+    r"(?P<resource_reload>Reloading ResourceManager)",
+    r"(?P<main_menu>Sound engine started|Resource reload finished)",
+    r"(?P<server_ready>Done \(\d+(?:\.\d+)?s\)! For help)",
+    r"(?:Crash report saved to|This crash report has been saved to):?\s*(?:#@!@#\s*)?(?P<crash_report>\S.*?)\s*$",
+    r"(?P<oom>java\.lang\.OutOfMemoryError)",
+    r"\bPause\b.*?(?P<gc_pause>\d+(?:\.\d+)?)ms\s*$",
+]))
+# Plain substrings, one per marker; lines containing none of them skip the regex entirely
+GAME_LOG_KEYWORDS = ("LWJGL", "Setting user", "ResourceManager", "Sound engine", "Resource reload",
+                     "rash report", "OutOfMemoryError", "Pause", "Done (")
+
+# Metrics export; launcher.ini [metrics] sets textfile and/or port to enable it
+METRICS_INTERVAL = 15.0
+LAUNCH_PREP_BUCKETS = (0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
 
 # Define theme dictionaries
 DARK_THEME = {
@@ -54,611 +215,3930 @@ LIGHT_THEME = {
 # System theme follows OS preference (simplified to use Light as default if system detection fails)
 SYSTEM_THEME = LIGHT_THEME  # Fallback to light for TLauncher-like appearance
 
-class CatLauncherMCv2025(tk.Tk):
-    def __init__(self):
-        """Initialize the launcher window and UI."""
-        super().__init__()
-        self.title("CatLauncher 1.0")
-        self.geometry("600x400")
-        self.minsize(600, 400)
-        self.current_theme = LIGHT_THEME  # Default to light for TLauncher resemblance
-        self.configure(background=self.current_theme['bg'])
-        self.versions = {}  # Dictionary to store version IDs and their URLs
-        self.version_categories = {
-            "Latest Release": [],
-            "Latest Snapshot": [],
-            "Release": [],
-            "Snapshot": [],
-            "Old Beta": [],
-            "Old Alpha": []
-        }
-        
-        # Configure SSL context with multiple fallback options
-        self.setup_ssl_context()
-        
-        # Configure styles
-        self.style = ttk.Style()
-        self.style.theme_use('clam')
-        
-        self.init_ui()
-        self.update_theme()
+def load_launcher_config(path=CONFIG_PATH):
+    """Read launcher.ini; keys are URL prefixes, so only '=' separates and case is kept."""
+    config = configparser.ConfigParser(delimiters=("=",), interpolation=None)
+    config.optionxform = str
+    try:
+        config.read(path)
+    except configparser.Error:
+        pass
+    for section in ("mirror_rules", "network"):
+        if not config.has_section(section):
+            config.add_section(section)
+    return config
 
-    def setup_ssl_context(self):
-        """Setup SSL context with multiple fallback options for certificate verification."""
+def read_marshal_file(path):
+    """Load a marshal file through a read-only memory map; raises OSError or ValueError if unusable."""
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return marshal.loads(mapped)
+
+def write_marshal_file(path, value):
+    """Atomically replace path with value in marshal format."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.{threading.get_ident()}.tmp"
+    with open(temp_path, "wb") as f:
+        marshal.dump(value, f)
+    os.replace(temp_path, path)
+
+class ManifestEntry:
+    """One version listed in the manifest, holding only the fields the launcher reads."""
+    __slots__ = ("id", "type", "url", "sha1", "release_time")
+
+    def __init__(self, version_id, version_type, url, sha1=None, release_time=""):
+        self.id = version_id
+        self.type = version_type
+        self.url = url
+        self.sha1 = sha1
+        self.release_time = release_time
+
+class VersionManifest:
+    """Compact form of the version manifest, cached with marshal so startup need not re-parse the JSON."""
+    __slots__ = ("digest", "latest", "entries")
+
+    def __init__(self, digest, latest, entries):
+        self.digest = digest  # SHA1 of the raw manifest bytes this was parsed from
+        self.latest = latest
+        self.entries = entries
+
+    @classmethod
+    def from_json(cls, raw_manifest):
+        """Parse raw manifest bytes."""
+        manifest = json.loads(raw_manifest.decode())
+        entries = tuple(ManifestEntry(v["id"], v.get("type"), v.get("url"), v.get("sha1"), v.get("releaseTime", ""))
+                        for v in manifest["versions"])
+        return cls(hashlib.sha1(raw_manifest).hexdigest(), dict(manifest.get("latest", {})), entries)
+
+    def dump(self):
+        return (METADATA_FORMAT, self.digest, self.latest,
+                tuple((e.id, e.type, e.url, e.sha1, e.release_time) for e in self.entries))
+
+    @classmethod
+    def load(cls, value):
+        """Rebuild from dump()'s value; returns None for another format."""
+        if not isinstance(value, tuple) or not value or value[0] != METADATA_FORMAT:
+            return None
+        format_version, digest, latest, entries = value
+        return cls(digest, latest, tuple(ManifestEntry(*entry) for entry in entries))
+
+class LibraryRecord:
+    """A library's downloadable artifact and rules, as needed to build a classpath."""
+    __slots__ = ("name", "path", "url", "sha1", "size", "rules")
+
+    def __init__(self, name, path, url, sha1, size, rules):
+        self.name = name
+        self.path = path  # relative to the libraries directory
+        self.url = url
+        self.sha1 = sha1
+        self.size = size
+        self.rules = rules
+
+class VersionRecord:
+    """The launch-relevant subset of a resolved version profile.
+
+    signature lists (json path, mtime_ns, size) for every profile in the
+    inheritsFrom chain, so a record is reused only while none of them changed.
+    """
+    __slots__ = ("id", "type", "main_class", "release_time", "asset_index", "client_sha1", "client_size",
+                 "arguments", "minecraft_arguments", "libraries", "signature", "_allowed")
+
+    def __init__(self, version_id, version_type, main_class, release_time, asset_index, client_sha1, client_size,
+                 arguments, minecraft_arguments, libraries, signature):
+        self.id = version_id
+        self.type = version_type
+        self.main_class = main_class
+        self.release_time = release_time
+        self.asset_index = asset_index
+        self.client_sha1 = client_sha1
+        self.client_size = client_size
+        self.arguments = arguments
+        self.minecraft_arguments = minecraft_arguments
+        self.libraries = libraries
+        self.signature = signature
+        self._allowed = {}  # TargetPlatform -> allowed libraries
+
+    @classmethod
+    def from_profile(cls, version_id, data, signature):
+        """Build from a resolved profile as returned by load_version_data."""
+        client = data.get("downloads", {}).get("client", {})
+        libraries = []
+        for lib in data.get("libraries", []):
+            artifact = lib.get("downloads", {}).get("artifact")
+            if artifact and "path" in artifact:
+                libraries.append(LibraryRecord(lib.get("name", ""), artifact["path"], artifact.get("url"),
+                                               artifact.get("sha1"), artifact.get("size"), lib.get("rules")))
+        return cls(version_id, data.get("type", "release"), data.get("mainClass", "net.minecraft.client.main.Main"),
+                   data.get("releaseTime", ""), data.get("assetIndex", {}).get("id"), client.get("sha1"),
+                   client.get("size"), data.get("arguments"), data.get("minecraftArguments"), tuple(libraries),
+                   tuple(signature))
+
+    def is_current(self):
+        """Whether every JSON the record was built from is unchanged on disk."""
         try:
-            self.ssl_context = ssl.create_default_context()
-        except Exception as e:
-            try:
-                self.ssl_context = ssl.create_default_context(cafile=certifi.where())
-            except Exception as e:
-                self.ssl_context = ssl._create_unverified_context()
+            for path, mtime_ns, size in self.signature:
+                st = os.stat(path)
+                if st.st_mtime_ns != mtime_ns or st.st_size != size:
+                    return False
+        except OSError:
+            return False
+        return True
 
-    def safe_urlopen(self, url):
-        """Safely open URL with SSL context handling."""
+    def allowed_libraries(self, rule_engine, target):
+        """The libraries whose rules allow target, in classpath order; memoised per target."""
+        allowed = self._allowed.get(target)
+        if allowed is None:
+            # Most libraries repeat a handful of rule lists, so each distinct list is evaluated once
+            verdicts = {}
+            allowed = []
+            for lib in self.libraries:
+                if lib.rules:
+                    key = marshal.dumps(lib.rules)
+                    verdict = verdicts.get(key)
+                    if verdict is None:
+                        verdict = verdicts[key] = rule_engine.allows(lib.rules, target)
+                    if not verdict:
+                        continue
+                allowed.append(lib)
+            allowed = self._allowed[target] = tuple(allowed)
+        return allowed
+
+    def dump(self):
+        return (METADATA_FORMAT, self.id, self.type, self.main_class, self.release_time, self.asset_index,
+                self.client_sha1, self.client_size, self.arguments, self.minecraft_arguments,
+                tuple((lib.name, lib.path, lib.url, lib.sha1, lib.size, lib.rules) for lib in self.libraries),
+                self.signature)
+
+    @classmethod
+    def load(cls, value):
+        """Rebuild from dump()'s value; returns None for another format."""
+        if not isinstance(value, tuple) or not value or value[0] != METADATA_FORMAT:
+            return None
+        fields = list(value[1:])
+        fields[9] = tuple(LibraryRecord(*lib) for lib in fields[9])
+        return cls(*fields)
+
+def categorize_versions(manifest):
+    """Split a VersionManifest into the launcher's category lists, newest first."""
+    categories = {name: [] for name in
+                  ("Latest Release", "Latest Snapshot", "Release", "Snapshot", "Old Beta", "Old Alpha")}
+    by_type = {"release": categories["Release"], "snapshot": categories["Snapshot"],
+               "old_beta": categories["Old Beta"], "old_alpha": categories["Old Alpha"]}
+    latest_release = manifest.latest.get("release")
+    latest_snapshot = manifest.latest.get("snapshot")
+    for v in manifest.entries:
+        if v.id == latest_release:
+            categories["Latest Release"].append(v.id)
+        elif v.id == latest_snapshot:
+            categories["Latest Snapshot"].append(v.id)
+        elif v.type in by_type:
+            by_type[v.type].append(v.id)
+    return categories
+
+def diff_manifests(previous, current):
+    """Compare two VersionManifests by version id, returning {"added", "removed", "changed"} id lists.
+
+    A version counts as changed when its URL, SHA1 or type differs; previous may be None.
+    """
+    def index(manifest):
+        return {v.id: (v.url, v.sha1, v.type) for v in (manifest.entries if manifest is not None else ())}
+    old, new = index(previous), index(current)
+    return {
+        "added": [v for v in new if v not in old],
+        "removed": [v for v in old if v not in new],
+        "changed": [v for v in new if v in old and new[v] != old[v]],
+    }
+
+def rewrite_url(url, mirror_rules):
+    """Return the mirror URLs for url, longest matching upstream prefix first."""
+    candidates = []
+    for prefix in sorted(mirror_rules, key=len, reverse=True):
+        if url.startswith(prefix):
+            for mirror in mirror_rules[prefix].split():
+                candidates.append(mirror.rstrip("/") + "/" + url[len(prefix):].lstrip("/"))
+    return candidates
+
+def build_mirror_index(root):
+    """Map the SHA1s of the client jars, version JSONs and asset indexes under root to their local paths."""
+    index = {}
+    versions_dir = os.path.join(root, "versions")
+    indexes_dir = os.path.join(root, "assets", "indexes")
+    for version_id in (os.listdir(versions_dir) if os.path.isdir(versions_dir) else ()):
+        json_path = os.path.join(versions_dir, version_id, f"{version_id}.json")
         try:
-            return urllib.request.urlopen(url, context=self.ssl_context)
-        except Exception as e:
-            try:
-                return urllib.request.urlopen(url)
-            except Exception as final_e:
-                raise final_e
+            with open(json_path, "rb") as f:
+                raw = f.read()
+            index[hashlib.sha1(raw).hexdigest()] = json_path
+            data = json.loads(raw)
+            asset_index = data.get("assetIndex")
+            if asset_index and asset_index.get("sha1"):
+                index[asset_index["sha1"]] = os.path.join(indexes_dir, f"{asset_index['id']}.json")
+            index[data["downloads"]["client"]["sha1"]] = os.path.join(versions_dir, version_id, f"{version_id}.jar")
+        except Exception:
+            continue
+    # Asset indexes left behind by versions that are no longer installed
+    for name in (os.listdir(indexes_dir) if os.path.isdir(indexes_dir) else ()):
+        try:
+            path = os.path.join(indexes_dir, name)
+            index.setdefault(hash_file(path), path)
+        except OSError:
+            continue
+    return index
 
-    def update_theme(self):
-        """Update the UI with the current theme."""
-        self.configure(background=self.current_theme['bg'])
-        self.style.configure("TFrame", background=self.current_theme['bg'])
-        self.style.configure("TLabel", background=self.current_theme['bg'], foreground=self.current_theme['text'])
-        self.style.configure("TButton", 
-                           background=self.current_theme['button'],
-                           foreground=self.current_theme['text'],
-                           borderwidth=0,
-                           focuscolor='none',
-                           relief='flat',
-                           font=("Arial", 10))
-        self.style.map("TButton",
-                      background=[('active', self.current_theme['button_hover']),
-                                 ('pressed', self.current_theme['accent'])])
-        
-        self.style.configure("TCombobox", 
-                           fieldbackground=self.current_theme['input_bg'],
-                           background=self.current_theme['input_bg'],
-                           foreground=self.current_theme['text'],
-                           arrowcolor=self.current_theme['text'],
-                           borderwidth=0,
-                           font=("Arial", 10))
-        
-        self.style.configure("TScale", 
-                           background=self.current_theme['bg'],
-                           troughcolor=self.current_theme['input_bg'])
-        
-        self.style.configure("TNotebook", 
-                           background=self.current_theme['header_bg'],
-                           borderwidth=0)
-        self.style.configure("TNotebook.Tab", 
-                           background=self.current_theme['tab_inactive'],
-                           foreground=self.current_theme['text_secondary'],
-                           padding=[15, 5],
-                           borderwidth=0,
-                           font=("Arial", 10))
-        self.style.map("TNotebook.Tab",
-                      background=[('selected', self.current_theme['tab_active'])],
-                      foreground=[('selected', self.current_theme['text'])])
+def resolve_mirror_path(root, request_path, sha1_index):
+    """Translate a mirror request of the form /<host>/<path> into a file under root, or None."""
+    parts = urllib.parse.unquote(urllib.parse.urlsplit(request_path).path).strip("/").split("/")
+    if len(parts) < 2:
+        return None
+    host, rest = parts[0], parts[1:]
+    if rest[-1] == "version_manifest.json":
+        return MANIFEST_CACHE_PATH if os.path.isfile(MANIFEST_CACHE_PATH) else None
+    if len(rest) == 4 and rest[:2] == ["v1", "packages"] and rest[3].endswith(".json"):
+        # Version JSONs and asset indexes share this layout; the SHA1 tells them apart
+        candidate = sha1_index.get(rest[2])
+        if not candidate or not os.path.isfile(candidate):
+            name = rest[3][:-len(".json")]
+            candidate = os.path.join(root, "versions", name, rest[3])
+            if not os.path.isfile(candidate):
+                candidate = os.path.join(root, "assets", "indexes", rest[3])
+    elif len(rest) == 4 and rest[:2] == ["v1", "objects"]:
+        candidate = sha1_index.get(rest[2])
+    elif host == "resources.download.minecraft.net":
+        candidate = os.path.join(root, "assets", "objects", *rest)
+    else:
+        # libraries.minecraft.net and any Maven-layout host map onto the libraries tree
+        candidate = os.path.join(root, "libraries", *rest)
+    if not candidate:
+        return None
+    candidate = os.path.realpath(candidate)
+    if not candidate.startswith(os.path.realpath(root) + os.sep):
+        return None
+    return candidate if os.path.isfile(candidate) else None
 
-        # Update existing widgets
-        for widget in self.winfo_children():
-            self._update_widget_theme(widget)
+class MirrorRequestHandler(http.server.BaseHTTPRequestHandler):
+    """Serve files from a .minecraft tree laid out as an upstream mirror."""
+    root = MINECRAFT_DIR
+    sha1_index = {}
+    index_built_at = 0.0
+    index_lock = threading.Lock()
 
-    def _update_widget_theme(self, widget):
-        """Recursively update widget and its children's theme."""
+    def do_HEAD(self):
+        self._send(head_only=True)
+
+    def do_GET(self):
+        self._send(head_only=False)
+
+    def _send(self, head_only):
+        path = resolve_mirror_path(self.root, self.path, self.sha1_index)
+        if path is None and self.refresh_index():
+            path = resolve_mirror_path(self.root, self.path, self.sha1_index)
+        if path is None:
+            self.send_error(404)
+            return
         try:
-            if isinstance(widget, tk.Frame):
-                widget.configure(background=self.current_theme['bg'])
-            elif isinstance(widget, tk.Label):
-                widget.configure(background=self.current_theme['bg'], foreground=self.current_theme['text'])
-            elif isinstance(widget, tk.Entry):
-                try:
-                    widget.configure(background=self.current_theme['input_bg'], foreground=self.current_theme['text'], 
-                                   insertbackground=self.current_theme['text'])
-                except tk.TclError:
-                    pass
-            elif isinstance(widget, tk.Button):
-                widget.configure(background=self.current_theme['button'], foreground=self.current_theme['text'])
-            elif isinstance(widget, tk.Checkbutton):
-                widget.configure(background=self.current_theme['bg'], foreground=self.current_theme['text'], 
-                               selectcolor=self.current_theme['sidebar'], 
-                               activebackground=self.current_theme['bg'], 
-                               activeforeground=self.current_theme['text'])
-            elif isinstance(widget, tk.Listbox):
-                widget.configure(background=self.current_theme['input_bg'], foreground=self.current_theme['text'], 
-                               selectbackground=self.current_theme['accent'], 
-                               selectforeground=self.current_theme['text'])
-            elif isinstance(widget, tk.Scale):
-                widget.configure(background=self.current_theme['bg'], foreground=self.current_theme['text'],
-                               activebackground=self.current_theme['accent'],
-                               troughcolor=self.current_theme['input_bg'])
-        except tk.TclError as e:
+            with open(path, "rb") as f:
+                self.send_response(200)
+                self.send_header("Content-Length", str(os.fstat(f.fileno()).st_size))
+                self.end_headers()
+                if not head_only:
+                    shutil.copyfileobj(f, self.wfile, 1024 * 1024)
+        except (OSError, ConnectionError):
             pass
-        
-        for child in widget.winfo_children():
-            self._update_widget_theme(child)
 
-    def set_theme(self, theme_name):
-        """Set the theme based on selection."""
-        if theme_name == "Dark":
-            self.current_theme = DARK_THEME
-        elif theme_name == "Light":
-            self.current_theme = LIGHT_THEME
-        elif theme_name == "System":
-            self.current_theme = SYSTEM_THEME
-        self.update_theme()
+    def refresh_index(self):
+        """Rebuild the SHA1 index so files installed since startup are served; rate-limited."""
+        cls = type(self)
+        with cls.index_lock:
+            if time.monotonic() - cls.index_built_at < MIRROR_INDEX_REFRESH:
+                return False
+            cls.sha1_index = build_mirror_index(cls.root)
+            cls.index_built_at = time.monotonic()
+        return True
 
-    def init_ui(self):
-        """Set up the graphical user interface with TLauncher styling."""
-        # Header
-        header = tk.Frame(self, background=self.current_theme['header_bg'], height=40)
-        header.pack(fill="x", side="top")
-        header.pack_propagate(False)
-        
-        # Header title
-        title = tk.Label(header, text="CatLauncher", font=("Arial", 14, "bold"), 
-                        background=self.current_theme['header_bg'], foreground=self.current_theme['text'])
-        title.pack(side="left", padx=15, pady=10)
-        
-        # Header version
-        version = tk.Label(header, text="1.0", font=("Arial", 10), 
-                          background=self.current_theme['header_bg'], foreground=self.current_theme['text_secondary'])
-        version.pack(side="right", padx=15, pady=10)
-        
-        # Theme selector
-        theme_frame = tk.Frame(header, background=self.current_theme['header_bg'])
-        theme_frame.pack(side="right", padx=10)
-        theme_label = tk.Label(theme_frame, text="Theme:", font=("Arial", 10),
-                              background=self.current_theme['header_bg'], foreground=self.current_theme['text_secondary'])
-        theme_label.pack(side="left")
-        theme_options = ["Dark", "Light", "System"]
-        self.theme_var = tk.StringVar(value="Light")
-        theme_menu = ttk.Combobox(theme_frame, textvariable=self.theme_var, values=theme_options,
-                                   state="readonly")
-        theme_menu.set("Light")
-        theme_menu.bind("<<ComboboxSelected>>", lambda e: self.set_theme(self.theme_var.get()))
-        theme_menu.pack(side="left", padx=5)
-        
-        # Main container
-        main_container = tk.Frame(self, background=self.current_theme['bg'])
-        main_container.pack(fill="both", expand=True, padx=10, pady=10)
+    def log_message(self, format, *args):
+        pass
 
-        # Left panel - Game settings
-        left_panel = tk.Frame(main_container, background=self.current_theme['sidebar'], width=300)
-        left_panel.pack(side="left", fill="y", padx=(0, 10))
-        left_panel.pack_propagate(False)
+def serve_mirror(root=MINECRAFT_DIR, port=MIRROR_PORT, bind=""):
+    """Serve an existing .minecraft tree to other launchers on the LAN until interrupted."""
+    handler = type("BoundMirrorRequestHandler", (MirrorRequestHandler,),
+                   {"root": root, "sha1_index": build_mirror_index(root), "index_built_at": time.monotonic(),
+                    "index_lock": threading.Lock()})
+    server = http.server.ThreadingHTTPServer((bind, port), handler)
+    host = platform.node() or "localhost"
+    print(f"Serving {root} as a mirror on port {port}. Add to {CONFIG_PATH} on each client:")
+    print("[mirror_rules]")
+    for upstream in MIRROR_HOSTS:
+        print(f"https://{upstream}/ = http://{host}:{port}/{upstream}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
 
-        # Game version selection
-        version_frame = tk.Frame(left_panel, background=self.current_theme['sidebar'])
-        version_frame.pack(fill="x", padx=15, pady=15)
-        
-        tk.Label(version_frame, text="VERSION", font=("Arial", 9, "bold"), 
-                background=self.current_theme['sidebar'], foreground=self.current_theme['text_secondary']).pack(anchor="w")
-        
-        self.category_combo = ttk.Combobox(version_frame, values=list(self.version_categories.keys()),
-                                         state="readonly")
-        self.category_combo.pack(fill="x", pady=(5, 0))
-        self.category_combo.set("Latest Release")
-        self.category_combo.bind("<<ComboboxSelected>>", self.update_version_list)
+class Counter:
+    """Monotonic metric, optionally split by label values."""
+    kind = "counter"
 
-        self.version_combo = ttk.Combobox(version_frame, state="readonly")
-        self.version_combo.pack(fill="x", pady=5)
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help = help_text
+        self.labels = labels
+        # Unlabelled counters are exported as 0 from the start so rate() sees the first increment
+        self.values = {} if labels else {(): 0}
+        self._lock = threading.Lock()
 
-        # Account settings
-        account_frame = tk.Frame(left_panel, background=self.current_theme['sidebar'])
-        account_frame.pack(fill="x", padx=15, pady=10)
-        
-        tk.Label(account_frame, text="ACCOUNT", font=("Arial", 9, "bold"), 
-                background=self.current_theme['sidebar'], foreground=self.current_theme['text_secondary']).pack(anchor="w")
-        
-        self.username_input = tk.Entry(account_frame, font=("Arial", 10), background=self.current_theme['input_bg'],
-                                     foreground=self.current_theme['text'], insertbackground=self.current_theme['text'], 
-                                     bd=0, relief="flat")
-        self.username_input.pack(fill="x", pady=(5, 0))
-        self.username_input.insert(0, "Player")
-        self.username_input.bind("<FocusIn>", lambda e: self.username_input.delete(0, tk.END) 
-                               if self.username_input.get() == "Player" else None)
+    def inc(self, amount=1, **labels):
+        key = tuple(labels.get(label, "") for label in self.labels)
+        with self._lock:
+            self.values[key] = self.values.get(key, 0) + amount
 
-        # RAM settings
-        ram_frame = tk.Frame(left_panel, background=self.current_theme['sidebar'])
-        ram_frame.pack(fill="x", padx=15, pady=10)
-        
-        ram_header = tk.Frame(ram_frame, background=self.current_theme['sidebar'])
-        ram_header.pack(fill="x")
-        
-        tk.Label(ram_header, text="RAM", font=("Arial", 9, "bold"),
-                background=self.current_theme['sidebar'], foreground=self.current_theme['text_secondary']).pack(side="left")
-        
-        self.ram_value_label = tk.Label(ram_header, text="4 GB", font=("Arial", 9),
-                                      background=self.current_theme['sidebar'], foreground=self.current_theme['text'])
-        self.ram_value_label.pack(side="right")
+    def total(self, **labels):
+        """Sum of the series matching the given label values."""
+        with self._lock:
+            items = list(self.values.items())
+        return sum(value for key, value in items
+                   if all(key[self.labels.index(label)] == wanted for label, wanted in labels.items()))
 
-        self.ram_scale = tk.Scale(ram_frame, from_=1, to=16, orient="horizontal",
-                                background=self.current_theme['sidebar'], foreground=self.current_theme['text'],
-                                activebackground=self.current_theme['accent'],
-                                highlightthickness=0, bd=0,
-                                troughcolor=self.current_theme['input_bg'],
-                                sliderrelief="flat",
-                                command=lambda v: self.ram_value_label.config(text=f"{int(float(v))} GB"))
-        self.ram_scale.set(4)
-        self.ram_scale.pack(fill="x")
+    def samples(self):
+        with self._lock:
+            items = sorted(self.values.items())
+        return [(self.name, dict(zip(self.labels, key)), value) for key, value in items]
 
-        # Skin button
-        skin_button = ttk.Button(left_panel, text="Change Skin", command=self.select_skin)
-        skin_button.pack(padx=15, pady=10, fill="x")
+class Gauge:
+    """Metric whose value is computed when the registry is rendered."""
+    kind = "gauge"
 
-        # Launch button
-        launch_button = ttk.Button(left_panel, text="PLAY", command=self.prepare_and_launch)
-        launch_button.pack(side="bottom", padx=15, pady=15, fill="x")
+    def __init__(self, name, help_text, read):
+        self.name = name
+        self.help = help_text
+        self.read = read
 
-        # Right panel - Tabs and content
-        right_panel = tk.Frame(main_container, background=self.current_theme['bg'])
-        right_panel.pack(side="left", fill="both", expand=True)
+    def samples(self):
+        return [(self.name, {}, self.read())]
 
-        # Create notebook for tabs
-        notebook = ttk.Notebook(right_panel)
-        notebook.pack(fill="both", expand=True)
+class Histogram:
+    """Distribution of observed values over fixed cumulative buckets."""
+    kind = "histogram"
+
+    def __init__(self, name, help_text, buckets):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * len(self.buckets)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        with self._lock:
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    self.counts[i] += 1
+            self.sum += value
+            self.count += 1
+
+    def samples(self):
+        with self._lock:
+            rows = [(f"{self.name}_bucket", {"le": str(bound)}, count) for bound, count in zip(self.buckets, self.counts)]
+            rows.append((f"{self.name}_bucket", {"le": "+Inf"}, self.count))
+            rows.append((f"{self.name}_sum", {}, self.sum))
+            rows.append((f"{self.name}_count", {}, self.count))
+        return rows
+
+class MetricsRegistry:
+    """Launcher metrics, rendered in the Prometheus text exposition format."""
+
+    def __init__(self):
+        self.metrics = []
+
+    def counter(self, name, help_text, labels=()):
+        metric = Counter(name, help_text, labels)
+        self.metrics.append(metric)
+        return metric
+
+    def gauge(self, name, help_text, read):
+        metric = Gauge(name, help_text, read)
+        self.metrics.append(metric)
+        return metric
+
+    def histogram(self, name, help_text, buckets):
+        metric = Histogram(name, help_text, buckets)
+        self.metrics.append(metric)
+        return metric
+
+    def render(self):
+        lines = []
+        for metric in self.metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                label_text = ",".join('{}="{}"'.format(key, str(val).replace("\\", "\\\\").replace('"', '\\"'))
+                                      for key, val in labels.items())
+                lines.append(f"{name}{{{label_text}}} {value}" if label_text else f"{name} {value}")
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path):
+        """Atomically write the metrics where node_exporter's textfile collector reads them."""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "w") as f:
+            f.write(self.render())
+        os.replace(temp_path, path)
+
+    def serve(self, port, bind="127.0.0.1"):
+        """Serve /metrics from a daemon thread; returns the server."""
+        handler = type("BoundMetricsRequestHandler", (MetricsRequestHandler,), {"registry": self})
+        server = http.server.ThreadingHTTPServer((bind, port), handler)
+        threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+        return server
+
+class MetricsRequestHandler(http.server.BaseHTTPRequestHandler):
+    """Answer Prometheus scrapes with the registry's current values."""
+    registry = None
+
+    def do_GET(self):
+        if self.path.split("?", 1)[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        body = self.registry.render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+METRICS = MetricsRegistry()
+LAUNCHES = METRICS.counter("catlauncher_launches_total", "Game launches attempted, by result.", ("result",))
+LAUNCH_PREP_SECONDS = METRICS.histogram("catlauncher_launch_prep_seconds",
+                                        "Time from Play to the game process starting.", LAUNCH_PREP_BUCKETS)
+DOWNLOAD_BYTES = METRICS.counter("catlauncher_download_bytes_total", "Bytes downloaded from mirrors and upstream.")
+ARTIFACT_LOOKUPS = METRICS.counter("catlauncher_artifact_lookups_total",
+                                   "Install artifacts already present (hit) or downloaded (miss).", ("result",))
+METRICS.gauge("catlauncher_artifact_cache_hit_ratio", "Share of artifact lookups served from disk.",
+              lambda: ARTIFACT_LOOKUPS.total(result="hit") / max(ARTIFACT_LOOKUPS.total(), 1))
+VERIFY_FAILURES = METRICS.counter("catlauncher_verification_failures_total", "Files that failed a hash check.")
+GAME_CRASHES = METRICS.counter("catlauncher_game_crashes_total",
+                               "Games that exited with a non-zero status the launcher did not cause.")
+GAME_OOMS = METRICS.counter("catlauncher_game_out_of_memory_total", "Games that logged an OutOfMemoryError.")
+TIME_TO_MAIN_MENU_SECONDS = METRICS.histogram("catlauncher_time_to_main_menu_seconds",
+                                              "Time from process start to the title screen.", LAUNCH_PREP_BUCKETS)
+
+def hash_file(file_path, algorithm="sha1"):
+    """Hash a file through a read-only memory map, falling back to buffered reads.
+
+    hashlib drops the GIL while digesting large buffers, so several of these can
+    run on separate cores from a thread pool without loading whole files into memory.
+    """
+    digest = hashlib.new(algorithm)
+    with open(file_path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return digest.hexdigest()
+        try:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                view = memoryview(mapped)
+                try:
+                    for offset in range(0, size, HASH_CHUNK_SIZE):
+                        digest.update(view[offset:offset + HASH_CHUNK_SIZE])
+                finally:
+                    view.release()
+        except (ValueError, OSError):
+            f.seek(0)
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+def verify_files_parallel(items, progress=None, workers=VERIFY_WORKERS):
+    """Verify (path, sha1) pairs on a thread pool; returns the paths that are missing or wrong.
+
+    progress, if given, is called as progress(done, total) from the worker threads.
+    """
+    items = list(items)
+    failed = []
+    done = 0
+
+    def check(item):
+        path, sha1 = item
+        try:
+            return path, hash_file(path) == sha1
+        except OSError:
+            return path, False
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as pool:
+        for path, ok in pool.map(check, items):
+            done += 1
+            if not ok:
+                failed.append(path)
+            if progress:
+                progress(done, len(items))
+    return failed
+
+def pid_alive(pid):
+    """Whether a process with this pid is still running."""
+    if pid <= 0:
+        return False
+    if platform.system() == "Windows":
+        import ctypes
+        PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+        STILL_ACTIVE = 259
+        handle = ctypes.windll.kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+        if not handle:
+            return False
+        try:
+            exit_code = ctypes.c_ulong()
+            ctypes.windll.kernel32.GetExitCodeProcess(handle, ctypes.byref(exit_code))
+            return exit_code.value == STILL_ACTIVE
+        finally:
+            ctypes.windll.kernel32.CloseHandle(handle)
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+class InstanceLock:
+    """Lock file in an instance's game directory naming the game process that owns it.
+
+    The lock is created exclusively, then rewritten with the game's pid once it has
+    started. A lock whose pid is no longer running is stale and is taken over, so a
+    crashed game never blocks its instance.
+    """
+
+    def __init__(self, game_dir):
+        self.path = os.path.join(game_dir, INSTANCE_LOCK_NAME)
+
+    def owner(self):
+        """Return the pid recorded in the lock, or None if there is no lock."""
+        try:
+            with open(self.path, "r") as f:
+                return int(f.read().strip() or 0)
+        except (OSError, ValueError):
+            return None
+
+    def acquire(self):
+        """Take the lock for this launcher process; returns False if a live game holds it."""
+        for attempt in range(2):
+            try:
+                fd = os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                pid = self.owner()
+                if pid is not None and pid_alive(pid):
+                    return False
+                try:
+                    os.remove(self.path)
+                except OSError:
+                    pass
+                continue
+            with os.fdopen(fd, "w") as f:
+                f.write(str(os.getpid()))
+            return True
+        return False
+
+    def hand_over(self, pid):
+        """Record the game's pid so the lock lives exactly as long as the game."""
+        with open(self.path, "w") as f:
+            f.write(str(pid))
+
+    def release(self):
+        """Remove the lock."""
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+def read_proc_sample(pid):
+    """Return (cpu_ticks, rss_bytes, threads) for pid from /proc/<pid>/stat, or None off Linux."""
+    try:
+        with open(f"/proc/{pid}/stat", "r") as f:
+            # The command name may contain spaces and parentheses, so split after its closing ')'
+            fields = f.read().rsplit(")", 1)[1].split()
+    except (OSError, IndexError):
+        return None
+    utime, stime = int(fields[11]), int(fields[12])
+    threads = int(fields[17])
+    rss_bytes = int(fields[21]) * PAGE_SIZE
+    return utime + stime, rss_bytes, threads
+
+class GameLogAnalyzer:
+    """Watch a game's output line by line for startup milestones, crashes, OOMs and long GC pauses.
+
+    Only first-seen milestone times, a few counters and a bounded alert queue are
+    kept, so memory stays flat however long the game runs.
+    """
+
+    def __init__(self, started):
+        self.started = started
+        self.milestones = {}  # marker name -> seconds after start, first occurrence only
+        self.crash_report = None
+        self.out_of_memory = False
+        self.long_gc_pauses = 0
+        self.max_gc_pause_ms = 0.0
+        self.live_heap_mb = 0  # largest heap left after a full or mixed collection
+        self.alerts = collections.deque(maxlen=GAME_ALERT_LIMIT)
+
+    @property
+    def time_to_main_menu(self):
+        return self.milestones.get("main_menu")
+
+    def feed(self, line, now=None):
+        """Inspect one line of output."""
+        if not any(keyword in line for keyword in GAME_LOG_KEYWORDS):
+            return
+        match = GAME_LOG_MARKERS.search(line)
+        if match is None:
+            return
+        marker = match.lastgroup
+        first = marker not in self.milestones
+        if first:
+            self.milestones[marker] = (now if now is not None else time.monotonic()) - self.started
+        if marker == "main_menu" and first:
+            TIME_TO_MAIN_MENU_SECONDS.observe(self.milestones[marker])
+        elif marker == "crash_report":
+            self.crash_report = match.group("crash_report")
+            self.alerts.append(f"Crash report saved to {self.crash_report}")
+        elif marker == "oom" and not self.out_of_memory:
+            self.out_of_memory = True
+            GAME_OOMS.inc()
+            self.alerts.append("The game ran out of memory. Give it more RAM in Settings.")
+        elif marker == "gc_pause":
+            pause_ms = float(match.group("gc_pause"))
+            self.max_gc_pause_ms = max(self.max_gc_pause_ms, pause_ms)
+            heap = GC_HEAP_AFTER.search(line)
+            if heap and ("Pause Full" in line or "(Mixed)" in line):
+                self.live_heap_mb = max(self.live_heap_mb, int(heap.group(2)))
+            if pause_ms >= GC_PAUSE_WARN_MS:
+                self.long_gc_pauses += 1
+                if self.long_gc_pauses == 1:
+                    self.alerts.append(f"Garbage collection paused the game for {pause_ms:.0f} ms.")
+
+    def pop_alerts(self):
+        """Return and clear the alerts raised since the last call."""
+        alerts = []
+        while self.alerts:
+            alerts.append(self.alerts.popleft())
+        return alerts
+
+class GameProcess:
+    """A launched game and the resource samples the supervisor has taken of it."""
+
+    def __init__(self, process, command, game_dir, instance, version, lock, on_output=None, history_key=None):
+        self.process = process
+        self.command = command
+        self.game_dir = game_dir
+        self.instance = instance
+        self.version = version
+        self.history_key = history_key or version  # under which peak RSS and live heap are recorded
+        self.lock = lock
+        self.started = time.monotonic()
+        self.cpu_percent = 0.0
+        self.rss_bytes = 0
+        self.peak_rss_bytes = 0
+        self.threads = 0
+        self.exit_code = None
+        self.stopped = False  # set when the launcher itself ended the game
+        self.output_tail = collections.deque(maxlen=GAME_OUTPUT_TAIL)
+        self.analyzer = GameLogAnalyzer(self.started)
+        self.on_output = on_output  # called with each output line from the reader thread, e.g. to stream a console
+        self._last_ticks = None
+        self._last_sample = None
+        self._reader = threading.Thread(target=self._drain_output, daemon=True)
+        self._reader.start()
+
+    @property
+    def running(self):
+        return self.exit_code is None
+
+    @property
+    def status(self):
+        if self.running:
+            return "running"
+        if self.stopped:
+            return "stopped"
+        return "exited" if self.exit_code == 0 else f"crashed ({self.exit_code})"
+
+    def _drain_output(self):
+        """Read the game's combined output so a full pipe can never stall it."""
+        for line in iter(self.process.stdout.readline, b""):
+            text = line.decode("utf-8", "replace").rstrip()
+            self.output_tail.append(text)
+            self.analyzer.feed(text)
+            if self.on_output is not None and not GC_LOG_LINE.match(text):
+                self.on_output(text)
+        self.process.stdout.close()
+
+    def send(self, command):
+        """Write a console command to a process started with an open stdin, such as a server."""
+        if self.process.stdin is None or not self.running:
+            return False
+        try:
+            self.process.stdin.write((command.rstrip("\n") + "\n").encode("utf-8"))
+            self.process.stdin.flush()
+        except (OSError, ValueError):
+            return False
+        return True
+
+    def sample(self):
+        """Poll the process and take one CPU/RSS/thread sample; returns False once it has exited."""
+        if not self.running:
+            return False
+        code = self.process.poll()
+        if code is not None:
+            self.exit_code = code
+            self.cpu_percent = 0.0
+            return False
+        reading = read_proc_sample(self.process.pid)
+        if reading is None:
+            return True
+        ticks, self.rss_bytes, self.threads = reading
+        now = time.monotonic()
+        if self._last_ticks is not None and now > self._last_sample:
+            self.cpu_percent = 100.0 * (ticks - self._last_ticks) / CLOCK_TICKS / (now - self._last_sample)
+        self._last_ticks, self._last_sample = ticks, now
+        self.peak_rss_bytes = max(self.peak_rss_bytes, self.rss_bytes)
+        return True
+
+class GameSupervisor:
+    """Track every game the launcher starts, sample it at a low rate and keep peak-RSS and live-heap history."""
+
+    def __init__(self, history_path=RSS_HISTORY_PATH, live_heap_history_path=LIVE_HEAP_HISTORY_PATH):
+        self.history_path = history_path
+        self.live_heap_history_path = live_heap_history_path
+        self.games = []
+        self._lock = threading.Lock()
+
+    def launch(self, command, game_dir, instance, version, lock, interactive=False, on_output=None,
+               history_key=None):
+        """Start a game process under supervision; lock is the instance lock to hand over.
+
+        interactive keeps stdin open for console commands; on_output receives each output line
+        except GC log lines. history_key, the version by default, keys the recorded memory history.
+        """
+        process = subprocess.Popen(command, cwd=game_dir, stdin=subprocess.PIPE if interactive else subprocess.DEVNULL,
+                                   stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+        lock.hand_over(process.pid)
+        game = GameProcess(process, command, game_dir, instance, version, lock, on_output, history_key)
+        with self._lock:
+            self.games.append(game)
+        return game
+
+    def sample(self):
+        """Sample every running game; finished games release their lock and record their peak RSS and live heap."""
+        with self._lock:
+            games = list(self.games)
+        for game in games:
+            was_running = game.running
+            if not game.sample() and was_running:
+                game.lock.release()
+                if game.exit_code != 0 and not game.stopped:
+                    GAME_CRASHES.inc()
+                    game.analyzer.alerts.append(
+                        f"{game.instance} ({game.version}) crashed with exit code {game.exit_code}.")
+                if game.peak_rss_bytes:
+                    self.record_peak_rss(game.history_key, game.peak_rss_bytes)
+                if game.analyzer.live_heap_mb:
+                    self.record_live_heap(game.history_key, game.analyzer.live_heap_mb * 1048576)
+
+    def running_games(self):
+        """Return the games that have not exited."""
+        with self._lock:
+            return [game for game in self.games if game.running]
+
+    def kill(self, game):
+        """Terminate a game, escalating to kill if it ignores the request."""
+        if not game.running:
+            return
+        game.stopped = True
+        # A server saves its worlds on "stop"; terminate is the fallback
+        if not (game.send("stop") and self._wait(game, SERVER_STOP_TIMEOUT)):
+            game.process.terminate()
+        try:
+            game.process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            game.process.kill()
+            game.process.wait()
+        self.sample()
+
+    @staticmethod
+    def _wait(game, timeout):
+        """Wait up to timeout seconds for a game to exit; returns whether it did."""
+        try:
+            game.process.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            return False
+        return True
+
+    def restart(self, game):
+        """Kill a game if needed and start it again with the same command and instance."""
+        self.kill(game)
+        with self._lock:
+            if game in self.games:
+                self.games.remove(game)
+        if not game.lock.acquire():
+            raise RuntimeError(f"Instance {game.instance} is already running.")
+        return self.launch(game.command, game.game_dir, game.instance, game.version, game.lock,
+                           game.process.stdin is not None, game.on_output, game.history_key)
+
+    def peak_rss_history(self):
+        """Return {version: [peak RSS bytes of recent sessions]}."""
+        return self._read_history(self.history_path)
+
+    def live_heap_history(self):
+        """Return {version: [live heap bytes after full or mixed collections, per recent session]}."""
+        return self._read_history(self.live_heap_history_path)
+
+    def record_peak_rss(self, version, peak_rss_bytes):
+        """Append a session's peak RSS to the version's history, keeping the last few sessions."""
+        self._append_history(self.history_path, version, peak_rss_bytes)
+
+    def record_live_heap(self, version, live_heap_bytes):
+        """Append a session's live heap to the version's history, keeping the last few sessions."""
+        self._append_history(self.live_heap_history_path, version, live_heap_bytes)
+
+    @staticmethod
+    def _read_history(path):
+        try:
+            with open(path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _append_history(self, path, version, value):
+        history = self._read_history(path)
+        history[version] = (history.get(version, []) + [value])[-RSS_HISTORY_LENGTH:]
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = path + ".tmp"
+            with open(temp_path, "w") as f:
+                json.dump(history, f)
+            os.replace(temp_path, path)
+        except OSError:
+            pass
+
+def read_meminfo(path=MEMINFO_PATH):
+    """Return {field: bytes} from /proc/meminfo (MemTotal, MemAvailable, SwapTotal, ...), or {} off Linux."""
+    info = {}
+    try:
+        with open(path, "r") as f:
+            for line in f:
+                name, _, value = line.partition(":")
+                fields = value.split()
+                if fields and fields[0].isdigit():
+                    info[name] = int(fields[0]) * (1024 if fields[1:] == ["kB"] else 1)
+    except OSError:
+        pass
+    return info
+
+def recommend_heap_mb(release_time, mods=0, peak_rss_bytes=(), total_bytes=0, live_heap_bytes=()):
+    """Recommend a -Xmx in MiB from the version era, installed mods, past sessions and system RAM.
+
+    The floor comes from the era and mod count; past sessions raise it when they
+    needed more. The live heap left after full or mixed collections does not
+    depend on the -Xmx it ran under, so it gets headroom; peak RSS is capped by
+    the old -Xmx and only keeps that size, so the recommendation cannot ratchet
+    upwards. The result leaves the OS its reserve and is rounded to whole GiB.
+    """
+    baseline = next(mb for start, mb in HEAP_ERA_BASELINE_MB if (release_time or "9999") >= start)
+    heap = baseline + mods * HEAP_PER_MOD_MB
+    if live_heap_bytes:
+        heap = max(heap, max(live_heap_bytes) / 1048576 * HEAP_LIVE_SET_FACTOR)
+    elif peak_rss_bytes:
+        heap = max(heap, max(peak_rss_bytes) / 1048576 - HEAP_NON_HEAP_MB)
+    heap = min(heap, HEAP_MAX_MB)
+    if total_bytes:
+        heap = min(heap, total_bytes / 1048576 - HEAP_OS_RESERVE_MB - HEAP_NON_HEAP_MB)
+    heap = max(heap, HEAP_MIN_MB)
+    return max(1, int(heap // 1024)) * 1024
+
+def scan_tree(root):
+    """Return (path, size) for every regular file under root, using scandir to avoid extra stats."""
+    files = []
+    stack = [root]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False) or entry.is_symlink():
+                        try:
+                            files.append((entry.path, entry.stat(follow_symlinks=False).st_size))
+                        except OSError:
+                            continue
+        except OSError:
+            continue
+    return files
+
+def scan_trees_parallel(roots, workers=VERIFY_WORKERS):
+    """Scan several directory trees at once, splitting each root by its immediate subdirectories."""
+    jobs = []
+    files = []
+    for root in roots:
+        try:
+            with os.scandir(root) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        jobs.append(entry.path)
+                    else:
+                        try:
+                            files.append((entry.path, entry.stat(follow_symlinks=False).st_size))
+                        except OSError:
+                            continue
+        except OSError:
+            continue
+    # Directory walking is syscall-bound, so threads overlap the kernel work well
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max(workers, 8)) as pool:
+        for result in pool.map(scan_tree, jobs):
+            files.extend(result)
+    return files
+
+def prewarm_files(paths, cancel=None):
+    """Pull files into the page cache ahead of use; returns the number of bytes requested.
+
+    Uses posix_fadvise(WILLNEED), which queues kernel readahead and returns at
+    once, and falls back to reading the files where that is unavailable. Stops
+    early once cancel, a threading.Event, is set.
+    """
+    requested = 0
+    for path in paths:
+        if cancel is not None and cancel.is_set():
+            break
+        try:
+            fd = os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+        except OSError:
+            continue
+        try:
+            size = os.fstat(fd).st_size
+            if hasattr(os, "posix_fadvise"):
+                os.posix_fadvise(fd, 0, size, os.POSIX_FADV_WILLNEED)
+            else:
+                while os.read(fd, STREAM_CHUNK_SIZE):
+                    if cancel is not None and cancel.is_set():
+                        break
+            requested += size
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+    return requested
+
+def quick_check_file(path, expected_size=None):
+    """Fast structural check: the file exists, has the expected size and, for jars, a readable central directory."""
+    try:
+        size = os.path.getsize(path)
+    except OSError:
+        return False
+    if expected_size is not None and size != expected_size:
+        return False
+    if path.endswith((".jar", ".zip")):
+        try:
+            # Opening parses the end-of-central-directory record and every entry header
+            with zipfile.ZipFile(path):
+                pass
+        except (zipfile.BadZipFile, OSError):
+            return False
+    return True
+
+# ioprio_set(2) syscall numbers; other architectures fall back to the nice-derived I/O priority
+IOPRIO_SET_SYSCALLS = {"x86_64": 251, "aarch64": 30}
+
+def lower_thread_priority():
+    """Drop the calling thread to nice 19 and, on Linux, the idle I/O class."""
+    if platform.system() != "Linux":
+        return
+    thread_id = threading.get_native_id()
+    try:
+        os.setpriority(os.PRIO_PROCESS, thread_id, 19)
+    except OSError:
+        pass
+    syscall_number = IOPRIO_SET_SYSCALLS.get(platform.machine())
+    if syscall_number is None:
+        return
+    try:
+        import ctypes
+        # IOPRIO_WHO_PROCESS with a thread id targets just this thread; class 3 is IOPRIO_CLASS_IDLE
+        ctypes.CDLL(None, use_errno=True).syscall(syscall_number, 1, thread_id, 3 << 13)
+    except (OSError, AttributeError):
+        pass
+
+def remove_empty_dirs(root):
+    """Remove directories under root that became empty, deepest first."""
+    for current, dirs, files in os.walk(root, topdown=False):
+        # dirs was listed before its children were removed, so let rmdir decide emptiness
+        if current != root and not files:
+            try:
+                os.rmdir(current)
+            except OSError:
+                pass
+
+def link_tree(source_dir, target_dir, exclude=()):
+    """Populate target_dir with hardlinks to the files under source_dir.
+
+    Falls back to symlinks, then copies, where the filesystem cannot hardlink.
+    Relative paths starting with any prefix in exclude are skipped. Each link is
+    made under a temporary name and renamed over, so concurrent callers and
+    stale files are handled. Returns the paths created under target_dir.
+    """
+    linked = []
+    for path, size in scan_tree(source_dir):
+        rel = os.path.relpath(path, source_dir)
+        if any(rel.replace(os.sep, "/").startswith(prefix) for prefix in exclude):
+            continue
+        target = os.path.join(target_dir, rel)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        temp_target = f"{target}.link-{threading.get_ident()}"
+        try:
+            os.link(path, temp_target)
+        except OSError:
+            try:
+                os.symlink(path, temp_target)
+            except OSError:
+                shutil.copy2(path, temp_target)
+        os.replace(temp_target, target)
+        linked.append(target)
+    return linked
+
+class HashingReader:
+    """File-like wrapper that hashes every byte read through it."""
+
+    def __init__(self, raw, algorithm="sha256"):
+        self.raw = raw
+        self.digest = hashlib.new(algorithm)
+        self.bytes_read = 0
+
+    def read(self, size=-1):
+        data = self.raw.read(size)
+        self.digest.update(data)
+        self.bytes_read += len(data)
+        return data
+
+    def drain(self):
+        """Consume whatever the consumer left unread, so the digest covers the whole body."""
+        while self.read(STREAM_CHUNK_SIZE):
+            pass
+
+    def hexdigest(self):
+        return self.digest.hexdigest()
+
+# A platform that version rules are evaluated against; features is a frozenset of enabled feature flags
+TargetPlatform = collections.namedtuple("TargetPlatform", ["name", "arch", "version", "features"])
+
+# Platforms a mirror-syncing machine downloads libraries and natives for
+MIRROR_SYNC_PLATFORMS = [
+    TargetPlatform("linux", "x86_64", "", frozenset()),
+    TargetPlatform("linux", "arm64", "", frozenset()),
+    TargetPlatform("windows", "x86_64", "10.0", frozenset()),
+    TargetPlatform("windows", "x86", "10.0", frozenset()),
+    TargetPlatform("osx", "x86_64", "10.15", frozenset()),
+    TargetPlatform("osx", "arm64", "14.0", frozenset()),
+]
+
+def current_platform(features=()):
+    """Describe this machine as a TargetPlatform using Mojang's OS and architecture names."""
+    name = platform.system().lower()
+    if name == "darwin":
+        name = "osx"
+    machine = platform.machine().lower()
+    arch = {"amd64": "x86_64", "x64": "x86_64", "i386": "x86", "i686": "x86", "aarch64": "arm64"}.get(machine, machine)
+    if name == "osx":
+        version = platform.mac_ver()[0]
+    elif name == "windows":
+        version = platform.version()
+    else:
+        version = platform.release()
+    return TargetPlatform(name, arch, version, frozenset(features))
+
+class RuleEngine:
+    """Evaluates library and argument rules, compiling each distinct rule list once.
+
+    A rule list compiles to (allow, os name, arch regex, version regex, features)
+    checks where the last matching rule wins, and verdicts are memoised per
+    TargetPlatform, so rules shared by dozens of libraries are interpreted once.
+    """
+
+    def __init__(self):
+        self._compiled = {}
+        self._verdicts = {}
+        self._by_identity = {}  # id(rules) -> (rules, compiled), so a list already seen is not re-serialised
+
+    def compile(self, rules):
+        """Return (key, checks) for a rule list, reusing an earlier compilation of equal rules.
+
+        Rule lists come from cached profiles that are never modified, so a list
+        seen before is looked up by identity; the reference kept alongside stops
+        its id from being reused.
+        """
+        seen = self._by_identity.get(id(rules))
+        if seen is not None and seen[0] is rules:
+            return seen[1]
+        key = json.dumps(rules, sort_keys=True)
+        compiled = self._compiled.get(key)
+        if compiled is None:
+            checks = []
+            for rule in rules:
+                os_rule = rule.get("os") if isinstance(rule.get("os"), dict) else {}
+                checks.append((rule.get("action") == "allow",
+                               os_rule.get("name"),
+                               re.compile(os_rule["arch"]) if "arch" in os_rule else None,
+                               re.compile(os_rule["version"]) if "version" in os_rule else None,
+                               tuple(sorted(rule.get("features", {}).items()))))
+            compiled = self._compiled[key] = (key, tuple(checks))
+        if len(self._by_identity) >= RULE_IDENTITY_CACHE_SIZE:
+            # Reloaded profiles bring new lists; dropping the old ones keeps memory bounded
+            self._by_identity.clear()
+        self._by_identity[id(rules)] = (rules, compiled)
+        return compiled
+
+    @staticmethod
+    def evaluate(checks, target):
+        """Run compiled checks against one TargetPlatform."""
+        allowed = False
+        for allow, name, arch, version, features in checks:
+            if name is not None and name != target.name:
+                continue
+            if arch is not None and not arch.fullmatch(target.arch):
+                continue
+            if version is not None and not version.search(target.version):
+                continue
+            if any((feature in target.features) != bool(value) for feature, value in features):
+                continue
+            allowed = allow
+        return allowed
+
+    def allows(self, rules, target):
+        """Whether rules permit target; an absent or empty rule list allows everything."""
+        if not rules:
+            return True
+        return self._verdict(self.compile(rules), target)
+
+    def _verdict(self, compiled, target):
+        key, checks = compiled
+        verdict = self._verdicts.get((key, target))
+        if verdict is None:
+            verdict = self._verdicts[(key, target)] = self.evaluate(checks, target)
+        return verdict
+
+    def filter_libraries(self, libraries, targets):
+        """Return {target: allowed libraries} for several platforms in one pass over libraries."""
+        allowed = {target: [] for target in targets}
+        for lib in libraries:
+            compiled = self.compile(lib["rules"]) if lib.get("rules") else None
+            for target in targets:
+                if compiled is None or self._verdict(compiled, target):
+                    allowed[target].append(lib)
+        return allowed
+
+    @staticmethod
+    def native_classifier(lib, target):
+        """The natives classifier lib needs on target, or None; ${arch} becomes 32 or 64."""
+        classifier = lib.get("natives", {}).get(target.name)
+        if classifier is None:
+            return None
+        return classifier.replace("${arch}", "32" if target.arch == "x86" else "64")
+
+class HostUnavailableError(urllib.error.URLError):
+    """Raised without touching the network while a host's circuit breaker is open."""
+
+class CircuitBreaker:
+    """Per-host failure counter that fails fast while a host looks down.
+
+    After threshold consecutive failures the breaker opens for cooldown seconds;
+    then a single probe request is let through, and its outcome closes the
+    breaker or opens it again.
+    """
+
+    def __init__(self, threshold=BREAKER_THRESHOLD, cooldown=BREAKER_COOLDOWN):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """Whether a request to this host may be attempted now."""
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if not self._probing and time.monotonic() - self.opened_at >= self.cooldown:
+                self._probing = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._probing or self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+            self._probing = False
+
+    def release_probe(self):
+        """End a probe that failed for a reason unrelated to the host; the next request probes again."""
+        with self._lock:
+            self._probing = False
+
+class FetchPolicy:
+    """Retry, backoff and circuit-breaker rules shared by every network request.
+
+    Certificate verification is never relaxed: TLS errors are not retried and a
+    request only ever uses the verified ssl_context.
+    """
+
+    def __init__(self, ssl_context, retries=FETCH_RETRIES, backoff=FETCH_BACKOFF, max_backoff=FETCH_BACKOFF_MAX,
+                 threshold=BREAKER_THRESHOLD, cooldown=BREAKER_COOLDOWN, timeout=NETWORK_TIMEOUT):
+        self.ssl_context = ssl_context
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.timeout = timeout
+        self.breakers = {}
+        self._lock = threading.Lock()
+
+    def breaker(self, url):
+        """Return the circuit breaker for url's host."""
+        host = urllib.parse.urlsplit(url).netloc
+        with self._lock:
+            if host not in self.breakers:
+                self.breakers[host] = CircuitBreaker(self.threshold, self.cooldown)
+            return self.breakers[host]
+
+    @staticmethod
+    def is_transient(error):
+        """Whether error is worth retrying: timeouts, dropped connections, 5xx and throttling."""
+        if isinstance(error, urllib.error.HTTPError):
+            return error.code in (408, 425, 429) or error.code >= 500
+        if isinstance(error, urllib.error.URLError):
+            return not isinstance(error.reason, ssl.SSLError)
+        return isinstance(error, (TimeoutError, ConnectionError, http.client.HTTPException))
+
+    def delay(self, attempt):
+        """Full-jitter exponential backoff before retry number attempt + 1."""
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+    def fetch(self, url, consume=None):
+        """Open url, retrying transient failures; consume(response), if given, runs inside each attempt.
+
+        Without consume the open response is returned and the caller closes it.
+        """
+        breaker = self.breaker(url)
+        for attempt in range(self.retries + 1):
+            if not breaker.allow():
+                raise HostUnavailableError(f"{urllib.parse.urlsplit(url).netloc} is failing; skipped")
+            try:
+                response = urllib.request.urlopen(url, context=self.ssl_context, timeout=self.timeout)
+                if consume is None:
+                    breaker.record_success()
+                    return response
+                with response:
+                    result = consume(response)
+                breaker.record_success()
+                return result
+            except Exception as e:
+                if not self.is_transient(e):
+                    # Every outcome must settle the breaker, or a half-open probe would never end
+                    if isinstance(e, urllib.error.HTTPError):
+                        # The host answered, so it is up even if this path is missing
+                        breaker.record_success()
+                    elif isinstance(e, urllib.error.URLError):
+                        # e.g. a certificate the host cannot prove; it is unusable either way
+                        breaker.record_failure()
+                    else:
+                        # A local error, such as a failed write in consume, says nothing about the host
+                        breaker.release_probe()
+                    raise
+                breaker.record_failure()
+                if attempt == self.retries:
+                    raise
+                time.sleep(self.delay(attempt))
+
+class TokenBucket:
+    """Thread-safe bandwidth limiter; a rate of 0 means unlimited.
+
+    Bytes consumed here are also charged to the parent bucket, so a background
+    cap can sit under an overall cap.
+    """
+
+    def __init__(self, rate_bytes_per_s=0, parent=None):
+        self.rate = rate_bytes_per_s
+        self.parent = parent
+        self._available_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def consume(self, nbytes):
+        """Block until nbytes may be transferred; allows up to one second of burst."""
+        if self.parent:
+            self.parent.consume(nbytes)
+        if self.rate <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            # Idle time banks at most one second of credit
+            start = max(now - 1.0, self._available_at)
+            self._available_at = start + nbytes / self.rate
+            delay = self._available_at - now
+        if delay > 0:
+            time.sleep(delay)
+
+class DownloadScheduler:
+    """Worker pool that always runs the most urgent queued download first.
+
+    Workers are daemon threads that outlive a single install, so background work
+    queued for one launch keeps going after the game has started.
+    """
+
+    def __init__(self, workers=DOWNLOAD_WORKERS):
+        self.workers = workers
+        self._queue = queue.PriorityQueue()
+        self._sequence = itertools.count()
+        self._threads = []
+        self._lock = threading.Lock()
+
+    def submit(self, priority, work, *args):
+        """Queue work(*args) and return a Future for its result."""
+        future = concurrent.futures.Future()
+        self._queue.put((priority, next(self._sequence), future, work, args))
+        with self._lock:
+            while len(self._threads) < self.workers:
+                thread = threading.Thread(target=self._worker, daemon=True)
+                thread.start()
+                self._threads.append(thread)
+        return future
+
+    def _worker(self):
+        while True:
+            priority, sequence, future, work, args = self._queue.get()
+            try:
+                if future.set_running_or_notify_cancel():
+                    try:
+                        future.set_result(work(*args))
+                    except Exception as e:
+                        future.set_exception(e)
+            finally:
+                self._queue.task_done()
+
+    def pending(self):
+        """Number of queued or running jobs."""
+        return self._queue.unfinished_tasks
+
+    def join(self):
+        """Wait until every queued job, including background ones, has finished."""
+        self._queue.join()
+
+class LaunchAborted(Exception):
+    """Raised by a pre-launch task to stop the launch; a non-empty message is shown to the user."""
+
+class TaskFailed(Exception):
+    """A TaskGraph task raised; error is the original exception."""
+
+    def __init__(self, name, error):
+        super().__init__(f"{name}: {error}")
+        self.name = name
+        self.error = error
+
+class TaskGraph:
+    """Named tasks with explicit dependencies, each started as soon as everything it depends on has finished.
+
+    Tasks take no arguments; they read earlier results from graph.results. Start
+    and end times are kept for every task, so critical_path() can name the chain
+    that decided the total time once run() returns. With a LaunchProfiler, each
+    task is profiled on its worker thread.
+    """
+
+    def __init__(self, profiler=None):
+        self.tasks = {}  # name -> (func, dependency names)
+        self.results = {}
+        self.timings = {}  # name -> (start, end) perf_counter seconds
+        self.profiler = profiler
+
+    def add(self, name, func, depends_on=()):
+        """Add a task; dependencies must already be added, which keeps the graph acyclic."""
+        missing = [dep for dep in depends_on if dep not in self.tasks]
+        if missing:
+            raise ValueError(f"Task {name} depends on unknown task(s) {', '.join(missing)}.")
+        self.tasks[name] = (func, tuple(depends_on))
+
+    def _run_task(self, name):
+        started = time.perf_counter()
+        try:
+            if self.profiler is None:
+                return self.tasks[name][0]()
+            with self.profiler.profile_thread():
+                return self.tasks[name][0]()
+        finally:
+            self.timings[name] = (started, time.perf_counter())
+
+    def run(self, workers=None):
+        """Run every task concurrently as dependencies allow and return results by name.
+
+        After a failure no further tasks start; once the running ones finish the
+        first failure is raised as TaskFailed.
+        """
+        waiting = {name: set(deps) for name, (func, deps) in self.tasks.items()}
+        running = {}
+        failure = None
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers or max(1, len(self.tasks)),
+                                                   thread_name_prefix="prelaunch") as executor:
+            while waiting or running:
+                if failure is None:
+                    for name in [name for name, deps in waiting.items() if not deps]:
+                        del waiting[name]
+                        running[executor.submit(self._run_task, name)] = name
+                if not running:
+                    break
+                done, _ = concurrent.futures.wait(running, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    if future.exception() is not None:
+                        failure = failure or TaskFailed(name, future.exception())
+                        continue
+                    self.results[name] = future.result()
+                    for deps in waiting.values():
+                        deps.discard(name)
+        if failure is not None:
+            raise failure
+        return self.results
+
+    def critical_path(self):
+        """[(name, seconds)] from the first task to the last to finish, following the dependency that finished last."""
+        if not self.timings:
+            return []
+        name = max(self.timings, key=lambda task: self.timings[task][1])
+        path = []
+        while name is not None:
+            started, ended = self.timings[name]
+            path.append((name, ended - started))
+            deps = [dep for dep in self.tasks[name][1] if dep in self.timings]
+            name = max(deps, key=lambda dep: self.timings[dep][1]) if deps else None
+        return path[::-1]
+
+def maven_path(name):
+    """Repository path of a Maven coordinate group:artifact:version[:classifier][@extension].
+
+    Raises ValueError for anything else, including parts that would step outside the repository.
+    """
+    match = MAVEN_COORDINATE.fullmatch(name)
+    if match is None or any(part in (".", "..") for part in match.groups()):
+        raise ValueError(f"Malformed Maven coordinate {name!r}")
+    group, artifact, version, classifier, extension = match.groups()
+    suffix = f"-{classifier}" if classifier else ""
+    return f"{group.replace('.', '/')}/{artifact}/{version}/{artifact}-{version}{suffix}.{extension or 'jar'}"
+
+def library_identity(lib):
+    """group:artifact[:classifier] of a library, under which a child profile overrides its parent's copy."""
+    parts = lib.get("name", "").partition("@")[0].split(":")
+    return ":".join(parts[:2] + parts[3:4])
+
+def with_maven_artifact(lib):
+    """Give a library known only by Maven name and repository url a downloads.artifact entry."""
+    if "downloads" in lib or "natives" in lib or not lib.get("name"):
+        return lib
+    path = maven_path(lib["name"])
+    artifact = {"path": path, "url": (lib.get("url") or MAVEN_DEFAULT_REPOSITORY).rstrip("/") + "/" + path}
+    for key in ("sha1", "size"):
+        if key in lib:
+            artifact[key] = lib[key]
+    return {**lib, "downloads": {"artifact": artifact}}
+
+def merge_profiles(parent, child):
+    """Merge a child version profile (e.g. a mod loader's) over the parent it inheritsFrom.
+
+    The child's keys win, its libraries come first and replace parent libraries with
+    the same group and artifact, and both profiles' game and JVM arguments apply.
+    """
+    merged = {**parent, **child}
+    merged.pop("inheritsFrom", None)
+    child_libraries = child.get("libraries", [])
+    overridden = {library_identity(lib) for lib in child_libraries} - {""}
+    merged["libraries"] = child_libraries + [lib for lib in parent.get("libraries", [])
+                                             if library_identity(lib) not in overridden]
+    if "arguments" in parent and "arguments" in child:
+        merged["arguments"] = {kind: parent["arguments"].get(kind, []) + child["arguments"].get(kind, [])
+                               for kind in ("game", "jvm")}
+    return merged
+
+class ScrubCache:
+    """Outcome of past full-hash scrubs, so files verified recently and unchanged since are skipped."""
+
+    def __init__(self, path=SCRUB_CACHE_PATH):
+        self.path = path
+        self.entries = {}
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, "r") as f:
+                self.entries = dict(json.load(f))
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def save(self):
+        """Atomically replace the cache file."""
+        with self._lock:
+            data = json.dumps(self.entries)
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w") as f:
+            f.write(data)
+        os.replace(temp_path, self.path)
+
+    def checked_at(self, path):
+        """When path was last verified good, as a Unix time; 0 if never."""
+        return self.entries.get(path, {}).get("checked", 0)
+
+    def is_fresh(self, path, sha1, max_age):
+        """Whether path verified against sha1 within max_age seconds and is unchanged since."""
+        entry = self.entries.get(path)
+        if entry is None or entry.get("sha1") != sha1 or time.time() - entry.get("checked", 0) > max_age:
+            return False
+        try:
+            st = os.stat(path)
+        except OSError:
+            return False
+        return st.st_size == entry.get("size") and st.st_mtime_ns == entry.get("mtime_ns")
+
+    def record(self, path, sha1, ok):
+        """Remember a good result; a bad one drops any earlier entry."""
+        with self._lock:
+            if not ok:
+                self.entries.pop(path, None)
+                return
+        try:
+            st = os.stat(path)
+        except OSError:
+            return
+        with self._lock:
+            self.entries[path] = {"sha1": sha1, "size": st.st_size, "mtime_ns": st.st_mtime_ns, "checked": time.time()}
+
+class InstallJournal:
+    """Record of the artifacts a version has finished installing, kept in its version directory.
+
+    Entries are keyed by artifact path and hold the expected SHA1 plus the size and
+    mtime seen when the artifact was verified, so a later check only needs a stat.
+    The journal is rewritten atomically every few artifacts, which lets an
+    interrupted install resume where it stopped.
+    """
+
+    def __init__(self, version_dir):
+        self.path = os.path.join(version_dir, INSTALL_JOURNAL_NAME)
+        self.complete = False
+        self.artifacts = {}
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        """Read the journal from disk; a missing or damaged journal starts empty."""
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+            self.complete = bool(data.get("complete"))
+            self.artifacts = dict(data.get("artifacts", {}))
+        except (OSError, ValueError):
+            self.complete = False
+            self.artifacts = {}
+
+    def save(self):
+        """Atomically replace the journal file."""
+        with self._lock:
+            # Serialize under the lock; parallel downloads record entries while we save
+            data = json.dumps({"complete": self.complete, "artifacts": self.artifacts})
+            self._pending = 0
+        temp_path = self.path + ".tmp"
+        with self._save_lock:
+            with open(temp_path, "w") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.path)
+
+    @staticmethod
+    def _stat_matches(entry):
+        """Whether the file recorded in entry still has the size and mtime it was verified with.
+
+        Natives entries instead list the files extracted into the version's natives
+        directory, which must all still exist.
+        """
+        if "files" in entry:
+            return all(os.path.isfile(path) for path in entry["files"])
+        path = entry.get("path")
+        if path is None:
+            return True
+        try:
+            st = os.stat(path)
+        except OSError:
+            return False
+        return st.st_size == entry.get("size") and st.st_mtime_ns == entry.get("mtime_ns")
+
+    def is_done(self, key, sha1):
+        """Whether key was installed with this SHA1 and its file is unchanged since."""
+        entry = self.artifacts.get(key)
+        return entry is not None and entry.get("sha1") == sha1 and self._stat_matches(entry)
+
+    def record(self, key, sha1, path=None, files=None):
+        """Mark key as installed; path, when given, is stat'ed for later cheap checks.
+
+        files lists the paths a natives jar was extracted to, checked for existence instead.
+        """
+        entry = {"sha1": sha1, "path": path}
+        if files is not None:
+            entry["files"] = list(files)
+        if path is not None:
+            st = os.stat(path)
+            entry["size"] = st.st_size
+            entry["mtime_ns"] = st.st_mtime_ns
+        with self._lock:
+            self.artifacts[key] = entry
+            self._pending += 1
+            flush = self._pending >= JOURNAL_FLUSH_EVERY
+        if flush:
+            self.save()
+
+    def forget(self, paths):
+        """Drop entries for files found to be corrupt; returns whether anything was dropped."""
+        paths = set(paths)
+        with self._lock:
+            stale = [key for key, entry in self.artifacts.items() if entry.get("path") in paths]
+            for key in stale:
+                del self.artifacts[key]
+            if stale:
+                self.complete = False
+        return bool(stale)
+
+    def forget_keys(self, prefix):
+        """Drop entries whose key starts with prefix, such as asset-set markers; returns whether any were."""
+        with self._lock:
+            stale = [key for key in self.artifacts if key.startswith(prefix)]
+            for key in stale:
+                del self.artifacts[key]
+            if stale:
+                self.complete = False
+        return bool(stale)
+
+    def begin(self):
+        """Start (or resume) an install; the journal stays incomplete until finish()."""
+        self.complete = False
+
+    def finish(self):
+        """Mark the install complete and write the journal."""
+        self.complete = True
+        self.save()
+
+    def is_ready(self):
+        """Whether the install completed and every recorded file is unchanged."""
+        return self.complete and all(self._stat_matches(entry) for entry in self.artifacts.values())
+
+class LaunchProfiler:
+    """Profile a block with cProfile, tracemalloc and a stack sampler, then write a diagnostics folder.
+
+    The folder holds launch.pstats (open with pstats or snakeviz), allocations.txt
+    (top allocation sites) and launch.collapsed, which flamegraph.pl and speedscope
+    read directly. The sampler covers every thread, so work done off the Tk thread
+    still shows up in the flamegraph; cProfile only sees the threads it is enabled
+    on, so worker threads wrap their work in profile_thread() to reach launch.pstats.
+    """
+
+    def __init__(self, output_root=DIAGNOSTICS_DIR, top_allocations=25, sample_interval=0.005):
+        self.output_root = output_root
+        self.top_allocations = top_allocations
+        self.sample_interval = sample_interval
+        self.output_dir = None
+        self.error = None  # OSError from writing the reports, for the caller to surface
+        self.profile = cProfile.Profile()
+        self.thread_profiles = []  # finished per-thread profiles, merged into launch.pstats
+        self._profiles_lock = threading.Lock()
+        self.stacks = collections.Counter()
+        self._stop = threading.Event()
+        self._sampler = None
+
+    def __enter__(self):
+        tracemalloc.start(25)
+        self._sampler = threading.Thread(target=self._sample, name="launch-profiler", daemon=True)
+        self._sampler.start()
+        self.profile.enable()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.profile.disable()
+        self._stop.set()
+        self._sampler.join()
+        snapshot = tracemalloc.take_snapshot()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        try:
+            self.write_reports(snapshot, peak)
+        except OSError as e:
+            self.output_dir = None
+            self.error = e
+        return False
+
+    @contextlib.contextmanager
+    def profile_thread(self):
+        """Profile the calling worker thread for the duration of the block."""
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Interpreters whose profiler already covers every thread refuse a second one
+            yield
+            return
+        try:
+            yield
+        finally:
+            profile.disable()
+            with self._profiles_lock:
+                self.thread_profiles.append(profile)
+
+    def _sample(self):
+        """Record the collapsed stack of every other thread at a fixed interval."""
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.sample_interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                    frame = frame.f_back
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def write_reports(self, snapshot, peak):
+        """Write the pstats, allocation and collapsed-stack files."""
+        self.output_dir = os.path.join(self.output_root, time.strftime("launch-%Y%m%d-%H%M%S"))
+        os.makedirs(self.output_dir, exist_ok=True)
+        stats = pstats.Stats(self.profile)
+        with self._profiles_lock:
+            for profile in self.thread_profiles:
+                stats.add(profile)
+        stats.dump_stats(os.path.join(self.output_dir, "launch.pstats"))
+
+        with open(os.path.join(self.output_dir, "allocations.txt"), "w") as f:
+            f.write(f"Peak traced memory: {peak / 1024 / 1024:.1f} MiB\n")
+            f.write(f"Top {self.top_allocations} allocation sites still live at the end of the launch\n\n")
+            for stat in snapshot.statistics("traceback")[:self.top_allocations]:
+                f.write(f"{stat.size / 1024:.1f} KiB in {stat.count} blocks\n")
+                for line in stat.traceback.format(limit=8):
+                    f.write(f"    {line}\n")
+                f.write("\n")
+
+        with open(os.path.join(self.output_dir, "launch.collapsed"), "w") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+class CatLauncherMCv2025(tk.Tk):
+    def __init__(self):
+        """Initialize the launcher window and UI."""
+        super().__init__()
+        self.title("CatLauncher 1.0")
+        self.geometry("600x460")
+        self.minsize(600, 460)
+        self.current_theme = LIGHT_THEME  # Default to light for TLauncher resemblance
+        self.configure(background=self.current_theme['bg'])
+        self.headless = False
+        self._init_state()
+        
+        # Configure styles
+        self.style = ttk.Style()
+        self.style.theme_use('clam')
+        
+        self.init_ui()
+        self.update_theme()
+        self.start_metrics_export()
+        self.start_background_scrub()
+
+    @classmethod
+    def headless_launcher(cls):
+        """Create a launcher without a window, for command-line and benchmark use."""
+        launcher = cls.__new__(cls)
+        # tk.Tk delegates unknown attributes to self.tk; None keeps that an AttributeError
+        launcher.tk = None
+        launcher.headless = True
+        launcher._init_state()
+        return launcher
+
+    def _init_state(self):
+        """Set up the non-UI state shared by the window and headless launchers."""
+        self.versions = {}  # Dictionary to store version IDs and their URLs
+        self.manifest_snapshot = None  # Last loaded VersionManifest, diffed against on the next load
+        self.version_categories = {
+            "Latest Release": [],
+            "Latest Snapshot": [],
+            "Release": [],
+            "Snapshot": [],
+            "Old Beta": [],
+            "Old Alpha": [],
+            "Installed": []
+        }
+        self.launcher_config = load_launcher_config()
+        self.profile_launches = self.launcher_config.getboolean("diagnostics", "profile_launches", fallback=False)
+        self.ui_queue = queue.Queue()
+        self.supervisor = GameSupervisor()
+        self.download_scheduler = DownloadScheduler()
+        self.rule_engine = RuleEngine()
+        self.host_platform = current_platform()
+        self.profile_cache = {}  # version id -> ((json path, mtime_ns) chain, merged profile)
+        self.record_cache = {}  # version id -> VersionRecord
+        self.prewarm_cancel = threading.Event()
+        # launcher.ini [network] caps, in KiB/s; background downloads also count against the overall cap
+        self.download_throttle = TokenBucket(
+            self.launcher_config.getint("network", "bandwidth_limit_kbps", fallback=0) * 1024)
+        self.background_throttle = TokenBucket(
+            self.launcher_config.getint("network", "background_bandwidth_limit_kbps", fallback=0) * 1024,
+            parent=self.download_throttle)
+        
+        self.setup_ssl_context()
+        network = self.launcher_config["network"]
+        self.fetch_policy = FetchPolicy(
+            self.ssl_context,
+            retries=network.getint("retries", fallback=FETCH_RETRIES),
+            backoff=network.getfloat("backoff", fallback=FETCH_BACKOFF),
+            max_backoff=network.getfloat("max_backoff", fallback=FETCH_BACKOFF_MAX),
+            threshold=network.getint("breaker_threshold", fallback=BREAKER_THRESHOLD),
+            cooldown=network.getfloat("breaker_cooldown", fallback=BREAKER_COOLDOWN))
+
+    def setup_ssl_context(self):
+        """Setup a verifying SSL context that trusts the system store plus certifi's bundle."""
+        self.ssl_context = ssl.create_default_context()
+        try:
+            # Covers machines whose system store is missing or out of date
+            self.ssl_context.load_verify_locations(cafile=certifi.where())
+        except Exception as e:
+            pass
+
+    def start_metrics_export(self):
+        """Start the [metrics] textfile writer and localhost scrape endpoint, whichever are configured."""
+        textfile = self.launcher_config.get("metrics", "textfile", fallback="")
+        port = self.launcher_config.getint("metrics", "port", fallback=0)
+        interval = self.launcher_config.getfloat("metrics", "interval", fallback=METRICS_INTERVAL)
+        if port:
+            try:
+                METRICS.serve(port)
+            except OSError as e:
+                self.show_warning("Metrics", f"Port {port} unavailable: {e}")
+        if textfile:
+            def write_periodically():
+                failing = False
+                while True:
+                    try:
+                        METRICS.write_textfile(os.path.expanduser(textfile))
+                        failing = False
+                    except OSError as e:
+                        # Reported once per run of failures rather than every interval
+                        if not failing:
+                            self.show_warning("Metrics", f"Failed to write {textfile}: {e}")
+                        failing = True
+                    time.sleep(interval)
+            threading.Thread(target=write_periodically, name="metrics-textfile", daemon=True).start()
+
+    def post_ui(self, callback, *args):
+        """Run callback on the Tk thread; worker threads must not touch widgets directly."""
+        if self.headless:
+            callback(*args)
+        else:
+            self.ui_queue.put((callback, args))
+
+    def _drain_ui_queue(self):
+        """Run callbacks queued by worker threads, then reschedule."""
+        try:
+            while True:
+                callback, args = self.ui_queue.get_nowait()
+                callback(*args)
+        except queue.Empty:
+            pass
+        self.after(50, self._drain_ui_queue)
+
+    def run_in_background(self, work, on_done=None):
+        """Run work() on a daemon thread and hand its result to on_done on the Tk thread."""
+        def runner():
+            result = work()
+            if on_done:
+                self.post_ui(on_done, result)
+        thread = threading.Thread(target=runner, daemon=True)
+        thread.start()
+        return thread
+
+    def show_warning(self, title, message):
+        """Report a non-fatal problem on the Tools status line, or on stderr when running headless; thread-safe."""
+        if self.headless:
+            print(f"{title}: {message}", file=sys.stderr)
+        else:
+            self.post_ui(lambda: self.tools_status.config(text=f"{title}: {message}"))
+
+    def show_error(self, title, message):
+        """Report an error in a dialog, or on stderr when running headless."""
+        if self.headless:
+            print(f"{title}: {message}", file=sys.stderr)
+        elif threading.current_thread() is not threading.main_thread():
+            self.post_ui(messagebox.showerror, title, message)
+        else:
+            messagebox.showerror(title, message)
+
+    def mirror_candidates(self, url):
+        """Return the configured LAN mirror URLs for url, in the order they should be tried."""
+        return rewrite_url(url, self.launcher_config["mirror_rules"])
+
+    def upstream_fallback_enabled(self):
+        """Whether upstream hosts may be contacted when every mirror fails."""
+        return self.launcher_config.getboolean("network", "upstream_fallback", fallback=True)
+
+    def fetch_sources(self, url):
+        """URLs to try for url: configured mirrors first, then upstream unless that is disabled."""
+        sources = self.mirror_candidates(url)
+        if not sources or self.upstream_fallback_enabled():
+            sources.append(url)
+        return sources
+
+    def safe_urlopen(self, url):
+        """Open url through the fetch policy, failing over from mirror to mirror and then upstream."""
+        last_error = None
+        for source_url in self.fetch_sources(url):
+            try:
+                return self.fetch_policy.fetch(source_url)
+            except Exception as e:
+                last_error = e
+        raise last_error or urllib.error.URLError(f"No source could serve {url}")
+
+    def update_theme(self):
+        """Update the UI with the current theme."""
+        self.configure(background=self.current_theme['bg'])
+        self.style.configure("TFrame", background=self.current_theme['bg'])
+        self.style.configure("TLabel", background=self.current_theme['bg'], foreground=self.current_theme['text'])
+        self.style.configure("TButton", 
+                           background=self.current_theme['button'],
+                           foreground=self.current_theme['text'],
+                           borderwidth=0,
+                           focuscolor='none',
+                           relief='flat',
+                           font=("Arial", 10))
+        self.style.map("TButton",
+                      background=[('active', self.current_theme['button_hover']),
+                                 ('pressed', self.current_theme['accent'])])
+        
+        self.style.configure("TCombobox", 
+                           fieldbackground=self.current_theme['input_bg'],
+                           background=self.current_theme['input_bg'],
+                           foreground=self.current_theme['text'],
+                           arrowcolor=self.current_theme['text'],
+                           borderwidth=0,
+                           font=("Arial", 10))
+        
+        self.style.configure("TScale", 
+                           background=self.current_theme['bg'],
+                           troughcolor=self.current_theme['input_bg'])
+        
+        self.style.configure("TNotebook", 
+                           background=self.current_theme['header_bg'],
+                           borderwidth=0)
+        self.style.configure("TNotebook.Tab", 
+                           background=self.current_theme['tab_inactive'],
+                           foreground=self.current_theme['text_secondary'],
+                           padding=[15, 5],
+                           borderwidth=0,
+                           font=("Arial", 10))
+        self.style.map("TNotebook.Tab",
+                      background=[('selected', self.current_theme['tab_active'])],
+                      foreground=[('selected', self.current_theme['text'])])
+
+        # Update existing widgets
+        for widget in self.winfo_children():
+            self._update_widget_theme(widget)
+
+    def _update_widget_theme(self, widget):
+        """Recursively update widget and its children's theme."""
+        try:
+            if isinstance(widget, tk.Frame):
+                widget.configure(background=self.current_theme['bg'])
+            elif isinstance(widget, tk.Label):
+                widget.configure(background=self.current_theme['bg'], foreground=self.current_theme['text'])
+            elif isinstance(widget, tk.Entry):
+                try:
+                    widget.configure(background=self.current_theme['input_bg'], foreground=self.current_theme['text'], 
+                                   insertbackground=self.current_theme['text'])
+                except tk.TclError:
+                    pass
+            elif isinstance(widget, tk.Button):
+                widget.configure(background=self.current_theme['button'], foreground=self.current_theme['text'])
+            elif isinstance(widget, tk.Checkbutton):
+                widget.configure(background=self.current_theme['bg'], foreground=self.current_theme['text'], 
+                               selectcolor=self.current_theme['sidebar'], 
+                               activebackground=self.current_theme['bg'], 
+                               activeforeground=self.current_theme['text'])
+            elif isinstance(widget, tk.Listbox):
+                widget.configure(background=self.current_theme['input_bg'], foreground=self.current_theme['text'], 
+                               selectbackground=self.current_theme['accent'], 
+                               selectforeground=self.current_theme['text'])
+            elif isinstance(widget, tk.Scale):
+                widget.configure(background=self.current_theme['bg'], foreground=self.current_theme['text'],
+                               activebackground=self.current_theme['accent'],
+                               troughcolor=self.current_theme['input_bg'])
+        except tk.TclError as e:
+            pass
+        
+        for child in widget.winfo_children():
+            self._update_widget_theme(child)
+
+    def set_theme(self, theme_name):
+        """Set the theme based on selection."""
+        if theme_name == "Dark":
+            self.current_theme = DARK_THEME
+        elif theme_name == "Light":
+            self.current_theme = LIGHT_THEME
+        elif theme_name == "System":
+            self.current_theme = SYSTEM_THEME
+        self.update_theme()
+
+    def init_ui(self):
+        """Set up the graphical user interface with TLauncher styling."""
+        # Header
+        header = tk.Frame(self, background=self.current_theme['header_bg'], height=40)
+        header.pack(fill="x", side="top")
+        header.pack_propagate(False)
+        
+        # Header title
+        title = tk.Label(header, text="CatLauncher", font=("Arial", 14, "bold"), 
+                        background=self.current_theme['header_bg'], foreground=self.current_theme['text'])
+        title.pack(side="left", padx=15, pady=10)
+        
+        # Header version
+        version = tk.Label(header, text="1.0", font=("Arial", 10), 
+                          background=self.current_theme['header_bg'], foreground=self.current_theme['text_secondary'])
+        version.pack(side="right", padx=15, pady=10)
+        
+        # Theme selector
+        theme_frame = tk.Frame(header, background=self.current_theme['header_bg'])
+        theme_frame.pack(side="right", padx=10)
+        theme_label = tk.Label(theme_frame, text="Theme:", font=("Arial", 10),
+                              background=self.current_theme['header_bg'], foreground=self.current_theme['text_secondary'])
+        theme_label.pack(side="left")
+        theme_options = ["Dark", "Light", "System"]
+        self.theme_var = tk.StringVar(value="Light")
+        theme_menu = ttk.Combobox(theme_frame, textvariable=self.theme_var, values=theme_options,
+                                   state="readonly")
+        theme_menu.set("Light")
+        theme_menu.bind("<<ComboboxSelected>>", lambda e: self.set_theme(self.theme_var.get()))
+        theme_menu.pack(side="left", padx=5)
+        
+        # Main container
+        main_container = tk.Frame(self, background=self.current_theme['bg'])
+        main_container.pack(fill="both", expand=True, padx=10, pady=10)
+
+        # Left panel - Game settings
+        left_panel = tk.Frame(main_container, background=self.current_theme['sidebar'], width=300)
+        left_panel.pack(side="left", fill="y", padx=(0, 10))
+        left_panel.pack_propagate(False)
+
+        # Game version selection
+        version_frame = tk.Frame(left_panel, background=self.current_theme['sidebar'])
+        version_frame.pack(fill="x", padx=15, pady=15)
+        
+        tk.Label(version_frame, text="VERSION", font=("Arial", 9, "bold"), 
+                background=self.current_theme['sidebar'], foreground=self.current_theme['text_secondary']).pack(anchor="w")
+        
+        self.category_combo = ttk.Combobox(version_frame, values=list(self.version_categories.keys()),
+                                         state="readonly")
+        self.category_combo.pack(fill="x", pady=(5, 0))
+        self.category_combo.set("Latest Release")
+        self.category_combo.bind("<<ComboboxSelected>>", self.update_version_list)
+
+        self.version_combo = ttk.Combobox(version_frame, state="readonly")
+        self.version_combo.pack(fill="x", pady=5)
+        self.version_combo.bind("<<ComboboxSelected>>", self.on_version_selected)
+
+        # Instance selection; each instance has its own saves, mods and options
+        tk.Label(version_frame, text="INSTANCE", font=("Arial", 9, "bold"), 
+                background=self.current_theme['sidebar'], foreground=self.current_theme['text_secondary']).pack(anchor="w")
+
+        instance_row = tk.Frame(version_frame, background=self.current_theme['sidebar'])
+        instance_row.pack(fill="x", pady=(5, 0))
+        self.instance_combo = ttk.Combobox(instance_row, values=self.list_instances(), state="readonly")
+        self.instance_combo.set(DEFAULT_INSTANCE)
+        self.instance_combo.bind("<<ComboboxSelected>>", self.on_instance_selected)
+        self.instance_combo.pack(side="left", fill="x", expand=True)
+        ttk.Button(instance_row, text="New", width=5, command=self.create_instance_dialog).pack(side="left", padx=(5, 0))
+
+        # Account settings
+        account_frame = tk.Frame(left_panel, background=self.current_theme['sidebar'])
+        account_frame.pack(fill="x", padx=15, pady=10)
+        
+        tk.Label(account_frame, text="ACCOUNT", font=("Arial", 9, "bold"), 
+                background=self.current_theme['sidebar'], foreground=self.current_theme['text_secondary']).pack(anchor="w")
+        
+        self.username_input = tk.Entry(account_frame, font=("Arial", 10), background=self.current_theme['input_bg'],
+                                     foreground=self.current_theme['text'], insertbackground=self.current_theme['text'], 
+                                     bd=0, relief="flat")
+        self.username_input.pack(fill="x", pady=(5, 0))
+        self.username_input.insert(0, "Player")
+        self.username_input.bind("<FocusIn>", lambda e: self.username_input.delete(0, tk.END) 
+                               if self.username_input.get() == "Player" else None)
+
+        # RAM settings
+        ram_frame = tk.Frame(left_panel, background=self.current_theme['sidebar'])
+        ram_frame.pack(fill="x", padx=15, pady=10)
+        
+        ram_header = tk.Frame(ram_frame, background=self.current_theme['sidebar'])
+        ram_header.pack(fill="x")
+        
+        tk.Label(ram_header, text="RAM", font=("Arial", 9, "bold"),
+                background=self.current_theme['sidebar'], foreground=self.current_theme['text_secondary']).pack(side="left")
+        
+        self.ram_value_label = tk.Label(ram_header, text="4 GB", font=("Arial", 9),
+                                      background=self.current_theme['sidebar'], foreground=self.current_theme['text'])
+        self.ram_value_label.pack(side="right")
+
+        total_gb = read_meminfo().get("MemTotal", 0) // 1073741824
+        self.ram_scale = tk.Scale(ram_frame, from_=1, to=max(1, min(total_gb, HEAP_MAX_MB // 1024)) if total_gb else 16,
+                                orient="horizontal",
+                                background=self.current_theme['sidebar'], foreground=self.current_theme['text'],
+                                activebackground=self.current_theme['accent'],
+                                highlightthickness=0, bd=0,
+                                troughcolor=self.current_theme['input_bg'],
+                                sliderrelief="flat",
+                                command=lambda v: self.ram_value_label.config(text=f"{int(float(v))} GB"))
+        self.ram_scale.set(4)
+        self.ram_scale.pack(fill="x")
+        # Only a drag or key press counts as the user's choice; set() from a recommendation does not
+        self.ram_user_set = False
+        for sequence in ("<ButtonRelease-1>", "<KeyRelease>"):
+            self.ram_scale.bind(sequence, lambda event: setattr(self, "ram_user_set", True))
+
+        # Skin button
+        skin_button = ttk.Button(left_panel, text="Change Skin", command=self.select_skin)
+        skin_button.pack(padx=15, pady=10, fill="x")
+
+        # Launch button
+        launch_button = ttk.Button(left_panel, text="PLAY", command=self.prepare_and_launch)
+        launch_button.pack(side="bottom", padx=15, pady=15, fill="x")
+
+        # Right panel - Tabs and content
+        right_panel = tk.Frame(main_container, background=self.current_theme['bg'])
+        right_panel.pack(side="left", fill="both", expand=True)
+
+        # Create notebook for tabs
+        notebook = ttk.Notebook(right_panel)
+        notebook.pack(fill="both", expand=True)
 
         # Mod-packs tab (renamed from News)
         modpacks_tab = ttk.Frame(notebook)
         notebook.add(modpacks_tab, text="Mod-packs")
 
-        # Mods tab (new, placeholder)
-        mods_tab = ttk.Frame(notebook)
-        notebook.add(mods_tab, text="Mods")
+        # Mods tab (new, placeholder)
+        mods_tab = ttk.Frame(notebook)
+        notebook.add(mods_tab, text="Mods")
+
+        # Resource Packs tab (renamed from Versions)
+        resourcepacks_tab = ttk.Frame(notebook)
+        notebook.add(resourcepacks_tab, text="Resource Packs")
+
+        # Settings tab
+        settings_tab = ttk.Frame(notebook)
+        notebook.add(settings_tab, text="Settings")
+
+        # Running tab
+        running_tab = ttk.Frame(notebook)
+        notebook.add(running_tab, text="Running")
+
+        # Tools tab
+        tools_tab = ttk.Frame(notebook)
+        notebook.add(tools_tab, text="Tools")
+
+        # Populate mod-packs tab with placeholder content (original news items)
+        modpacks_content = tk.Frame(modpacks_tab, background=self.current_theme['bg'])
+        modpacks_content.pack(fill="both", expand=True, padx=10, pady=10)
+
+        modpacks_title = tk.Label(modpacks_content, text="CATLAUNCHER MOD-PACKS", 
+                             font=("Arial", 16, "bold"), background=self.current_theme['bg'], 
+                             foreground=self.current_theme['accent'])
+        modpacks_title.pack(anchor="w", pady=(0, 15))
+
+        news_items = [
+            "• Custom Minecraft Launcher with TLauncher-style interface",
+            "• Support for all Minecraft versions",
+            "• Automatic Java installation",
+            "• Easy skin changing",
+            "• Optimized performance settings",
+            "• Lightweight and fast",
+            "• Regular updates and improvements"
+        ]
+
+        for item in news_items:
+            item_frame = tk.Frame(modpacks_content, background=self.current_theme['bg'])
+            item_frame.pack(fill="x", pady=2)
+            tk.Label(item_frame, text=item, font=("Arial", 10),
+                    background=self.current_theme['bg'], foreground=self.current_theme['text'], 
+                    justify="left", anchor="w").pack(fill='x')
+
+        # Populate mods tab with placeholder
+        mods_content = tk.Frame(mods_tab, background=self.current_theme['bg'])
+        mods_content.pack(fill="both", expand=True, padx=10, pady=10)
+        tk.Label(mods_content, text="MODS PLACEHOLDER", font=("Arial", 12, "bold"), 
+                 background=self.current_theme['bg'], foreground=self.current_theme['text']).pack(anchor="w")
+
+        # Resource packs tab (original versions list)
+        resourcepacks_content = tk.Frame(resourcepacks_tab, background=self.current_theme['bg'])
+        resourcepacks_content.pack(fill="both", expand=True, padx=10, pady=10)
+
+        resourcepacks_title = tk.Label(resourcepacks_content, text="AVAILABLE VERSIONS", 
+                                 font=("Arial", 12, "bold"), background=self.current_theme['bg'], 
+                                 foreground=self.current_theme['text'])
+        resourcepacks_title.pack(anchor="w", pady=(0, 10))
+
+        version_list_frame = tk.Frame(resourcepacks_content, background=self.current_theme['bg'])
+        version_list_frame.pack(fill="both", expand=True)
+
+        scrollbar = ttk.Scrollbar(version_list_frame)
+        scrollbar.pack(side="right", fill="y")
+
+        self.version_listbox = tk.Listbox(version_list_frame, background=self.current_theme['input_bg'], 
+                                        foreground=self.current_theme['text'],
+                                        selectbackground=self.current_theme['accent'], 
+                                        selectforeground=self.current_theme['text'],
+                                        yscrollcommand=scrollbar.set, font=("Arial", 10), bd=0)
+        self.version_listbox.pack(side="left", fill="both", expand=True)
+        self.version_listbox.bind("<<ListboxSelect>>", self.on_version_selected)
+        scrollbar.config(command=self.version_listbox.yview)
+
+        # Settings tab content
+        settings_content = tk.Frame(settings_tab, background=self.current_theme['bg'])
+        settings_content.pack(fill="both", expand=True, padx=10, pady=10)
+
+        settings_title = tk.Label(settings_content, text="LAUNCHER SETTINGS", 
+                                 font=("Arial", 12, "bold"), background=self.current_theme['bg'], 
+                                 foreground=self.current_theme['text'])
+        settings_title.pack(anchor="w", pady=(0, 10))
+
+        self.profile_var = tk.BooleanVar(value=self.profile_launches)
+        self.profile_var.trace_add("write", lambda *args: setattr(self, "profile_launches", self.profile_var.get()))
+
+        settings_options = [
+            ("Auto-update launcher", tk.BooleanVar(value=True)),
+            ("Close launcher when game starts", tk.BooleanVar(value=False)),
+            ("Keep launcher open", tk.BooleanVar(value=True)),
+            ("Check for Java updates", tk.BooleanVar(value=True)),
+            ("Profile launches (writes diagnostics)", self.profile_var)
+        ]
+
+        for text, var in settings_options:
+            cb = tk.Checkbutton(settings_content, text=text, variable=var,
+                              background=self.current_theme['bg'], foreground=self.current_theme['text'], 
+                              selectcolor=self.current_theme['sidebar'],
+                              activebackground=self.current_theme['bg'], 
+                              activeforeground=self.current_theme['text'])
+            cb.pack(anchor="w", pady=5)
+
+        dir_frame = tk.Frame(settings_content, background=self.current_theme['bg'])
+        dir_frame.pack(fill="x", pady=10)
+
+        tk.Label(dir_frame, text="Game Directory:", background=self.current_theme['bg'], 
+                foreground=self.current_theme['text']).pack(anchor="w")
+        dir_entry = tk.Entry(dir_frame, background=self.current_theme['input_bg'], 
+                           foreground=self.current_theme['text'], 
+                           insertbackground=self.current_theme['text'], bd=0)
+        dir_entry.insert(0, MINECRAFT_DIR)
+        dir_entry.pack(fill="x", pady=(5, 0))
+
+        # Running tab content
+        running_content = tk.Frame(running_tab, background=self.current_theme['bg'])
+        running_content.pack(fill="both", expand=True, padx=10, pady=10)
+
+        running_title = tk.Label(running_content, text="RUNNING GAMES", 
+                                 font=("Arial", 12, "bold"), background=self.current_theme['bg'], 
+                                 foreground=self.current_theme['text'])
+        running_title.pack(anchor="w", pady=(0, 10))
+
+        columns = ("instance", "version", "status", "cpu", "rss", "peak", "threads", "menu")
+        headings = ("Instance", "Version", "Status", "CPU %", "RSS MB", "Peak MB", "Threads", "Menu s")
+        self.running_tree = ttk.Treeview(running_content, columns=columns, show="headings", height=6)
+        for column, heading in zip(columns, headings):
+            self.running_tree.heading(column, text=heading)
+            self.running_tree.column(column, width=60, anchor="w")
+        self.running_tree.pack(fill="both", expand=True)
+        self.running_games = {}
+
+        running_buttons = tk.Frame(running_content, background=self.current_theme['bg'])
+        running_buttons.pack(fill="x", pady=(5, 0))
+        ttk.Button(running_buttons, text="Kill", command=self.kill_selected_game).pack(side="left")
+        ttk.Button(running_buttons, text="Restart", command=self.restart_selected_game).pack(side="left", padx=5)
+
+        # Tools tab content
+        tools_content = tk.Frame(tools_tab, background=self.current_theme['bg'])
+        tools_content.pack(fill="both", expand=True, padx=10, pady=10)
+
+        tools_title = tk.Label(tools_content, text="MAINTENANCE", 
+                               font=("Arial", 12, "bold"), background=self.current_theme['bg'], 
+                               foreground=self.current_theme['text'])
+        tools_title.pack(anchor="w", pady=(0, 10))
+
+        self.verify_button = ttk.Button(tools_content, text="Verify all installed versions",
+                                        command=self.start_verify_all)
+        self.verify_button.pack(fill="x", pady=5)
+        self.gc_button = ttk.Button(tools_content, text="Clean up unused files",
+                                    command=self.start_garbage_collection)
+        self.gc_button.pack(fill="x", pady=5)
+        ttk.Button(tools_content, text="Export offline bundle...",
+                   command=self.start_export_bundle).pack(fill="x", pady=5)
+        ttk.Button(tools_content, text="Import offline bundle...",
+                   command=self.start_import_bundle).pack(fill="x", pady=5)
+        self.tools_progress = ttk.Progressbar(tools_content, orient="horizontal", mode="determinate")
+        self.tools_progress.pack(fill="x", pady=5)
+        self.tools_status = tk.Label(tools_content, text="", font=("Arial", 9), anchor="w", justify="left",
+                                     background=self.current_theme['bg'], foreground=self.current_theme['text'])
+        self.tools_status.pack(fill="x")
+
+        # Load versions after UI is initialized
+        self.after(100, self.load_version_manifest)
+        self.after(50, self._drain_ui_queue)
+        self.after(int(SUPERVISOR_SAMPLE_INTERVAL * 1000), self._supervise)
+
+    def update_version_list(self, event=None):
+        """Update the version list based on the selected category."""
+        if self.headless:
+            return
+        category = self.category_combo.get()
+        self.version_combo['values'] = self.version_categories[category]
+        if self.version_combo['values']:
+            self.version_combo.current(0)
+        
+        self.version_listbox.delete(0, tk.END)
+        for version in self.version_categories[category]:
+            self.version_listbox.insert(tk.END, version)
+
+    def load_version_manifest(self):
+        """Load the list of available Minecraft versions, updating only what changed since the last load.
+
+        Returns the diff against the previous snapshot, or None when the manifest
+        could not be fetched.
+        """
+        previous = self.manifest_snapshot if self.manifest_snapshot is not None else self.load_manifest_snapshot()
+        try:
+            with self.safe_urlopen(VERSION_MANIFEST_URL) as url:
+                raw_manifest = url.read()
+            # An unchanged manifest, the usual case, is recognised by its hash and never parsed
+            if previous is not None and previous.digest == hashlib.sha1(raw_manifest).hexdigest():
+                manifest = previous
+            else:
+                manifest = VersionManifest.from_json(raw_manifest)
+        except Exception as e:
+            # Offline: versions installed locally or from a bundle can still be launched
+            self.version_categories["Installed"] = self.installed_version_ids()
+            if self.version_categories["Installed"] and not self.headless:
+                self.category_combo.set("Installed")
+                self.update_version_list()
+            self.show_error("Error", "Failed to load version manifest. Check your internet connection and SSL certificates.")
+            return None
+
+        diff = diff_manifests(previous, manifest)
+        self.manifest_snapshot = manifest
+        if manifest is not previous:
+            self.cache_manifest(raw_manifest, manifest)
+
+        for version_id in diff["removed"]:
+            self.versions.pop(version_id, None)
+        if len(self.versions) != len(manifest.entries) or diff["added"] or diff["changed"]:
+            for v in manifest.entries:
+                self.versions[v.id] = v.url
+
+        categories = categorize_versions(manifest)
+        categories["Installed"] = self.installed_version_ids()
+        changed = [name for name, ids in categories.items() if self.version_categories.get(name) != ids]
+        for name in changed:
+            self.version_categories[name] = categories[name]
+        # Refilling the combobox is the expensive part, so leave it alone unless its category moved
+        if not self.headless and self.category_combo.get() in changed:
+            self.update_version_list()
+
+        # Without a previous snapshot every version would look new
+        if previous is not None and diff["added"]:
+            self.announce_new_versions(diff["added"], manifest)
+            self.prefetch_new_releases(diff["added"], manifest)
+        return diff
+
+    def load_manifest_snapshot(self):
+        """Read the manifest saved by the last successful load, or None.
+
+        The compact cache is memory-mapped; the raw JSON is only parsed when the
+        compact copy is missing or from another format.
+        """
+        try:
+            snapshot = VersionManifest.load(read_marshal_file(MANIFEST_COMPACT_PATH))
+            if snapshot is not None:
+                return snapshot
+        except (OSError, ValueError, EOFError, TypeError) as e:
+            pass
+        try:
+            with open(MANIFEST_CACHE_PATH, "rb") as f:
+                return VersionManifest.from_json(f.read())
+        except (OSError, ValueError, KeyError) as e:
+            return None
+
+    def announce_new_versions(self, added, manifest):
+        """Tell the user about versions that appeared since the last manifest load."""
+        types = {v.id: v.type for v in manifest.entries}
+        shown = [v for v in added if types.get(v) in ("release", "snapshot")]
+        if not shown:
+            return
+        message = "New Minecraft versions available: " + ", ".join(shown[:5])
+        if len(shown) > 5:
+            message += f" and {len(shown) - 5} more"
+        if self.headless:
+            print(message)
+        else:
+            messagebox.showinfo("New Versions", message)
+
+    def prefetch_new_releases(self, added, manifest):
+        """Install newly released versions in the background when [updates] prefetch_new_releases is on."""
+        if not self.launcher_config.getboolean("updates", "prefetch_new_releases", fallback=False):
+            return None
+        urls = {v.id: v.url for v in manifest.entries if v.type == "release"}
+        releases = [v for v in added if v in urls]
+        if not releases:
+            return None
+
+        def work():
+            for version_id in releases:
+                self.download_version_files(version_id, urls[version_id], background=True)
+            return releases
+
+        def finished(result):
+            self.version_categories["Installed"] = self.installed_version_ids()
+            if not self.headless and self.category_combo.get() == "Installed":
+                self.update_version_list()
+
+        return self.run_in_background(work, finished)
+
+    def cache_manifest(self, raw_manifest, manifest):
+        """Keep the last good manifest so this machine can seed LAN mirrors, plus its compact form for startup."""
+        try:
+            os.makedirs(CATLAUNCHER_DIR, exist_ok=True)
+            temp_path = MANIFEST_CACHE_PATH + ".tmp"
+            with open(temp_path, "wb") as f:
+                f.write(raw_manifest)
+            os.replace(temp_path, MANIFEST_CACHE_PATH)
+            write_marshal_file(MANIFEST_COMPACT_PATH, manifest.dump())
+        except OSError as e:
+            pass
+
+    def is_java_installed(self, required_version="21"):
+        """Check if a compatible Java version (21 or higher) is installed."""
+        try:
+            result = subprocess.run(["java", "-version"], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, timeout=10)
+            output = result.stderr
+            match = re.search(r'version "(\d+)', output)
+            if match:
+                major_version = int(match.group(1))
+                return major_version >= int(required_version)
+            return False
+        except subprocess.TimeoutExpired:
+            return False
+        except Exception:
+            return False
+
+    def bundled_java_path(self):
+        """Return the path of the java executable inside the launcher-managed JDK."""
+        java_exe = "java.exe" if platform.system() == "Windows" else "java"
+        return os.path.join(JAVA_DIR, JDK_DIRNAME, "bin", java_exe)
+
+    def java_executable(self):
+        """The java to launch with: the system's if it is new enough, else the bundled JDK's."""
+        if self.is_java_installed():
+            return "java"
+        java_path = self.bundled_java_path()
+        return java_path if os.path.exists(java_path) else "java"
+
+    def install_java_if_needed(self, use_system_java=True):
+        """Install OpenJDK 21 if neither a compatible system Java nor the bundled JDK is found."""
+        if use_system_java and self.is_java_installed():
+            return True
+        if os.path.exists(self.bundled_java_path()):
+            return True
+        
+        system = platform.system()
+        java_url = JDK_URLS.get(system)
+        if not java_url:
+            self.show_error("Error", "Unsupported OS")
+            return False
+
+        os.makedirs(JAVA_DIR, exist_ok=True)
+        try:
+            expected_sha256 = self.fetch_jdk_checksum(java_url)
+        except Exception as e:
+            # Without the published checksum the archive cannot be verified, so nothing is installed
+            self.show_error("Error", f"Could not fetch the checksum for Java 21, so it was not installed. "
+                                     f"Please try again or install Java 21 manually. ({e})")
+            return False
+        staging_dir = os.path.join(JAVA_DIR, f".staging-{os.getpid()}")
+        shutil.rmtree(staging_dir, ignore_errors=True)
+
+        try:
+            with self.safe_urlopen(java_url) as response:
+                reader = HashingReader(response)
+                if java_url.endswith(".zip"):
+                    # A zip's directory sits at the end, so it is spooled in memory rather than streamed
+                    with tempfile.SpooledTemporaryFile(max_size=512 * 1024 * 1024) as spool:
+                        shutil.copyfileobj(reader, spool, STREAM_CHUNK_SIZE)
+                        spool.seek(0)
+                        with zipfile.ZipFile(spool, "r") as zip_ref:
+                            zip_ref.extractall(staging_dir)
+                else:
+                    # Stream mode: members are extracted as their bytes arrive, with modes from the headers
+                    with tarfile.open(fileobj=reader, mode="r|gz") as tar_ref:
+                        if hasattr(tarfile, "data_filter"):
+                            tar_ref.extractall(staging_dir, filter="data")
+                        else:
+                            tar_ref.extractall(staging_dir)
+                    reader.drain()
+        except Exception as e:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+            self.show_error("Error", f"Failed to download Java 21. Please check your internet connection or install Java manually. ({e})")
+            return False
+
+        if reader.hexdigest() != expected_sha256:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+            self.show_error("Error", "The downloaded Java 21 archive failed its checksum. Please try again.")
+            return False
+
+        try:
+            target_dir = os.path.join(JAVA_DIR, JDK_DIRNAME)
+            shutil.rmtree(target_dir, ignore_errors=True)
+            os.replace(os.path.join(staging_dir, JDK_DIRNAME), target_dir)
+            shutil.rmtree(staging_dir, ignore_errors=True)
+            return True
+        except Exception as e:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+            self.show_error("Error", f"Failed to extract Java: {e}")
+            return False
+
+    def fetch_jdk_checksum(self, java_url):
+        """Fetch the published SHA-256 of the JDK archive; raises if it cannot be fetched or parsed."""
+        with self.safe_urlopen(java_url + JDK_CHECKSUM_SUFFIX) as response:
+            digest = response.read().decode().split()[0].lower()
+        if not re.fullmatch(r"[0-9a-f]{64}", digest):
+            raise ValueError(f"malformed checksum {digest[:80]!r}")
+        return digest
+
+    def select_skin(self):
+        """Allow the user to select and apply a custom skin PNG file."""
+        file_path = filedialog.askopenfilename(
+            title="Select Skin PNG", 
+            filetypes=[("PNG Files", "*.png"), ("All Files", "*.*")]
+        )
+        if file_path:
+            try:
+                skin_dest = os.path.join(MINECRAFT_DIR, "skins")
+                os.makedirs(skin_dest, exist_ok=True)
+                shutil.copy(file_path, os.path.join(skin_dest, "custom_skin.png"))
+                messagebox.showinfo("Skin Applied", "Skin applied successfully! Note: This may require a mod to apply in-game.")
+            except Exception as e:
+                messagebox.showerror("Error", f"Failed to copy skin: {e}")
+
+    @staticmethod
+    def verify_file(file_path, expected_sha1):
+        """Verify the SHA1 checksum of a file."""
+        try:
+            matches = hash_file(file_path) == expected_sha1
+        except Exception:
+            matches = False
+        if not matches:
+            VERIFY_FAILURES.inc()
+        return matches
 
-        # Resource Packs tab (renamed from Versions)
-        resourcepacks_tab = ttk.Frame(notebook)
-        notebook.add(resourcepacks_tab, text="Resource Packs")
+    def safe_download_file(self, url, file_path, expected_sha1=None, throttle=None):
+        """Safely download a file with SSL context and optional verification.
+
+        The body is streamed to a .part file and hashed on the way, so the target
+        is only replaced by a complete, verified copy. throttle is a TokenBucket.
+        """
+        throttle = throttle or self.download_throttle
+        # A stale or partial mirror copy fails verification and falls through to the next source
+        for source_url in self.fetch_sources(url):
+            try:
+                if self.fetch_policy.fetch(source_url, lambda response: self.stream_to_file(
+                        response, file_path, expected_sha1, throttle)):
+                    return True
+            except Exception as e:
+                continue
+        return False
+
+    @staticmethod
+    def stream_to_file(response, file_path, expected_sha1, throttle):
+        """Copy response into file_path via a .part file; returns False on a hash mismatch."""
+        part_path = file_path + ".part"
+        digest = hashlib.sha1()
+        try:
+            with open(part_path, "wb") as f:
+                for chunk in iter(lambda: response.read(DOWNLOAD_CHUNK_SIZE), b""):
+                    throttle.consume(len(chunk))
+                    DOWNLOAD_BYTES.inc(len(chunk))
+                    digest.update(chunk)
+                    f.write(chunk)
+            if expected_sha1 and digest.hexdigest() != expected_sha1:
+                VERIFY_FAILURES.inc()
+                os.remove(part_path)
+                return False
+            os.replace(part_path, file_path)
+            return True
+        except Exception:
+            if os.path.exists(part_path):
+                os.remove(part_path)
+            raise
+
+    def fetch_artifact(self, journal, url, path, sha1, throttle=None):
+        """Download one artifact unless an intact copy is already on disk, then record it.
+
+        Without a sha1, as for some Maven-only libraries, any existing copy is kept.
+        """
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if os.path.exists(path) and (sha1 is None or self.verify_file(path, sha1)):
+            ARTIFACT_LOOKUPS.inc(result="hit")
+        elif self.safe_download_file(url, path, sha1, throttle):
+            ARTIFACT_LOOKUPS.inc(result="miss")
+        else:
+            return False
+        journal.record(path, sha1, path)
+        return True
+
+    def fetch_natives(self, journal, key, url, sha1, natives_dir, exclude=(), throttle=None):
+        """Link a natives jar's files from the shared store into natives_dir and record it under key.
+
+        The jar is only downloaded and extracted the first time any version needs it.
+        """
+        store_dir = os.path.join(NATIVES_STORE_DIR, sha1)
+        if os.path.isdir(store_dir):
+            ARTIFACT_LOOKUPS.inc(result="hit")
+        elif self.extract_natives_to_store(url, sha1, throttle):
+            ARTIFACT_LOOKUPS.inc(result="miss")
+        else:
+            return False
+        try:
+            journal.record(key, sha1, files=link_tree(store_dir, natives_dir, exclude))
+            return True
+        except Exception as e:
+            return False
+
+    def extract_natives_to_store(self, url, sha1, throttle=None):
+        """Download a natives jar and unpack it into natives-store/<sha1>."""
+        os.makedirs(NATIVES_STORE_DIR, exist_ok=True)
+        staging = tempfile.mkdtemp(prefix=f"{sha1}.staging-", dir=NATIVES_STORE_DIR)
+        jar_path = staging + ".jar"
+        try:
+            if not self.safe_download_file(url, jar_path, sha1, throttle):
+                return False
+            with zipfile.ZipFile(jar_path, "r") as zip_ref:
+                zip_ref.extractall(staging)
+            try:
+                os.rename(staging, os.path.join(NATIVES_STORE_DIR, sha1))
+            except OSError:
+                # Another install finished the same jar first
+                pass
+            return os.path.isdir(os.path.join(NATIVES_STORE_DIR, sha1))
+        except Exception as e:
+            return False
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+            if os.path.exists(jar_path):
+                os.remove(jar_path)
+
+    def download_version_files(self, version_id, version_url, background=False):
+        """Download the version JSON, JAR, libraries, and natives with checksum verification.
+
+        Launch-critical files are queued ahead of natives and waited for; assets are
+        queued at background priority and may still be downloading on return. With
+        background, as for pre-fetching, everything runs at background priority and
+        bandwidth and errors go to the status line instead of a dialog.
+        """
+        critical, natives = (PRIORITY_BACKGROUND, PRIORITY_BACKGROUND) if background else \
+            (PRIORITY_CRITICAL, PRIORITY_NATIVES)
+        throttle = self.background_throttle if background else None
+        report_error = self.show_warning if background else self.show_error
+        version_dir = os.path.join(VERSIONS_DIR, version_id)
+        os.makedirs(version_dir, exist_ok=True)
+
+        version_json_path = os.path.join(version_dir, f"{version_id}.json")
+        try:
+            if version_url:
+                with self.safe_urlopen(version_url) as url:
+                    raw = url.read()
+                data = json.loads(raw)
+                # Kept byte for byte, so its SHA1 matches the manifest and a LAN mirror can serve it by hash
+                with open(version_json_path + ".tmp", "wb") as f:
+                    f.write(raw)
+                os.replace(version_json_path + ".tmp", version_json_path)
+            else:
+                # A profile installed locally, e.g. by a mod loader's installer, has no manifest URL
+                with open(version_json_path, "r") as f:
+                    data = json.load(f)
+        except Exception as e:
+            report_error("Error", f"Failed to download version {version_id} JSON.")
+            return
+
+        parent = data.get("inheritsFrom")
+        if parent:
+            # The base version installs first; this profile then adds its own libraries on top
+            if not self.is_version_ready(parent):
+                if parent not in self.versions:
+                    report_error("Error", f"Version {version_id} needs {parent}, which is not available.")
+                    return
+                self.download_version_files(parent, self.versions[parent], background)
+            try:
+                data = self.load_version_data(version_id)
+            except Exception as e:
+                report_error("Error", f"Cannot resolve version {version_id} from {parent}.")
+                return
+            jar_path = os.path.join(version_dir, f"{version_id}.jar")
+            parent_jar = os.path.join(VERSIONS_DIR, parent, f"{parent}.jar")
+            if not os.path.exists(jar_path) and os.path.exists(parent_jar):
+                # Same bytes as the base version's jar, so link it rather than download it again
+                try:
+                    os.link(parent_jar, jar_path)
+                except OSError:
+                    shutil.copy2(parent_jar, jar_path)
+
+        journal = InstallJournal(version_dir)
+        journal.begin()
+        scheduler = self.download_scheduler
+
+        try:
+            jar_url = data["downloads"]["client"]["url"]
+            jar_path = os.path.join(version_dir, f"{version_id}.jar")
+            expected_sha1 = data["downloads"]["client"]["sha1"]
+        except KeyError as e:
+            report_error("Error", f"Version {version_id} is missing client JAR information.")
+            return
+
+        jar_job = None
+        journal_hits = 0
+        if not journal.is_done(jar_path, expected_sha1):
+            jar_job = scheduler.submit(critical, self.fetch_artifact, journal, jar_url, jar_path, expected_sha1, throttle)
+        else:
+            journal_hits += 1
+
+        libraries_dir = os.path.join(MINECRAFT_DIR, "libraries")
+        os.makedirs(libraries_dir, exist_ok=True)
+        natives_dir = os.path.join(version_dir, "natives")
+        os.makedirs(natives_dir, exist_ok=True)
+
+        jobs = [jar_job] if jar_job else []
+        queued = set()
+        for lib in data.get("libraries", []):
+            if self.is_library_allowed(lib):
+                # Installer-provided libraries (an empty url) are already on disk
+                if "downloads" in lib and "artifact" in lib["downloads"] and lib["downloads"]["artifact"].get("url"):
+                    lib_url = lib["downloads"]["artifact"]["url"]
+                    lib_path = os.path.join(libraries_dir, lib["downloads"]["artifact"]["path"])
+                    expected_sha1 = lib["downloads"]["artifact"].get("sha1")
+                    # Parallel writers to one path would clobber each other's .part file
+                    if lib_path not in queued and not journal.is_done(lib_path, expected_sha1):
+                        queued.add(lib_path)
+                        jobs.append(scheduler.submit(critical, self.fetch_artifact,
+                                                     journal, lib_url, lib_path, expected_sha1, throttle))
+                    elif lib_path not in queued:
+                        journal_hits += 1
+
+                classifier = self.rule_engine.native_classifier(lib, self.host_platform)
+                if classifier:
+                    if "downloads" in lib and "classifiers" in lib["downloads"] and classifier in lib["downloads"]["classifiers"]:
+                        native_url = lib["downloads"]["classifiers"][classifier]["url"]
+                        expected_sha1 = lib["downloads"]["classifiers"][classifier]["sha1"]
+                        # Natives live in the shared store, so the journal is what remembers this version has them
+                        native_key = self.native_journal_key(lib, classifier)
+                        exclude = lib.get("extract", {}).get("exclude", [])
+                        if native_key not in queued and not journal.is_done(native_key, expected_sha1):
+                            queued.add(native_key)
+                            jobs.append(scheduler.submit(natives, self.fetch_natives, journal, native_key,
+                                                         native_url, expected_sha1, natives_dir, exclude, throttle))
+                        elif native_key not in queued:
+                            journal_hits += 1
+
+        ARTIFACT_LOOKUPS.inc(journal_hits, result="hit")
+        concurrent.futures.wait(jobs)
+        failed = not all(job.exception() is None and job.result() for job in jobs)
+
+        try:
+            if failed:
+                journal.save()
+            else:
+                journal.finish()
+        except OSError as e:
+            pass
+
+        if jar_job and not (jar_job.exception() is None and jar_job.result()):
+            report_error("Error", f"Failed to download or verify version {version_id} JAR.")
+            return
+
+        self.schedule_asset_downloads(version_id, data, journal)
+
+    def schedule_asset_downloads(self, version_id, data=None, journal=None):
+        """Queue a version's asset index and missing objects at background priority.
+
+        Returns the index job's Future, or None when the assets are already complete.
+        """
+        version_dir = os.path.join(VERSIONS_DIR, version_id)
+        if data is None:
+            try:
+                data = self.load_version_data(version_id)
+            except Exception as e:
+                return None
+        journal = journal or InstallJournal(version_dir)
+        asset_index = data.get("assetIndex", {})
+        if "url" not in asset_index or "sha1" not in asset_index:
+            return None
+        key = f"assets:{asset_index['id']}"
+        if journal.is_done(key, asset_index["sha1"]):
+            return None
+        return self.download_scheduler.submit(PRIORITY_BACKGROUND, self.fetch_asset_objects, journal, key, asset_index)
+
+    def fetch_asset_objects(self, journal, key, asset_index):
+        """Fetch an asset index, then queue its missing objects; key is recorded once all are present."""
+        assets_dir = os.path.join(MINECRAFT_DIR, "assets")
+        index_path = os.path.join(assets_dir, "indexes", f"{asset_index['id']}.json")
+        os.makedirs(os.path.dirname(index_path), exist_ok=True)
+        if not (os.path.exists(index_path) and self.verify_file(index_path, asset_index["sha1"])) and \
+                not self.safe_download_file(asset_index["url"], index_path, asset_index["sha1"], self.background_throttle):
+            return False
+        with open(index_path, "r") as f:
+            objects = json.load(f).get("objects", {})
+
+        missing = {}
+        for obj in objects.values():
+            digest = obj["hash"]
+            # Objects are named by their hash and only ever appear via a verified .part rename
+            path = os.path.join(assets_dir, "objects", digest[:2], digest)
+            try:
+                present = os.path.getsize(path) == obj.get("size", -1)
+            except OSError:
+                present = False
+            if not present:
+                missing[digest] = path
+
+        if not missing:
+            journal.record(key, asset_index["sha1"])
+            journal.save()
+            return True
+
+        state = {"remaining": len(missing), "failed": False}
+        state_lock = threading.Lock()
+
+        def object_done(future):
+            with state_lock:
+                state["remaining"] -= 1
+                state["failed"] |= not (future.exception() is None and future.result())
+                last = state["remaining"] == 0
+            if last and not state["failed"]:
+                journal.record(key, asset_index["sha1"])
+                journal.save()
+
+        for digest, path in missing.items():
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            url = f"{ASSET_OBJECTS_URL}/{digest[:2]}/{digest}"
+            future = self.download_scheduler.submit(PRIORITY_BACKGROUND, self.safe_download_file,
+                                                    url, path, digest, self.background_throttle)
+            future.add_done_callback(object_done)
+        return True
+
+    @staticmethod
+    def native_journal_key(lib, classifier):
+        """Journal key for a library's extracted natives."""
+        return f"natives:{lib.get('name', classifier)}:{classifier}"
+
+    def rebuild_install_journal(self, version_id, known_sha1s=None):
+        """Record an install whose files arrived without downloading, e.g. from an offline bundle.
+
+        known_sha1s maps paths already verified by the caller to their SHA1 so they
+        are not hashed a second time. Returns whether the version is complete.
+        """
+        known_sha1s = known_sha1s or {}
+        version_dir = os.path.join(VERSIONS_DIR, version_id)
+        try:
+            data = self.load_version_data(version_id)
+        except Exception as e:
+            return False
+
+        journal = InstallJournal(version_dir)
+        journal.begin()
+        complete = True
+
+        def record_file(path, sha1):
+            if known_sha1s.get(path) == sha1 or (os.path.exists(path) and self.verify_file(path, sha1)):
+                journal.record(path, sha1, path)
+                return True
+            return False
+
+        client = data.get("downloads", {}).get("client", {})
+        if "sha1" in client:
+            complete &= record_file(os.path.join(version_dir, f"{version_id}.jar"), client["sha1"])
+
+        libraries_dir = os.path.join(MINECRAFT_DIR, "libraries")
+        natives_dir = os.path.join(version_dir, "natives")
+        # Which jar each extracted file came from is not known here, so every native entry lists them all
+        native_files = [path for path, size in scan_tree(natives_dir)] if os.path.isdir(natives_dir) else []
+        has_natives = bool(native_files)
+        for lib in data.get("libraries", []):
+            if not self.is_library_allowed(lib):
+                continue
+            artifact = lib.get("downloads", {}).get("artifact")
+            if artifact and "sha1" in artifact:
+                complete &= record_file(os.path.join(libraries_dir, artifact["path"]), artifact["sha1"])
+            classifier = self.rule_engine.native_classifier(lib, self.host_platform)
+            if classifier:
+                native = lib.get("downloads", {}).get("classifiers", {}).get(classifier)
+                if native and has_natives:
+                    journal.record(self.native_journal_key(lib, classifier), native["sha1"], files=native_files)
+                elif native:
+                    complete = False
+
+        try:
+            if complete:
+                journal.finish()
+            else:
+                journal.save()
+        except OSError as e:
+            return False
+        return complete
+
+    def bundle_entries(self, version_id, include_jdk=False):
+        """List (absolute path, bundle destination, sha1 or None) for everything a version needs offline."""
+        version_dir = os.path.join(VERSIONS_DIR, version_id)
+        data = self.load_version_data(version_id)
+
+        entries = []
+
+        def add(path, root, root_name, sha1=None):
+            if os.path.isfile(path):
+                rel = os.path.relpath(path, root).replace(os.sep, "/")
+                entries.append((path, f"{root_name}/{rel}", sha1))
+
+        client = data.get("downloads", {}).get("client", {})
+        for name in os.listdir(version_dir):
+            path = os.path.join(version_dir, name)
+            if name == f"{version_id}.jar":
+                add(path, MINECRAFT_DIR, "minecraft", client.get("sha1"))
+            elif name != INSTALL_JOURNAL_NAME and os.path.isfile(path):
+                add(path, MINECRAFT_DIR, "minecraft")
+        for path, size in scan_tree(os.path.join(version_dir, "natives")):
+            add(path, MINECRAFT_DIR, "minecraft")
+        # An inheriting profile needs its parents' JSONs to resolve offline
+        for ancestor in self.version_chain(version_id)[1:]:
+            add(os.path.join(VERSIONS_DIR, ancestor, f"{ancestor}.json"), MINECRAFT_DIR, "minecraft")
+
+        libraries_dir = os.path.join(MINECRAFT_DIR, "libraries")
+        for lib in data.get("libraries", []):
+            artifact = lib.get("downloads", {}).get("artifact")
+            if artifact and self.is_library_allowed(lib):
+                add(os.path.join(libraries_dir, artifact["path"]), MINECRAFT_DIR, "minecraft", artifact.get("sha1"))
+
+        assets_dir = os.path.join(MINECRAFT_DIR, "assets")
+        index_id = data.get("assetIndex", {}).get("id")
+        if index_id:
+            index_path = os.path.join(assets_dir, "indexes", f"{index_id}.json")
+            add(index_path, MINECRAFT_DIR, "minecraft")
+            try:
+                with open(index_path, "r") as f:
+                    for obj in json.load(f).get("objects", {}).values():
+                        digest = obj["hash"]
+                        add(os.path.join(assets_dir, "objects", digest[:2], digest), MINECRAFT_DIR, "minecraft", digest)
+            except Exception as e:
+                pass
+
+        if include_jdk:
+            for path, size in scan_tree(os.path.join(JAVA_DIR, JDK_DIRNAME)):
+                add(path, JAVA_DIR, "java")
+
+        # Deduplicate while keeping the first (hash-carrying) entry for each destination
+        seen = set()
+        return [e for e in entries if not (e[1] in seen or seen.add(e[1]))]
+
+    def export_bundle(self, version_id, bundle_path, include_jdk=False, progress=None):
+        """Pack a version (and optionally the JDK) into one zip with a hashed bundle.json index."""
+        entries = self.bundle_entries(version_id, include_jdk)
+        index = {"format": BUNDLE_FORMAT, "version": version_id, "platform": platform.system(),
+                 "arch": current_platform().arch, "includes_jdk": include_jdk, "entries": []}
+        temp_path = bundle_path + ".tmp"
+        # Jars and asset objects are already compressed, so members are stored as-is
+        with zipfile.ZipFile(temp_path, "w", zipfile.ZIP_STORED, allowZip64=True) as bundle:
+            for done, (path, dest, sha1) in enumerate(entries, 1):
+                sha1 = sha1 or hash_file(path)
+                info = zipfile.ZipInfo.from_file(path, dest)
+                info.compress_type = zipfile.ZIP_STORED
+                with open(path, "rb") as src, bundle.open(info, "w", force_zip64=True) as dst:
+                    shutil.copyfileobj(src, dst, STREAM_CHUNK_SIZE)
+                index["entries"].append({"name": dest, "sha1": sha1, "size": info.file_size,
+                                         "mode": os.stat(path).st_mode & 0o777})
+                if progress:
+                    progress(done, len(entries))
+            bundle.writestr(BUNDLE_INDEX_NAME, json.dumps(index, indent=1))
+        os.replace(temp_path, bundle_path)
+        return len(entries)
+
+    def import_bundle(self, bundle_path, progress=None):
+        """Unpack an offline bundle in parallel, verifying every file and skipping ones already present.
+
+        Returns (version_id, written, skipped, failed_names).
+        """
+        with zipfile.ZipFile(bundle_path, "r") as bundle:
+            index = json.loads(bundle.read(BUNDLE_INDEX_NAME))
+        if index.get("format") != BUNDLE_FORMAT:
+            raise ValueError(f"Unsupported bundle format {index.get('format')}")
+        # Natives and the JDK are platform-specific; unpacking foreign ones would leave an install that looks complete
+        bundle_platform = (index.get("platform"), index.get("arch", current_platform().arch))
+        if bundle_platform != (platform.system(), current_platform().arch):
+            raise ValueError(f"Bundle was made for {'/'.join(map(str, bundle_platform))}, "
+                             f"not {platform.system()}/{current_platform().arch}")
+
+        roots = {"minecraft": MINECRAFT_DIR, "java": JAVA_DIR}
+        local = threading.local()
+        counts = {"written": 0, "skipped": 0, "done": 0}
+        counts_lock = threading.Lock()
+        failed = []
+        verified = {}
+
+        def destination(name):
+            root_name, rel = name.split("/", 1)
+            root = os.path.realpath(roots[root_name])
+            path = os.path.realpath(os.path.join(root, *rel.split("/")))
+            if not path.startswith(root + os.sep):
+                raise ValueError(f"Unsafe bundle entry {name}")
+            return path
+
+        def install(entry):
+            path = destination(entry["name"])
+            if os.path.isfile(path) and os.path.getsize(path) == entry["size"] and hash_file(path) == entry["sha1"]:
+                return path, "skipped"
+            if not hasattr(local, "bundle"):
+                local.bundle = zipfile.ZipFile(bundle_path, "r")
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = f"{path}.import-{threading.get_ident()}"
+            digest = hashlib.sha1()
+            with local.bundle.open(entry["name"], "r") as src, open(temp_path, "wb") as dst:
+                for chunk in iter(lambda: src.read(STREAM_CHUNK_SIZE), b""):
+                    digest.update(chunk)
+                    dst.write(chunk)
+            if digest.hexdigest() != entry["sha1"]:
+                os.remove(temp_path)
+                return path, "failed"
+            os.chmod(temp_path, entry.get("mode", 0o644))
+            os.replace(temp_path, path)
+            return path, "written"
+
+        def run(entry):
+            try:
+                path, outcome = install(entry)
+            except Exception as e:
+                path, outcome = None, "failed"
+            with counts_lock:
+                counts["done"] += 1
+                if outcome == "failed":
+                    failed.append(entry["name"])
+                else:
+                    counts[outcome] += 1
+                    verified[path] = entry["sha1"]
+                done = counts["done"]
+            if progress:
+                progress(done, len(index["entries"]))
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=VERIFY_WORKERS) as pool:
+            list(pool.map(run, index["entries"]))
+
+        version_id = index["version"]
+        if not failed:
+            self.rebuild_install_journal(version_id, verified)
+        return version_id, counts["written"], counts["skipped"], failed
+
+    def start_export_bundle(self):
+        """Ask where to save an offline bundle for the selected version and build it in the background."""
+        version = self.version_combo.get()
+        if not version or version not in self.installed_version_ids():
+            messagebox.showerror("Error", "Select an installed version to export.")
+            return
+        bundle_path = filedialog.asksaveasfilename(title="Export Offline Bundle", defaultextension=".zip",
+                                                   initialfile=f"catlauncher-{version}.zip",
+                                                   filetypes=[("Bundles", "*.zip")])
+        if not bundle_path:
+            return
+        include_jdk = os.path.isdir(os.path.join(JAVA_DIR, JDK_DIRNAME)) and \
+            messagebox.askyesno("Export Offline Bundle", "Include the bundled Java 21 runtime?")
+        self.tools_status.config(text=f"Exporting {version}...")
+
+        def work():
+            try:
+                return self.export_bundle(version, bundle_path, include_jdk, self._tools_progress_callback)
+            except Exception as e:
+                return e
+
+        def finished(result):
+            if isinstance(result, Exception):
+                self.tools_status.config(text=f"Export failed: {result}")
+            else:
+                self.tools_status.config(text=f"Exported {result} file(s) to {bundle_path}")
+
+        self.run_in_background(work, finished)
+
+    def start_import_bundle(self):
+        """Pick an offline bundle and install it in the background."""
+        bundle_path = filedialog.askopenfilename(title="Import Offline Bundle", filetypes=[("Bundles", "*.zip")])
+        if not bundle_path:
+            return
+        self.tools_status.config(text="Importing bundle...")
+
+        def work():
+            try:
+                return self.import_bundle(bundle_path, self._tools_progress_callback)
+            except Exception as e:
+                return e
+
+        def finished(result):
+            if isinstance(result, Exception):
+                self.tools_status.config(text=f"Import failed: {result}")
+                return
+            version_id, written, skipped, failed = result
+            if failed:
+                self.tools_status.config(text=f"{len(failed)} file(s) in the bundle failed verification.")
+            else:
+                self.tools_status.config(text=f"Imported {version_id}: {written} written, {skipped} already present.")
+            self.version_categories["Installed"] = self.installed_version_ids()
+            self.update_version_list()
+
+        self.run_in_background(work, finished)
+
+    def _tools_progress_callback(self, done, total):
+        """Progress callback for worker threads that drives the Tools progress bar."""
+        self.post_ui(self._show_tools_progress, done, total)
+
+    def version_chain(self, version_id):
+        """Ids of a version and the profiles it inheritsFrom, child first."""
+        chain = [version_id]
+        while True:
+            with open(os.path.join(VERSIONS_DIR, chain[-1], f"{chain[-1]}.json"), "r") as f:
+                parent = json.load(f).get("inheritsFrom")
+            if not parent:
+                return chain
+            if parent in chain:
+                raise ValueError(f"Version {version_id} inherits from itself through {parent}.")
+            chain.append(parent)
+
+    def load_version_data(self, version_id):
+        """Return a version's profile with its inheritsFrom chain merged and Maven-only libraries resolved.
+
+        Raises OSError or ValueError when a profile in the chain is missing or
+        unreadable. The result is cached until one of the chain's JSON files changes;
+        callers must not modify it.
+        """
+        cached = self.profile_cache.get(version_id)
+        if cached is not None:
+            try:
+                if all(os.stat(path).st_mtime_ns == mtime for path, mtime in cached[0]):
+                    return cached[1]
+            except OSError:
+                pass
+
+        signature = []
+        profiles = []
+        for current in self.version_chain(version_id):
+            path = os.path.join(VERSIONS_DIR, current, f"{current}.json")
+            signature.append((path, os.stat(path).st_mtime_ns))
+            with open(path, "r") as f:
+                profiles.append(json.load(f))
+        data = profiles.pop()
+        while profiles:
+            data = merge_profiles(data, profiles.pop())
+        libraries = []
+        for lib in data.get("libraries", []):
+            try:
+                libraries.append(with_maven_artifact(lib))
+            except ValueError as e:
+                self.show_warning(f"Version {version_id}", f"Skipping library: {e}")
+        data["libraries"] = libraries
+        self.profile_cache[version_id] = (tuple(signature), data)
+        return data
+
+    def version_record(self, version_id):
+        """Return the compact VersionRecord of an installed version.
+
+        Records are kept in memory and in METADATA_CACHE_DIR, loaded through mmap,
+        and rebuilt from the JSON only when a profile in the chain changed. Raises
+        like load_version_data when the version cannot be read.
+        """
+        record = self.record_cache.get(version_id)
+        cache_path = os.path.join(METADATA_CACHE_DIR, f"{version_id}.bin")
+        if record is None:
+            try:
+                record = VersionRecord.load(read_marshal_file(cache_path))
+            except (OSError, ValueError, EOFError, TypeError) as e:
+                record = None
+        if record is not None and record.is_current():
+            self.record_cache[version_id] = record
+            return record
+
+        data = self.load_version_data(version_id)
+        signature = []
+        for path, mtime_ns in self.profile_cache[version_id][0]:
+            signature.append((path, mtime_ns, os.stat(path).st_size))
+        record = VersionRecord.from_profile(version_id, data, signature)
+        try:
+            write_marshal_file(cache_path, record.dump())
+        except (OSError, ValueError) as e:
+            pass
+        self.record_cache[version_id] = record
+        return record
+
+    def is_version_ready(self, version_id):
+        """Check from the install journal alone whether a version can launch without downloading."""
+        version_dir = os.path.join(VERSIONS_DIR, version_id)
+        if not os.path.exists(os.path.join(version_dir, f"{version_id}.json")):
+            return False
+        return InstallJournal(version_dir).is_ready()
+
+    def _supervise(self):
+        """Sample running games and refresh the Running tab, then reschedule."""
+        self.supervisor.sample()
+        self.refresh_running_panel()
+        alerts = [alert for game in self.supervisor.games for alert in game.analyzer.pop_alerts()]
+        if alerts:
+            messagebox.showwarning("Game Alert", "\n".join(alerts))
+        self.after(int(SUPERVISOR_SAMPLE_INTERVAL * 1000), self._supervise)
+
+    def refresh_running_panel(self):
+        """Show every game launched this session with its latest sample."""
+        for game in self.supervisor.games:
+            row_id = str(game.process.pid)
+            menu_seconds = game.analyzer.time_to_main_menu
+            values = (game.instance, game.version, game.status, f"{game.cpu_percent:.0f}",
+                      f"{game.rss_bytes / 1048576:.0f}", f"{game.peak_rss_bytes / 1048576:.0f}", game.threads,
+                      f"{menu_seconds:.1f}" if menu_seconds is not None else "")
+            if row_id in self.running_games:
+                self.running_tree.item(row_id, values=values)
+            else:
+                self.running_tree.insert("", "end", iid=row_id, values=values)
+                self.running_games[row_id] = game
+
+    def selected_game(self):
+        """Return the game selected in the Running tab, if any."""
+        selection = self.running_tree.selection()
+        return self.running_games.get(selection[0]) if selection else None
+
+    def kill_selected_game(self):
+        """Terminate the selected game."""
+        game = self.selected_game()
+        if game and game.running and messagebox.askyesno("Kill Game", f"Kill {game.instance} ({game.version})?"):
+            self.supervisor.kill(game)
+            self.refresh_running_panel()
+
+    def restart_selected_game(self):
+        """Restart the selected game with the same command."""
+        game = self.selected_game()
+        if not game:
+            return
+        try:
+            self.supervisor.restart(game)
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to restart Minecraft: {e}")
+        self.running_tree.delete(str(game.process.pid))
+        del self.running_games[str(game.process.pid)]
+        self.refresh_running_panel()
+
+    def installed_version_ids(self):
+        """List the versions that have a version JSON on disk."""
+        if not os.path.isdir(VERSIONS_DIR):
+            return []
+        return sorted(v for v in os.listdir(VERSIONS_DIR)
+                      if os.path.isfile(os.path.join(VERSIONS_DIR, v, f"{v}.json")))
+
+    def installed_artifacts(self, version_id):
+        """Return (path, sha1) for the client jar, allowed libraries and asset objects of a version."""
+        version_dir = os.path.join(VERSIONS_DIR, version_id)
+        try:
+            data = self.load_version_data(version_id)
+        except Exception as e:
+            return []
+
+        artifacts = []
+        client = data.get("downloads", {}).get("client")
+        if client and "sha1" in client:
+            artifacts.append((os.path.join(version_dir, f"{version_id}.jar"), client["sha1"]))
+
+        libraries_dir = os.path.join(MINECRAFT_DIR, "libraries")
+        for lib in data.get("libraries", []):
+            artifact = lib.get("downloads", {}).get("artifact")
+            if artifact and "sha1" in artifact and self.is_library_allowed(lib):
+                artifacts.append((os.path.join(libraries_dir, artifact["path"]), artifact["sha1"]))
+
+        assets_dir = os.path.join(MINECRAFT_DIR, "assets")
+        index_id = data.get("assetIndex", {}).get("id")
+        if index_id:
+            try:
+                with open(os.path.join(assets_dir, "indexes", f"{index_id}.json"), "r") as f:
+                    objects = json.load(f).get("objects", {})
+                for obj in objects.values():
+                    digest = obj["hash"]
+                    artifacts.append((os.path.join(assets_dir, "objects", digest[:2], digest), digest))
+            except Exception as e:
+                pass
+        return artifacts
+
+    def referenced_artifacts(self):
+        """Return the set of store paths reachable from the installed versions' JSONs.
+
+        Every library and native classifier a version lists is kept whatever the
+        current OS, since mirrors may serve other platforms, along with each
+        version's whole directory, its asset index and objects, and the
+        natives-store entries of its classifiers. Raises RuntimeError naming every
+        installed version whose JSON or asset index could not be read, since its
+        files would otherwise look unreferenced.
+        """
+        libraries_dir = os.path.join(MINECRAFT_DIR, "libraries")
+        assets_dir = os.path.join(MINECRAFT_DIR, "assets")
+        referenced = set()
+        installed = set(self.installed_version_ids())
+        unresolved = []
+        for version_id in installed:
+            try:
+                data = self.load_version_data(version_id)
+            except Exception as e:
+                unresolved.append(f"{version_id}: {e}")
+                continue
+            for lib in data.get("libraries", []):
+                downloads = lib.get("downloads", {})
+                artifacts = [downloads["artifact"]] if "artifact" in downloads else []
+                artifacts.extend(downloads.get("classifiers", {}).values())
+                for artifact in artifacts:
+                    if "path" in artifact:
+                        referenced.add(os.path.normpath(os.path.join(libraries_dir, artifact["path"])))
+                for native in downloads.get("classifiers", {}).values():
+                    if "sha1" in native:
+                        referenced.add(os.path.normpath(os.path.join(NATIVES_STORE_DIR, native["sha1"])))
+            index_id = data.get("assetIndex", {}).get("id")
+            if index_id:
+                index_path = os.path.normpath(os.path.join(assets_dir, "indexes", f"{index_id}.json"))
+                referenced.add(index_path)
+                try:
+                    with open(index_path, "r") as f:
+                        for obj in json.load(f).get("objects", {}).values():
+                            digest = obj["hash"]
+                            referenced.add(os.path.normpath(os.path.join(assets_dir, "objects", digest[:2], digest)))
+                except Exception as e:
+                    unresolved.append(f"{version_id}: asset index {index_id}: {e}")
+        if unresolved:
+            raise RuntimeError("Cleanup aborted; these installed versions could not be resolved:\n"
+                               + "\n".join(sorted(unresolved)))
+        return referenced, installed
+
+    def collect_garbage(self, dry_run=True):
+        """Find store files no installed version references and, unless dry_run, delete them.
+
+        Returns a list of (path, size) sorted largest first.
+        """
+        referenced, installed = self.referenced_artifacts()
+        versions_prefix = os.path.normpath(VERSIONS_DIR) + os.sep
+        store_prefix = os.path.normpath(NATIVES_STORE_DIR) + os.sep
+        roots = [os.path.join(MINECRAFT_DIR, "libraries"),
+                 os.path.join(MINECRAFT_DIR, "assets", "indexes"),
+                 os.path.join(MINECRAFT_DIR, "assets", "objects"),
+                 NATIVES_STORE_DIR,
+                 VERSIONS_DIR]
+        garbage = []
+        for path, size in scan_trees_parallel(roots):
+            path = os.path.normpath(path)
+            if path in referenced:
+                continue
+            if path.startswith(versions_prefix) and path[len(versions_prefix):].split(os.sep, 1)[0] in installed:
+                continue
+            # A natives-store entry is a directory named by its jar's SHA1
+            if path.startswith(store_prefix) and \
+                    store_prefix + path[len(store_prefix):].split(os.sep, 1)[0] in referenced:
+                continue
+            garbage.append((path, size))
+        garbage.sort(key=lambda item: item[1], reverse=True)
+        if not dry_run:
+            self.remove_garbage(garbage)
+        return garbage
+
+    def remove_garbage(self, garbage):
+        """Delete exactly the (path, size) entries given, then prune the directories they leave empty."""
+        def remove(path):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        with concurrent.futures.ThreadPoolExecutor(max_workers=VERIFY_WORKERS) as pool:
+            list(pool.map(remove, (path for path, size in garbage)))
+        for root in (os.path.join(MINECRAFT_DIR, "libraries"), os.path.join(MINECRAFT_DIR, "assets", "indexes"),
+                     os.path.join(MINECRAFT_DIR, "assets", "objects"), NATIVES_STORE_DIR, VERSIONS_DIR):
+            remove_empty_dirs(root)
+        return garbage
+
+    def sync_mirror(self, version_ids=None, targets=MIRROR_SYNC_PLATFORMS, progress=None):
+        """Download the libraries and natives jars every target platform needs for installed versions.
+
+        Keeps this machine's libraries tree complete enough to serve a mixed fleet
+        as a LAN mirror. Returns (downloaded count, failed paths).
+        """
+        libraries_dir = os.path.join(MINECRAFT_DIR, "libraries")
+        wanted = {}
+        for version_id in version_ids or self.installed_version_ids():
+            try:
+                data = self.load_version_data(version_id)
+            except Exception as e:
+                continue
+            for target, libraries in self.rule_engine.filter_libraries(data.get("libraries", []), targets).items():
+                for lib in libraries:
+                    downloads = lib.get("downloads", {})
+                    artifacts = [downloads.get("artifact")]
+                    classifier = self.rule_engine.native_classifier(lib, target)
+                    if classifier:
+                        artifacts.append(downloads.get("classifiers", {}).get(classifier))
+                    for artifact in artifacts:
+                        if artifact and "path" in artifact and "url" in artifact:
+                            wanted[os.path.join(libraries_dir, artifact["path"])] = (artifact["url"], artifact.get("sha1"))
+
+        def sync(path, url, sha1):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            if os.path.exists(path) and (not sha1 or self.verify_file(path, sha1)):
+                return None
+            return self.safe_download_file(url, path, sha1, self.background_throttle)
+
+        jobs = {self.download_scheduler.submit(PRIORITY_BACKGROUND, sync, path, url, sha1): path
+                for path, (url, sha1) in wanted.items()}
+        downloaded = 0
+        failed = []
+        for done, job in enumerate(concurrent.futures.as_completed(jobs), 1):
+            result = job.result() if job.exception() is None else False
+            if result:
+                downloaded += 1
+            elif result is False:
+                failed.append(jobs[job])
+            if progress:
+                progress(done, len(jobs))
+        return downloaded, failed
+
+    def start_garbage_collection(self):
+        """Show what a cleanup would remove, then delete it if the user agrees."""
+        self.gc_button.state(["disabled"])
+        self.tools_status.config(text="Scanning for unused files...")
+
+        def scan():
+            try:
+                return self.collect_garbage(dry_run=True)
+            except Exception as e:
+                return e
+
+        def confirm(garbage):
+            self.gc_button.state(["!disabled"])
+            if isinstance(garbage, Exception):
+                self.tools_status.config(text="Cleanup aborted.")
+                self.show_error("Clean Up", str(garbage))
+                return
+            if not garbage:
+                self.tools_status.config(text="No unused files found.")
+                return
+            total = sum(size for path, size in garbage)
+            preview = "\n".join(f"{size / 1048576:8.1f} MB  {os.path.relpath(path, MINECRAFT_DIR)}"
+                                for path, size in garbage[:10])
+            more = f"\n... and {len(garbage) - 10} more" if len(garbage) > 10 else ""
+            self.tools_status.config(text=f"{len(garbage)} unused file(s), {total / 1048576:.1f} MB")
+            if messagebox.askyesno("Clean Up", f"Delete {len(garbage)} unused file(s) ({total / 1048576:.1f} MB)?\n\n{preview}{more}"):
+                self.gc_button.state(["disabled"])
+                self.run_in_background(lambda: self.remove_garbage(garbage), removed)
+
+        def removed(garbage):
+            self.gc_button.state(["!disabled"])
+            total = sum(size for path, size in garbage)
+            self.tools_status.config(text=f"Removed {len(garbage)} file(s), freed {total / 1048576:.1f} MB")
+
+        self.run_in_background(scan, confirm)
+
+    def installed_artifact_owners(self):
+        """Map (path, sha1) of every installed artifact to the versions that use it."""
+        owners = {}
+        for version_id in self.installed_version_ids():
+            for path, sha1 in self.installed_artifacts(version_id):
+                owners.setdefault((path, sha1), []).append(version_id)
+        return owners
+
+    def verify_installed_versions(self, progress=None):
+        """Re-hash every installed artifact in parallel and reopen journals that reference bad files.
+
+        Returns the list of corrupt or missing paths; affected versions re-download
+        them on their next launch.
+        """
+        owners = self.installed_artifact_owners()
+        failed = verify_files_parallel(owners, progress)
+
+        failed_set = set(failed)
+        affected = {v for (path, sha1), versions in owners.items() if path in failed_set for v in versions}
+        self.reopen_journals(failed_set, affected)
+        return failed
+
+    def reopen_journals(self, paths, version_ids):
+        """Delete damaged files and drop them from these versions' journals so they are fetched again."""
+        paths = set(paths)
+        for path in paths:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        # Asset objects are tracked by one marker per index, so a bad object reopens the whole set
+        assets_prefix = os.path.join(os.path.normpath(MINECRAFT_DIR), "assets", "objects") + os.sep
+        damaged_assets = any(os.path.normpath(path).startswith(assets_prefix) for path in paths)
+        for version_id in version_ids:
+            journal = InstallJournal(os.path.join(VERSIONS_DIR, version_id))
+            changed = journal.forget(paths)
+            if damaged_assets:
+                changed = journal.forget_keys("assets:") or changed
+            if changed:
+                try:
+                    journal.save()
+                except OSError as e:
+                    pass
 
-        # Settings tab
-        settings_tab = ttk.Frame(notebook)
-        notebook.add(settings_tab, text="Settings")
+    def quick_check_version(self, version_id):
+        """Fast pre-launch integrity tier: sizes and zip central directories of the client jar and classpath.
 
-        # Populate mod-packs tab with placeholder content (original news items)
-        modpacks_content = tk.Frame(modpacks_tab, background=self.current_theme['bg'])
-        modpacks_content.pack(fill="both", expand=True, padx=10, pady=10)
+        Returns the damaged paths.
+        """
+        version_dir = os.path.join(VERSIONS_DIR, version_id)
+        try:
+            record = self.version_record(version_id)
+        except Exception as e:
+            return []
+        items = [(os.path.join(version_dir, f"{version_id}.jar"), record.client_size)]
+        libraries_dir = os.path.join(MINECRAFT_DIR, "libraries")
+        for lib in record.allowed_libraries(self.rule_engine, self.host_platform):
+            items.append((os.path.join(libraries_dir, lib.path), lib.size))
+        return [path for path, size in items if not quick_check_file(path, size)]
 
-        modpacks_title = tk.Label(modpacks_content, text="CATLAUNCHER MOD-PACKS", 
-                             font=("Arial", 16, "bold"), background=self.current_theme['bg'], 
-                             foreground=self.current_theme['accent'])
-        modpacks_title.pack(anchor="w", pady=(0, 15))
+    def is_idle(self):
+        """Whether no game is running and no download is queued."""
+        return not self.supervisor.running_games() and self.download_scheduler.pending() == 0
 
-        news_items = [
-            "• Custom Minecraft Launcher with TLauncher-style interface",
-            "• Support for all Minecraft versions",
-            "• Automatic Java installation",
-            "• Easy skin changing",
-            "• Optimized performance settings",
-            "• Lightweight and fast",
-            "• Regular updates and improvements"
-        ]
+    def scrub_pass(self, cache=None, max_age=SCRUB_MAX_AGE_DAYS * 86400, throttle=None, should_pause=None,
+                   cancel=None):
+        """Fully re-hash installed artifacts not verified within max_age, least recently checked first.
 
-        for item in news_items:
-            item_frame = tk.Frame(modpacks_content, background=self.current_theme['bg'])
-            item_frame.pack(fill="x", pady=2)
-            tk.Label(item_frame, text=item, font=("Arial", 10),
-                    background=self.current_theme['bg'], foreground=self.current_theme['text'], 
-                    justify="left", anchor="w").pack(fill='x')
+        should_pause, when given, is polled between files and the pass waits while it
+        is true. Corrupt or missing files are deleted, their journals reopened and
+        their versions queued for background re-download. Returns (verified, corrupt paths).
+        """
+        cache = cache or ScrubCache()
+        cancel = cancel or threading.Event()
+        owners = self.installed_artifact_owners()
+        due = [item for item in owners if not cache.is_fresh(item[0], item[1], max_age)]
+        due.sort(key=lambda item: cache.checked_at(item[0]))
 
-        # Populate mods tab with placeholder
-        mods_content = tk.Frame(mods_tab, background=self.current_theme['bg'])
-        mods_content.pack(fill="both", expand=True, padx=10, pady=10)
-        tk.Label(mods_content, text="MODS PLACEHOLDER", font=("Arial", 12, "bold"), 
-                 background=self.current_theme['bg'], foreground=self.current_theme['text']).pack(anchor="w")
+        verified = 0
+        corrupt = []
+        affected = set()
+        for count, (path, sha1) in enumerate(due, 1):
+            while should_pause is not None and should_pause() and not cancel.is_set():
+                cancel.wait(SCRUB_IDLE_POLL)
+            if cancel.is_set():
+                break
+            if throttle is not None:
+                try:
+                    throttle.consume(os.path.getsize(path))
+                except OSError:
+                    pass
+            ok = os.path.exists(path) and self.verify_file(path, sha1)
+            cache.record(path, sha1, ok)
+            if ok:
+                verified += 1
+            else:
+                corrupt.append(path)
+                affected.update(owners[(path, sha1)])
+            if count % SCRUB_SAVE_EVERY == 0:
+                try:
+                    cache.save()
+                except OSError as e:
+                    pass
+        try:
+            cache.save()
+        except OSError as e:
+            pass
 
-        # Resource packs tab (original versions list)
-        resourcepacks_content = tk.Frame(resourcepacks_tab, background=self.current_theme['bg'])
-        resourcepacks_content.pack(fill="both", expand=True, padx=10, pady=10)
+        if corrupt:
+            self.reopen_journals(corrupt, affected)
+            self.queue_redownloads(affected)
+        return verified, corrupt
 
-        resourcepacks_title = tk.Label(resourcepacks_content, text="AVAILABLE VERSIONS", 
-                                 font=("Arial", 12, "bold"), background=self.current_theme['bg'], 
-                                 foreground=self.current_theme['text'])
-        resourcepacks_title.pack(anchor="w", pady=(0, 10))
+    def queue_redownloads(self, version_ids):
+        """Re-install versions in the background; files already intact are skipped by their journals."""
+        versions = [(v, self.versions[v]) for v in sorted(version_ids) if v in self.versions]
+        if not versions:
+            return None
 
-        version_list_frame = tk.Frame(resourcepacks_content, background=self.current_theme['bg'])
-        version_list_frame.pack(fill="both", expand=True)
+        def work():
+            for version_id, version_url in versions:
+                self.download_version_files(version_id, version_url, background=True)
 
-        scrollbar = ttk.Scrollbar(version_list_frame)
-        scrollbar.pack(side="right", fill="y")
+        return self.run_in_background(work)
 
-        self.version_listbox = tk.Listbox(version_list_frame, background=self.current_theme['input_bg'], 
-                                        foreground=self.current_theme['text'],
-                                        selectbackground=self.current_theme['accent'], 
-                                        selectforeground=self.current_theme['text'],
-                                        yscrollcommand=scrollbar.set, font=("Arial", 10), bd=0)
-        self.version_listbox.pack(side="left", fill="both", expand=True)
-        scrollbar.config(command=self.version_listbox.yview)
+    def start_background_scrub(self):
+        """Scrub installed files on a low-priority thread whenever the launcher is idle."""
+        if not self.launcher_config.getboolean("integrity", "scrub", fallback=True):
+            return
+        rate = self.launcher_config.getint("integrity", "scrub_rate_mb", fallback=SCRUB_RATE_MB) * 1024 * 1024
+        max_age = self.launcher_config.getfloat("integrity", "rescrub_days", fallback=SCRUB_MAX_AGE_DAYS) * 86400
+        throttle = TokenBucket(rate)
+        idle = threading.Event()
 
-        # Settings tab content
-        settings_content = tk.Frame(settings_tab, background=self.current_theme['bg'])
-        settings_content.pack(fill="both", expand=True, padx=10, pady=10)
+        def scrub_forever():
+            lower_thread_priority()
+            cache = ScrubCache()
+            idle.wait(SCRUB_START_DELAY)
+            while True:
+                if self.is_idle():
+                    verified, corrupt = self.scrub_pass(cache, max_age, throttle, lambda: not self.is_idle())
+                    if corrupt:
+                        self.post_ui(self._report_scrub, corrupt)
+                idle.wait(SCRUB_INTERVAL)
 
-        settings_title = tk.Label(settings_content, text="LAUNCHER SETTINGS", 
-                                 font=("Arial", 12, "bold"), background=self.current_theme['bg'], 
-                                 foreground=self.current_theme['text'])
-        settings_title.pack(anchor="w", pady=(0, 10))
+        threading.Thread(target=scrub_forever, name="integrity-scrubber", daemon=True).start()
 
-        settings_options = [
-            ("Auto-update launcher", tk.BooleanVar(value=True)),
-            ("Close launcher when game starts", tk.BooleanVar(value=False)),
-            ("Keep launcher open", tk.BooleanVar(value=True)),
-            ("Check for Java updates", tk.BooleanVar(value=True))
-        ]
+    def _report_scrub(self, corrupt):
+        """Show background scrub findings in the Tools tab."""
+        self.tools_status.config(text=f"Background check found {len(corrupt)} damaged file(s); re-downloading.")
 
-        for text, var in settings_options:
-            cb = tk.Checkbutton(settings_content, text=text, variable=var,
-                              background=self.current_theme['bg'], foreground=self.current_theme['text'], 
-                              selectcolor=self.current_theme['sidebar'],
-                              activebackground=self.current_theme['bg'], 
-                              activeforeground=self.current_theme['text'])
-            cb.pack(anchor="w", pady=5)
+    def start_verify_all(self):
+        """Run verify_installed_versions in the background, driving the Tools progress bar."""
+        self.verify_button.state(["disabled"])
+        self.tools_status.config(text="Verifying installed versions...")
+        self.tools_progress["value"] = 0
 
-        dir_frame = tk.Frame(settings_content, background=self.current_theme['bg'])
-        dir_frame.pack(fill="x", pady=10)
+        def finished(failed):
+            self.verify_button.state(["!disabled"])
+            if failed:
+                self.tools_status.config(text=f"{len(failed)} file(s) corrupt or missing; they will be re-downloaded on next launch.")
+            else:
+                self.tools_status.config(text="All installed files verified.")
 
-        tk.Label(dir_frame, text="Game Directory:", background=self.current_theme['bg'], 
-                foreground=self.current_theme['text']).pack(anchor="w")
-        dir_entry = tk.Entry(dir_frame, background=self.current_theme['input_bg'], 
-                           foreground=self.current_theme['text'], 
-                           insertbackground=self.current_theme['text'], bd=0)
-        dir_entry.insert(0, MINECRAFT_DIR)
-        dir_entry.pack(fill="x", pady=(5, 0))
+        self.run_in_background(lambda: self.verify_installed_versions(self._tools_progress_callback), finished)
 
-        # Load versions after UI is initialized
-        self.after(100, self.load_version_manifest)
+    def _show_tools_progress(self, done, total):
+        """Update the Tools progress bar."""
+        self.tools_progress["maximum"] = max(total, 1)
+        self.tools_progress["value"] = done
+        self.tools_status.config(text=f"Processed {done} of {total} files")
 
-    def update_version_list(self, event=None):
-        """Update the version list based on the selected category."""
-        category = self.category_combo.get()
-        self.version_combo['values'] = self.version_categories[category]
-        if self.version_combo['values']:
-            self.version_combo.current(0)
-        
-        self.version_listbox.delete(0, tk.END)
-        for version in self.version_categories[category]:
-            self.version_listbox.insert(tk.END, version)
+    def list_instances(self):
+        """Return the default instance followed by the named instances on disk."""
+        names = []
+        if os.path.isdir(INSTANCES_DIR):
+            names = sorted(n for n in os.listdir(INSTANCES_DIR) if os.path.isdir(os.path.join(INSTANCES_DIR, n)))
+        return [DEFAULT_INSTANCE] + names
 
-    def load_version_manifest(self):
-        """Load the list of available Minecraft versions from Mojang's servers."""
-        try:
-            with self.safe_urlopen(VERSION_MANIFEST_URL) as url:
-                manifest = json.loads(url.read().decode())
-                
-                for category in self.version_categories:
-                    self.version_categories[category] = []
-                
-                latest_release = None
-                latest_snapshot = None
-                
-                for v in manifest["versions"]:
-                    self.versions[v["id"]] = v["url"]
-                    
-                    if v["id"] == manifest["latest"]["release"]:
-                        latest_release = v["id"]
-                        self.version_categories["Latest Release"].append(v["id"])
-                    elif v["id"] == manifest["latest"]["snapshot"]:
-                        latest_snapshot = v["id"]
-                        self.version_categories["Latest Snapshot"].append(v["id"])
-                    
-                    if v["type"] == "release":
-                        if v["id"] != latest_release:
-                            self.version_categories["Release"].append(v["id"])
-                    elif v["type"] == "snapshot":
-                        if v["id"] != latest_snapshot:
-                            self.version_categories["Snapshot"].append(v["id"])
-                    elif v["type"] == "old_beta":
-                        self.version_categories["Old Beta"].append(v["id"])
-                    elif v["type"] == "old_alpha":
-                        self.version_categories["Old Alpha"].append(v["id"])
-                
-                self.update_version_list()
-                
-                
-        except Exception as e:
-            try:
-                temp_context = ssl._create_unverified_context()
-                with urllib.request.urlopen(VERSION_MANIFEST_URL, context=temp_context) as url:
-                    manifest = json.loads(url.read().decode())
-            except Exception as final_e:
-                messagebox.showerror("Error", "Failed to load version manifest. Check your internet connection and SSL certificates.")
+    def instance_game_dir(self, name):
+        """Return the game directory of an instance; the default instance uses .minecraft itself."""
+        if not name or name == DEFAULT_INSTANCE:
+            return MINECRAFT_DIR
+        return os.path.join(INSTANCES_DIR, name)
 
-    def is_java_installed(self, required_version="21"):
-        """Check if a compatible Java version (21 or higher) is installed."""
+    def create_instance(self, name, version=None):
+        """Create a named instance with its own game directory; returns an error message or None."""
+        name = name.strip()
+        if not re.fullmatch(r"[A-Za-z0-9][A-Za-z0-9 _.-]{0,63}", name) or name == DEFAULT_INSTANCE:
+            return "Instance names may use letters, digits, spaces, '.', '_' and '-'."
+        game_dir = self.instance_game_dir(name)
+        if os.path.exists(game_dir):
+            return f"Instance {name} already exists."
+        for sub in INSTANCE_SUBDIRS:
+            os.makedirs(os.path.join(game_dir, sub), exist_ok=True)
+        self.save_instance_settings(name, {"version": version})
+        return None
+
+    def load_instance_settings(self, name):
+        """Read instance.json for a named instance."""
         try:
-            result = subprocess.run(["java", "-version"], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, timeout=10)
-            output = result.stderr
-            match = re.search(r'version "(\d+)', output)
-            if match:
-                major_version = int(match.group(1))
-                return major_version >= int(required_version)
-            return False
-        except subprocess.TimeoutExpired:
-            return False
-        except Exception:
-            return False
+            with open(os.path.join(self.instance_game_dir(name), "instance.json"), "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
 
-    def install_java_if_needed(self):
-        """Install OpenJDK 21 if a compatible Java version is not found."""
-        if self.is_java_installed():
-            return True
-        
-        system = platform.system()
-        if system == "Windows":
-            java_url = "https://github.com/adoptium/temurin21-binaries/releases/download/jdk-21.0.5%2B11/OpenJDK21U-jdk_x64_windows_hotspot_21.0.5_11.zip"
-            archive_path = os.path.join(JAVA_DIR, "openjdk.zip")
-        elif system == "Linux":
-            java_url = "https://github.com/adoptium/temurin21-binaries/releases/download/jdk-21.0.5%2B11/OpenJDK21U-jdk_x64_linux_hotspot_21.0.5_11.tar.gz"
-            archive_path = os.path.join(JAVA_DIR, "openjdk.tar.gz")
-        elif system == "Darwin":
-            java_url = "https://github.com/adoptium/temurin21-binaries/releases/download/jdk-21.0.5%2B11/OpenJDK21U-jdk_x64_mac_hotspot_21.0.5_11.tar.gz"
-            archive_path = os.path.join(JAVA_DIR, "openjdk.tar.gz")
-        else:
-            messagebox.showerror("Error", "Unsupported OS")
-            return False
+    def save_instance_settings(self, name, settings):
+        """Write instance.json for a named instance; the default instance keeps no settings file."""
+        if name == DEFAULT_INSTANCE:
+            return
+        try:
+            with open(os.path.join(self.instance_game_dir(name), "instance.json"), "w") as f:
+                json.dump(settings, f, indent=2)
+        except OSError as e:
+            pass
 
-        os.makedirs(JAVA_DIR, exist_ok=True)
+    def server_dir(self, name):
+        """Return the directory of a named dedicated server."""
+        return os.path.join(SERVERS_DIR, name)
 
+    def version_json(self, version_id):
+        """Return a version's JSON from its install, else from the manifest URL; None if unavailable."""
         try:
-            response = self.safe_urlopen(java_url)
-            with open(archive_path, 'wb') as f:
-                f.write(response.read())
+            return self.load_version_data(version_id)
         except Exception as e:
-            try:
-                temp_context = ssl._create_unverified_context()
-                response = urllib.request.urlopen(java_url, context=temp_context)
-                with open(archive_path, 'wb') as f:
-                    f.write(response.read())
-            except Exception as final_e:
-                messagebox.showerror("Error", "Failed to download Java 21. Please check your internet connection or install Java manually.")
-                return False
-
+            pass
+        version_url = self.versions.get(version_id)
+        if not version_url:
+            return None
         try:
-            if system == "Windows":
-                with zipfile.ZipFile(archive_path, "r") as zip_ref:
-                    zip_ref.extractall(JAVA_DIR)
-            else:
-                import tarfile
-                with tarfile.open(archive_path, "r:gz") as tar_ref:
-                    tar_ref.extractall(JAVA_DIR)
-                java_bin_dir = os.path.join(JAVA_DIR, "jdk-21.0.5+11", "bin")
-                for file in os.listdir(java_bin_dir):
-                    file_path = os.path.join(java_bin_dir, file)
-                    if os.path.isfile(file_path):
-                        os.chmod(file_path, 0o755)
-            
-            os.remove(archive_path)
-            return True
+            with self.safe_urlopen(version_url) as url:
+                return json.loads(url.read().decode())
         except Exception as e:
-            messagebox.showerror("Error", f"Failed to extract Java: {e}")
-            return False
+            return None
 
-    def select_skin(self):
-        """Allow the user to select and apply a custom skin PNG file."""
-        file_path = filedialog.askopenfilename(
-            title="Select Skin PNG", 
-            filetypes=[("PNG Files", "*.png"), ("All Files", "*.*")]
-        )
-        if file_path:
+    def install_server(self, version_id, name=None, accept_eula=False):
+        """Install a version's dedicated server jar into a server directory with config templates.
+
+        The jar goes through the same scheduler, verification and install journal as
+        client files. eula.txt and server.properties are only written when missing,
+        so an existing server keeps its settings. Returns (server_dir, error).
+        """
+        name = name or version_id
+        if not re.fullmatch(r"[A-Za-z0-9][A-Za-z0-9 _.-]{0,63}", name):
+            return None, "Server names may use letters, digits, spaces, '.', '_' and '-'."
+        data = self.version_json(version_id)
+        if data is None:
+            return None, f"Cannot read version {version_id} JSON."
+        server = data.get("downloads", {}).get("server")
+        if not server:
+            return None, f"Version {version_id} has no dedicated server download."
+
+        server_dir = self.server_dir(name)
+        os.makedirs(os.path.join(server_dir, "logs"), exist_ok=True)
+        jar_path = os.path.join(server_dir, "server.jar")
+        journal = InstallJournal(server_dir)
+        if not journal.is_done(jar_path, server["sha1"]):
+            journal.begin()
+            job = self.download_scheduler.submit(PRIORITY_CRITICAL, self.fetch_artifact, journal,
+                                                 server["url"], jar_path, server["sha1"])
+            if not (job.exception() is None and job.result()):
+                return None, f"Failed to download or verify the {version_id} server JAR."
             try:
-                skin_dest = os.path.join(MINECRAFT_DIR, "skins")
-                os.makedirs(skin_dest, exist_ok=True)
-                shutil.copy(file_path, os.path.join(skin_dest, "custom_skin.png"))
-                messagebox.showinfo("Skin Applied", "Skin applied successfully! Note: This may require a mod to apply in-game.")
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to copy skin: {e}")
+                journal.finish()
+            except OSError as e:
+                pass
 
-    @staticmethod
-    def verify_file(file_path, expected_sha1):
-        """Verify the SHA1 checksum of a file."""
-        try:
-            with open(file_path, "rb") as f:
-                file_hash = hashlib.sha1(f.read()).hexdigest()
-            return file_hash == expected_sha1
-        except Exception:
-            return False
+        eula_path = os.path.join(server_dir, "eula.txt")
+        if accept_eula or not os.path.exists(eula_path):
+            with open(eula_path, "w") as f:
+                f.write("# By changing the setting below to TRUE you are indicating your agreement to the EULA "
+                        "(https://aka.ms/MinecraftEULA).\n")
+                f.write(f"eula={'true' if accept_eula else 'false'}\n")
+        properties_path = os.path.join(server_dir, "server.properties")
+        if not os.path.exists(properties_path):
+            with open(properties_path, "w") as f:
+                f.write("# Minecraft server properties\n")
+                for key, value in SERVER_PROPERTIES_TEMPLATE:
+                    f.write(f"{key}={value}\n")
+        with open(os.path.join(server_dir, SERVER_SETTINGS_NAME), "w") as f:
+            json.dump({"version": version_id}, f, indent=2)
+        return server_dir, None
+
+    def build_server_command(self, ram):
+        """Construct the command to run server.jar headlessly with a fixed-size, GC-tuned heap."""
+        # A server keeps its heap for its whole life, so it is committed and pre-touched up front
+        return [self.java_executable(), f"-Xms{ram}G", f"-Xmx{ram}G", *SERVER_GC_FLAGS, GC_LOG_FLAG,
+                "-jar", "server.jar", "--nogui"]
 
-    def safe_download_file(self, url, file_path, expected_sha1=None):
-        """Safely download a file with SSL context and optional verification."""
+    def launch_server(self, name, ram=None, on_output=None):
+        """Start an installed server under the supervisor with its console open; returns (game, error)."""
+        server_dir = self.server_dir(name)
         try:
-            response = self.safe_urlopen(url)
-            with open(file_path, 'wb') as f:
-                f.write(response.read())
-            
-            if expected_sha1 and not self.verify_file(file_path, expected_sha1):
-                return False
-            return True
-        except Exception as e:
-            try:
-                temp_context = ssl._create_unverified_context()
-                response = urllib.request.urlopen(url, context=temp_context)
-                with open(file_path, 'wb') as f:
-                    f.write(response.read())
-                
-                if expected_sha1 and not self.verify_file(file_path, expected_sha1):
-                    return False
-                return True
-            except Exception as final_e:
-                return False
+            with open(os.path.join(server_dir, SERVER_SETTINGS_NAME), "r") as f:
+                version_id = json.load(f)["version"]
+        except (OSError, ValueError, KeyError):
+            return None, f"Server {name} is not installed."
+        if ram is None:
+            ram = self.recommend_ram(version_id, server_dir, SERVER_HISTORY_PREFIX + version_id)
+        lock = InstanceLock(server_dir)
+        if not lock.acquire():
+            return None, f"Server {name} is already running."
+        try:
+            game = self.supervisor.launch(self.build_server_command(ram), server_dir, name, version_id, lock,
+                                          interactive=True, on_output=on_output,
+                                          history_key=SERVER_HISTORY_PREFIX + version_id)
+        except OSError as e:
+            lock.release()
+            return None, f"Failed to start server {name}: {e}"
+        return game, None
 
-    def download_version_files(self, version_id, version_url):
-        """Download the version JSON, JAR, libraries, and natives with checksum verification."""
-        version_dir = os.path.join(VERSIONS_DIR, version_id)
-        os.makedirs(version_dir, exist_ok=True)
+    def create_instance_dialog(self):
+        """Ask for a name and create a new instance for the selected version."""
+        name = simpledialog.askstring("New Instance", "Instance name:", parent=self)
+        if not name:
+            return
+        error = self.create_instance(name, self.version_combo.get() or None)
+        if error:
+            messagebox.showerror("Error", error)
+            return
+        self.instance_combo['values'] = self.list_instances()
+        self.instance_combo.set(name.strip())
 
-        version_json_path = os.path.join(version_dir, f"{version_id}.json")
+    def on_instance_selected(self, event=None):
+        """Switch the version selector to the version an instance last launched."""
+        version = self.load_instance_settings(self.instance_combo.get()).get("version")
+        if version and version in self.versions:
+            self.version_combo.set(version)
+            self.start_prewarm(version)
+            self.apply_ram_recommendation(version)
+
+    def on_version_selected(self, event=None):
+        """Prewarm the version picked in the version combobox or the versions list."""
+        if event is not None and event.widget is self.version_listbox:
+            selection = self.version_listbox.curselection()
+            version = self.version_listbox.get(selection[0]) if selection else None
+        else:
+            version = self.version_combo.get()
+        if version:
+            self.start_prewarm(version)
+            self.apply_ram_recommendation(version)
+
+    def version_release_time(self, version_id):
+        """releaseTime of a version from its installed JSON or the manifest; "" if unknown."""
         try:
-            with self.safe_urlopen(version_url) as url:
-                data = json.loads(url.read().decode())
-                with open(version_json_path, "w") as f:
-                    json.dump(data, f, indent=2)
+            return self.version_record(version_id).release_time
         except Exception as e:
-            try:
-                temp_context = ssl._create_unverified_context()
-                with urllib.request.urlopen(version_url, context=temp_context) as url:
-                    data = json.loads(url.read().decode())
-                    with open(version_json_path, "w") as f:
-                        json.dump(data, f, indent=2)
-            except Exception as final_e:
-                messagebox.showerror("Error", f"Failed to download version {version_id} JSON.")
-                return
+            pass
+        for entry in self.manifest_snapshot.entries if self.manifest_snapshot is not None else ():
+            if entry.id == version_id:
+                return entry.release_time
+        return ""
 
+    @staticmethod
+    def count_mods(game_dir):
+        """Number of mod jars in an instance's mods folder."""
         try:
-            jar_url = data["downloads"]["client"]["url"]
-            jar_path = os.path.join(version_dir, f"{version_id}.jar")
-            expected_sha1 = data["downloads"]["client"]["sha1"]
-            
-            if not os.path.exists(jar_path) or not self.verify_file(jar_path, expected_sha1):
-                if not self.safe_download_file(jar_url, jar_path, expected_sha1):
-                    messagebox.showerror("Error", f"Failed to download or verify version {version_id} JAR.")
-                    return
-        except KeyError as e:
-            messagebox.showerror("Error", f"Version {version_id} is missing client JAR information.")
+            return sum(1 for entry in os.scandir(os.path.join(game_dir, "mods")) if entry.name.endswith(".jar"))
+        except OSError:
+            return 0
+
+    def recommend_ram(self, version_id, game_dir=MINECRAFT_DIR, history_key=None):
+        """Recommended heap in whole GiB for a version launched from game_dir.
+
+        history_key picks the recorded sessions to learn from, the version's client ones by default.
+        """
+        history_key = history_key or version_id
+        heap_mb = recommend_heap_mb(self.version_release_time(version_id), self.count_mods(game_dir),
+                                    self.supervisor.peak_rss_history().get(history_key, []),
+                                    read_meminfo().get("MemTotal", 0),
+                                    self.supervisor.live_heap_history().get(history_key, []))
+        return heap_mb // 1024
+
+    def apply_ram_recommendation(self, version_id):
+        """Move the RAM slider to the recommendation for the selected version and instance.
+
+        Leaves the slider alone once the user has moved it this session.
+        """
+        if self.ram_user_set:
             return
+        game_dir = self.instance_game_dir(self.instance_combo.get() or DEFAULT_INSTANCE)
+        self.ram_scale.set(self.recommend_ram(version_id, game_dir))
 
-        current_os = platform.system().lower()
-        if current_os == "darwin":
-            current_os = "osx"
+    @staticmethod
+    def launch_would_swap(ram):
+        """Whether a game with ram GiB of heap would not fit in currently available memory."""
+        available = read_meminfo().get("MemAvailable")
+        return available is not None and (ram * 1024 + HEAP_NON_HEAP_MB) * 1048576 > available
 
+    def prewarm_paths(self, version_id):
+        """Files the JVM reads at startup for a version: client jar, classpath, natives and the bundled JDK's modules."""
+        version_dir = os.path.join(VERSIONS_DIR, version_id)
+        try:
+            record = self.version_record(version_id)
+        except Exception as e:
+            return []
+        paths = [os.path.join(version_dir, f"{version_id}.jar")]
         libraries_dir = os.path.join(MINECRAFT_DIR, "libraries")
-        os.makedirs(libraries_dir, exist_ok=True)
-        natives_dir = os.path.join(version_dir, "natives")
-        os.makedirs(natives_dir, exist_ok=True)
-
-        for lib in data.get("libraries", []):
-            if self.is_library_allowed(lib, current_os):
-                if "downloads" in lib and "artifact" in lib["downloads"]:
-                    lib_url = lib["downloads"]["artifact"]["url"]
-                    lib_path = os.path.join(libraries_dir, lib["downloads"]["artifact"]["path"])
-                    os.makedirs(os.path.dirname(lib_path), exist_ok=True)
-                    expected_sha1 = lib["downloads"]["artifact"]["sha1"]
-                    if not os.path.exists(lib_path) or not self.verify_file(lib_path, expected_sha1):
-                        if not self.safe_download_file(lib_url, lib_path, expected_sha1):
-                            pass
-
-                if "natives" in lib and current_os in lib["natives"]:
-                    classifier = lib["natives"][current_os]
-                    if "downloads" in lib and "classifiers" in lib["downloads"] and classifier in lib["downloads"]["classifiers"]:
-                        native_url = lib["downloads"]["classifiers"][classifier]["url"]
-                        native_path = os.path.join(natives_dir, f"{classifier}.jar")
-                        expected_sha1 = lib["downloads"]["classifiers"][classifier]["sha1"]
-                        if not os.path.exists(native_path) or not self.verify_file(native_path, expected_sha1):
-                            if self.safe_download_file(native_url, native_path, expected_sha1):
-                                try:
-                                    with zipfile.ZipFile(native_path, "r") as zip_ref:
-                                        zip_ref.extractall(natives_dir)
-                                    os.remove(native_path)
-                                except Exception as e:
-                                    pass
+        for lib in record.allowed_libraries(self.rule_engine, self.host_platform):
+            paths.append(os.path.join(libraries_dir, lib.path))
+        paths.extend(path for path, size in scan_tree(os.path.join(version_dir, "natives")))
+        if not self.is_java_installed():
+            paths.append(os.path.join(JAVA_DIR, JDK_DIRNAME, "lib", "modules"))
+        return paths
 
+    def start_prewarm(self, version_id):
+        """Prewarm a version's startup files on a background thread, cancelling any earlier prewarm."""
+        if not self.launcher_config.getboolean("launch", "prewarm", fallback=True):
+            return None
+        self.prewarm_cancel.set()
+        cancel = self.prewarm_cancel = threading.Event()
+        return self.run_in_background(lambda: prewarm_files(self.prewarm_paths(version_id), cancel))
 
-    def modify_options_txt(self, target_fps=60):
+    def modify_options_txt(self, target_fps=60, game_dir=MINECRAFT_DIR):
         """Modify options.txt to set maxFps and disable vsync."""
-        options_path = os.path.join(MINECRAFT_DIR, "options.txt")
+        options_path = os.path.join(game_dir, "options.txt")
         options = {}
         if os.path.exists(options_path):
             try:
@@ -680,35 +4160,19 @@ class CatLauncherMCv2025(tk.Tk):
         except Exception as e:
             pass
 
-    def is_library_allowed(self, lib, current_os):
-        """Check if a library is allowed on the current OS based on its rules."""
-        if "rules" not in lib:
-            return True
-        allowed = False
-        for rule in lib["rules"]:
-            if rule["action"] == "allow":
-                if "os" not in rule or (isinstance(rule.get("os"), dict) and rule["os"].get("name") == current_os):
-                    allowed = True
-            elif rule["action"] == "disallow":
-                if "os" in rule and isinstance(rule.get("os"), dict) and rule["os"].get("name") == current_os:
-                    allowed = False
-        return allowed
+    def target_platform(self, os_name=None):
+        """This machine's TargetPlatform, optionally with the OS name overridden."""
+        if os_name is None or os_name == self.host_platform.name:
+            return self.host_platform
+        return self.host_platform._replace(name=os_name)
 
-    def evaluate_rules(self, rules, current_os):
-        """Evaluate argument rules based on the current OS, ignoring feature-based rules."""
-        if not rules:
-            return True
-        allowed = False
-        for rule in rules:
-            if "features" in rule:
-                continue
-            if rule["action"] == "allow":
-                if "os" not in rule or (isinstance(rule.get("os"), dict) and rule["os"].get("name") == current_os):
-                    allowed = True
-            elif rule["action"] == "disallow":
-                if "os" in rule and isinstance(rule.get("os"), dict) and rule["os"].get("name") == current_os:
-                    allowed = False
-        return allowed
+    def is_library_allowed(self, lib, current_os=None):
+        """Check if a library is allowed on this platform (or OS name) based on its rules."""
+        return self.rule_engine.allows(lib.get("rules"), self.target_platform(current_os))
+
+    def evaluate_rules(self, rules, current_os=None):
+        """Evaluate argument rules for this platform (or OS name) with no optional features enabled."""
+        return self.rule_engine.allows(rules, self.target_platform(current_os))
 
     def generate_offline_uuid(self, username):
         """Generate a UUID for offline mode based on the username."""
@@ -717,53 +4181,41 @@ class CatLauncherMCv2025(tk.Tk):
         uuid_str = f"{hash_value[:8]}-{hash_value[8:12]}-{hash_value[12:16]}-{hash_value[16:20]}-{hash_value[20:32]}"
         return uuid_str
 
-    def build_launch_command(self, version, username, ram):
-        """Construct the command to launch Minecraft."""
+    def build_launch_command(self, version, username, ram, game_dir=MINECRAFT_DIR):
+        """Construct the command to launch Minecraft in game_dir."""
         version_dir = os.path.join(VERSIONS_DIR, version)
-        json_path = os.path.join(version_dir, f"{version}.json")
 
         try:
-            with open(json_path, "r") as f:
-                version_data = json.load(f)
+            record = self.version_record(version)
         except Exception as e:
-            messagebox.showerror("Error", f"Cannot read version {version} JSON.")
+            self.show_error("Error", f"Cannot read version {version} JSON.")
             return []
 
-        current_os = platform.system().lower()
-        if current_os == "darwin":
-            current_os = "osx"
-
-        main_class = version_data.get("mainClass", "net.minecraft.client.main.Main")
+        main_class = record.main_class
         libraries_dir = os.path.join(MINECRAFT_DIR, "libraries")
         natives_dir = os.path.join(version_dir, "natives")
         jar_path = os.path.join(version_dir, f"{version}.jar")
         classpath = [jar_path]
 
-        for lib in version_data.get("libraries", []):
-            if "downloads" in lib and "artifact" in lib["downloads"]:
-                lib_path = os.path.join(libraries_dir, lib["downloads"]["artifact"]["path"])
-                if os.path.exists(lib_path):
-                    classpath.append(lib_path)
+        for lib in record.allowed_libraries(self.rule_engine, self.host_platform):
+            lib_path = os.path.join(libraries_dir, lib.path)
+            if os.path.exists(lib_path):
+                classpath.append(lib_path)
 
         classpath_str = ";".join(classpath) if platform.system() == "Windows" else ":".join(classpath)
-        
-        if self.is_java_installed():
-            java_path = "java"
-        else:
-            java_exe = "java.exe" if platform.system() == "Windows" else "java"
-            java_path = os.path.join(JAVA_DIR, "jdk-21.0.5+11", "bin", java_exe)
-            if not os.path.exists(java_path):
-                java_path = "java"
+        java_path = self.java_executable()
 
-        command = [java_path, f"-Xmx{ram}G"]
+        # Commit half the heap up front so startup does not stall growing it; the rest grows on demand
+        command = [java_path, f"-Xms{ram * 512}M", f"-Xmx{ram}G", GC_LOG_FLAG]
 
         jvm_args = []
-        if "arguments" in version_data and "jvm" in version_data["arguments"]:
-            for arg in version_data["arguments"]["jvm"]:
+        arguments = record.arguments or {}
+        if "jvm" in arguments:
+            for arg in arguments["jvm"]:
                 if isinstance(arg, str):
                     jvm_args.append(arg)
                 elif isinstance(arg, dict) and "rules" in arg and "value" in arg:
-                    if self.evaluate_rules(arg["rules"], current_os):
+                    if self.evaluate_rules(arg["rules"]):
                         if isinstance(arg["value"], list):
                             jvm_args.extend(arg["value"])
                         else:
@@ -778,31 +4230,31 @@ class CatLauncherMCv2025(tk.Tk):
         command.extend(jvm_args)
 
         game_args = []
-        if "arguments" in version_data and "game" in version_data["arguments"]:
-            for arg in version_data["arguments"]["game"]:
+        if "game" in arguments:
+            for arg in arguments["game"]:
                 if isinstance(arg, str):
                     game_args.append(arg)
                 elif isinstance(arg, dict) and "rules" in arg and "value" in arg:
-                    if self.evaluate_rules(arg["rules"], current_os):
+                    if self.evaluate_rules(arg["rules"]):
                         if isinstance(arg["value"], list):
                             game_args.extend(arg["value"])
                         else:
                             game_args.append(arg["value"])
-        elif "minecraftArguments" in version_data:
-            game_args = version_data["minecraftArguments"].split()
+        elif record.minecraft_arguments:
+            game_args = record.minecraft_arguments.split()
 
         uuid = self.generate_offline_uuid(username)
 
         replacements = {
             "${auth_player_name}": username,
             "${version_name}": version,
-            "${game_directory}": MINECRAFT_DIR,
+            "${game_directory}": game_dir,
             "${assets_root}": os.path.join(MINECRAFT_DIR, "assets"),
-            "${assets_index_name}": version_data.get("assetIndex", {}).get("id", "legacy"),
+            "${assets_index_name}": record.asset_index or "legacy",
             "${auth_uuid}": uuid,
             "${auth_access_token}": "0",
             "${user_type}": "legacy",
-            "${version_type}": version_data.get("type", "release"),
+            "${version_type}": record.type,
             "${user_properties}": "{}",
             "${quickPlayRealms}": "",
         }
@@ -819,40 +4271,258 @@ class CatLauncherMCv2025(tk.Tk):
         return command
 
     def prepare_and_launch(self):
-        """Wrapper function to handle setup before launching."""
-        if not self.install_java_if_needed():
-            messagebox.showerror("Error", "Failed to install Java. Please install Java 21 manually.")
+        """Wrapper function to handle setup before launching, profiled when enabled."""
+        if not self.profile_launches:
+            self.download_and_launch()
             return
-            
-        self.modify_options_txt(target_fps=60)
-        self.download_and_launch()
 
-    def download_and_launch(self):
-        """Handle the download and launch process."""
+        top_allocations = self.launcher_config.getint("diagnostics", "top_allocations", fallback=25)
+        with LaunchProfiler(top_allocations=top_allocations) as profiler:
+            self.download_and_launch(profiler)
+        if profiler.error:
+            self.show_warning("Launch Profile", f"Failed to write launch diagnostics: {profiler.error}")
+        elif profiler.output_dir:
+            message = f"Launch diagnostics written to {profiler.output_dir}"
+            if self.headless:
+                print(message)
+            else:
+                messagebox.showinfo("Launch Profile", message)
+
+    def download_and_launch(self, profiler=None):
+        """Handle the download and launch process.
+
+        Pre-launch work runs as a TaskGraph, so the Java install overlaps the game
+        file downloads and options.txt is written alongside both; the critical path
+        is reported once the game starts or the launch fails. profiler, a
+        LaunchProfiler, also profiles the graph's worker threads.
+        """
+        started = time.perf_counter()
         version = self.version_combo.get()
         if not version:
-            messagebox.showerror("Error", "No version selected.")
+            self.show_error("Error", "No version selected.")
             return
 
         username = self.username_input.get() or "Steve"
         ram = int(self.ram_scale.get())
-        version_url = self.versions.get(version)
+        instance = self.instance_combo.get() or DEFAULT_INSTANCE
+        game_dir = self.instance_game_dir(instance)
+        os.makedirs(game_dir, exist_ok=True)
 
-        if not version_url:
-            messagebox.showerror("Error", f"Version {version} URL not found.")
+        if self.launch_would_swap(ram):
+            available_gb = read_meminfo().get("MemAvailable", 0) / 1073741824
+            suggested = self.recommend_ram(version, game_dir)
+            if not messagebox.askyesno("Low Memory", f"Only {available_gb:.1f} GB of memory is free, so {ram} GB of RAM "
+                                       f"will likely push the system into swap and stutter.\n\n"
+                                       f"Recommended for {version}: {suggested} GB. Launch anyway?"):
+                return
+
+        lock = InstanceLock(game_dir)
+        if not lock.acquire():
+            self.show_error("Error", f"Instance {instance} is already running. Create another instance to play side by side.")
             return
 
-        self.download_version_files(version, version_url)
+        def java():
+            if not self.install_java_if_needed():
+                raise LaunchAborted("Failed to install Java. Please install Java 21 manually.")
 
-        launch_cmd = self.build_launch_command(version, username, ram)
-        if not launch_cmd:
-            return
+        def integrity():
+            # A complete install journal means nothing needs downloading, even offline; the quick
+            # structural check catches damage the journal's size/mtime stat cannot see
+            ready = self.is_version_ready(version)
+            if ready:
+                damaged = self.quick_check_version(version)
+                if damaged:
+                    self.reopen_journals(damaged, [version])
+                    ready = False
+            return ready
+
+        def version_files():
+            if graph.results["integrity"]:
+                self.schedule_asset_downloads(version)
+                return
+            version_url = self.versions.get(version)
+            if not version_url and not os.path.exists(os.path.join(VERSIONS_DIR, version, f"{version}.json")):
+                raise LaunchAborted(f"Version {version} URL not found.")
+            self.download_version_files(version, version_url)
+
+        def command():
+            launch_cmd = self.build_launch_command(version, username, ram, game_dir=game_dir)
+            if not launch_cmd:
+                raise LaunchAborted("")
+            return launch_cmd
 
+        def launch():
+            self.supervisor.launch(graph.results["command"], game_dir, instance, version, lock)
+
+        graph = TaskGraph(profiler)
+        graph.add("java", java)
+        graph.add("options", lambda: self.modify_options_txt(target_fps=60, game_dir=game_dir))
+        graph.add("integrity", integrity)
+        graph.add("version_files", version_files, ["integrity"])
+        graph.add("command", command, ["java", "version_files"])
+        graph.add("launch", launch, ["command", "options"])
         try:
-            process = subprocess.Popen(launch_cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to launch Minecraft: {e}")
+            graph.run()
+        except TaskFailed as e:
+            lock.release()
+            LAUNCHES.inc(result="failed")
+            self.report_critical_path(graph, time.perf_counter() - started)
+            if not isinstance(e.error, LaunchAborted):
+                self.show_error("Error", f"Failed to launch Minecraft: {e.error}")
+            elif str(e.error):
+                self.show_error("Error", str(e.error))
+            return
+
+        LAUNCH_PREP_SECONDS.observe(time.perf_counter() - started)
+        LAUNCHES.inc(result="ok")
+        self.report_critical_path(graph, time.perf_counter() - started)
+        self.save_instance_settings(instance, {**self.load_instance_settings(instance), "version": version})
+
+    def report_critical_path(self, graph, total):
+        """Show which pre-launch tasks decided how long the launch took."""
+        path = " -> ".join(f"{name} {seconds:.2f}s" for name, seconds in graph.critical_path())
+        message = f"Launch prep took {total:.2f}s; critical path: {path or 'none'}"
+        if self.headless:
+            print(message)
+        else:
+            self.post_ui(lambda: self.tools_status.config(text=message))
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="CatLauncher")
+    parser.add_argument("--profile", action="store_true",
+                        help="profile each launch and write reports to the diagnostics folder")
+    parser.add_argument("--verify-all", action="store_true",
+                        help="re-verify every installed version's files and exit")
+    parser.add_argument("--scrub", action="store_true",
+                        help="fully re-hash installed files not checked recently, re-download damaged ones, then exit")
+    parser.add_argument("--gc", action="store_true",
+                        help="delete store files no installed version references, then exit")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="with --gc, only list what would be deleted")
+    parser.add_argument("--export-bundle", nargs=2, metavar=("VERSION", "BUNDLE"),
+                        help="pack an installed version into an offline bundle, then exit")
+    parser.add_argument("--with-jdk", action="store_true",
+                        help="with --export-bundle, include the bundled Java runtime")
+    parser.add_argument("--import-bundle", metavar="BUNDLE",
+                        help="install an offline bundle, then exit")
+    parser.add_argument("--mirror-sync", nargs="*", metavar="VERSION",
+                        help="download libraries and natives for every mirrored platform "
+                             "(all installed versions by default), then exit")
+    parser.add_argument("--server", nargs="+", metavar=("VERSION", "NAME"),
+                        help="install a version's dedicated server (into servers/NAME, default the version) "
+                             "and run it with its console attached")
+    parser.add_argument("--accept-eula", action="store_true",
+                        help="with --server, accept the Minecraft EULA in eula.txt")
+    parser.add_argument("--ram", type=int, metavar="GB",
+                        help="with --server, heap size in GB instead of the recommendation")
+    parser.add_argument("--serve-mirror", metavar="PORT", type=int, nargs="?", const=MIRROR_PORT,
+                        help="serve this machine's .minecraft tree as a LAN mirror")
+    args = parser.parse_args()
+
+    if args.serve_mirror:
+        serve_mirror(MINECRAFT_DIR, args.serve_mirror)
+        sys.exit(0)
+
+    if args.server:
+        launcher = CatLauncherMCv2025.headless_launcher()
+        launcher.load_version_manifest()
+        version_id, name = args.server[0], (args.server[1:] or [None])[0]
+        server_dir, error = launcher.install_server(version_id, name, accept_eula=args.accept_eula)
+        if error:
+            print(error, file=sys.stderr)
+            sys.exit(1)
+        game, error = launcher.launch_server(name or version_id, args.ram, on_output=print)
+        if error:
+            print(error, file=sys.stderr)
+            sys.exit(1)
+
+        def forward_console():
+            # Console lines go to the server; without a terminal (stdin at EOF) it simply keeps running
+            for line in sys.stdin:
+                game.send(line)
+
+        threading.Thread(target=forward_console, daemon=True).start()
+        try:
+            while game.running:
+                launcher.supervisor.sample()
+                time.sleep(SUPERVISOR_SAMPLE_INTERVAL)
+        except KeyboardInterrupt:
+            launcher.supervisor.kill(game)
+        for alert in game.analyzer.pop_alerts():
+            print(alert, file=sys.stderr)
+        sys.exit(game.exit_code or 0)
+
+    if args.verify_all:
+        launcher = CatLauncherMCv2025.headless_launcher()
+
+        def print_progress(done, total):
+            filled = int(40 * done / max(total, 1))
+            print(f"\r[{'#' * filled}{'.' * (40 - filled)}] {done}/{total}", end="", flush=True)
+
+        failed = launcher.verify_installed_versions(print_progress)
+        print()
+        for path in failed:
+            print(f"corrupt or missing: {path}")
+        sys.exit(1 if failed else 0)
+
+    if args.scrub:
+        launcher = CatLauncherMCv2025.headless_launcher()
+        launcher.load_version_manifest()
+        verified, corrupt = launcher.scrub_pass()
+        for path in corrupt:
+            print(f"corrupt or missing: {path}")
+        launcher.download_scheduler.join()
+        print(f"Verified {verified} file(s), {len(corrupt)} damaged")
+        sys.exit(1 if corrupt else 0)
+
+    if args.mirror_sync is not None:
+        launcher = CatLauncherMCv2025.headless_launcher()
+
+        def print_progress(done, total):
+            filled = int(40 * done / max(total, 1))
+            print(f"\r[{'#' * filled}{'.' * (40 - filled)}] {done}/{total}", end="", flush=True)
+
+        downloaded, failed = launcher.sync_mirror(args.mirror_sync, progress=print_progress)
+        print()
+        for path in failed:
+            print(f"failed: {path}")
+        print(f"Downloaded {downloaded} file(s) for {len(MIRROR_SYNC_PLATFORMS)} platform(s), {len(failed)} failed")
+        sys.exit(1 if failed else 0)
+
+    if args.export_bundle:
+        launcher = CatLauncherMCv2025.headless_launcher()
+        version_id, bundle_path = args.export_bundle
+        count = launcher.export_bundle(version_id, bundle_path, include_jdk=args.with_jdk)
+        print(f"Exported {count} file(s) for {version_id} to {bundle_path}")
+        sys.exit(0)
+
+    if args.import_bundle:
+        launcher = CatLauncherMCv2025.headless_launcher()
+        try:
+            version_id, written, skipped, failed = launcher.import_bundle(args.import_bundle)
+        except ValueError as e:
+            print(e, file=sys.stderr)
+            sys.exit(1)
+        for name in failed:
+            print(f"failed verification: {name}")
+        print(f"Imported {version_id}: {written} written, {skipped} already present, {len(failed)} failed")
+        sys.exit(1 if failed else 0)
+
+    if args.gc:
+        launcher = CatLauncherMCv2025.headless_launcher()
+        try:
+            garbage = launcher.collect_garbage(dry_run=args.dry_run)
+        except RuntimeError as e:
+            print(e, file=sys.stderr)
+            sys.exit(1)
+        for path, size in garbage:
+            print(f"{size:>12}  {path}")
+        total = sum(size for path, size in garbage)
+        action = "would free" if args.dry_run else "freed"
+        print(f"{len(garbage)} unused file(s), {action} {total / 1048576:.1f} MB")
+        sys.exit(0)
+
     app = CatLauncherMCv2025()
+    if args.profile:
+        app.profile_var.set(True)
     app.mainloop()
\ No newline at end of file
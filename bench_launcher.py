@@ -0,0 +1,680 @@
+"""Benchmark CatLauncher's download and launch preparation against a local fake Mojang server.
+
+The launcher runs headless with HOME pointed at a scratch directory and a
+[mirror_rules] config that sends every upstream host to the fixture server, so
+nothing touches the network or the real ~/.minecraft.
+
+With --stress it instead generates synthetic manifests, library lists and asset
+indexes at doubling sizes, times the launcher's handling of each, and fails when
+the median growth exponent over several sweeps is well above linear, so
+quadratic regressions are caught without one noisy sweep failing the run.
+
+Usage: python bench_launcher.py [--libraries N] [--runs N] [--json]
+       python bench_launcher.py --stress [--stress-scale F] [--stress-trials N] [--max-exponent E]
+"""
+import os
+import sys
+import io
+import json
+import time
+import shutil
+import hashlib
+import platform
+import tarfile
+import zipfile
+import argparse
+import tempfile
+import importlib.util
+import math
+import statistics
+import gc
+import multiprocessing
+import http.server
+import urllib.parse
+
+LAUNCHER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "CatHDRCTLauncherv0x.x.x10.7.25.py")
+BENCH_VERSION = "bench-1.0"
+UPSTREAM_HOSTS = [
+    "launchermeta.mojang.com",
+    "piston-meta.mojang.com",
+    "piston-data.mojang.com",
+    "libraries.minecraft.net",
+    "resources.download.minecraft.net",
+    "github.com",
+]
+
+# Largest synthetic sizes at --stress-scale 1; each is also measured at 1/2, 1/4 and 1/8 of it
+STRESS_MANIFEST_ENTRIES = 10000
+STRESS_LIBRARIES = 2000
+STRESS_ASSET_OBJECTS = 100000
+STRESS_STEPS = 4
+STRESS_REPEATS = 5
+STRESS_TRIALS = 3  # full size sweeps per scenario; the median exponent is judged
+# n log n measures about 1.1 over these sizes and an injected quadratic about 1.7
+STRESS_MAX_EXPONENT = 1.35
+STRESS_FIT_POINTS = 3  # the largest sizes, where the asymptotic term dominates fixed overhead
+STRESS_VERSION = "stress-1.0"
+
+def load_launcher_module():
+    """Import the launcher script, whose file name is not a valid module name."""
+    spec = importlib.util.spec_from_file_location("catlauncher", LAUNCHER_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def write_file(path, data):
+    """Write data to path, creating parent directories, and return its SHA1."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+    return hashlib.sha1(data).hexdigest()
+
+def make_zip(entries, compression=zipfile.ZIP_DEFLATED):
+    """Build an in-memory zip from a {name: bytes} dict."""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", compression) as zf:
+        for name, data in entries.items():
+            zf.writestr(name, data)
+    return buffer.getvalue()
+
+def make_jar(size):
+    """Build a jar-shaped zip of roughly size bytes of incompressible payload."""
+    return make_zip({"META-INF/MANIFEST.MF": b"Manifest-Version: 1.0\r\n", "payload.bin": os.urandom(size)},
+                    zipfile.ZIP_STORED)
+
+def make_jdk_archive(jdk_dirname, filler_mb, as_zip):
+    """Build a fake JDK archive with a runnable bin/java and some filler modules."""
+    java_script = b"#!/bin/sh\necho 'openjdk version \"21.0.5\"' >&2\n"
+    filler = os.urandom(filler_mb * 1024 * 1024)
+    if as_zip:
+        return make_zip({f"{jdk_dirname}/bin/java.exe": java_script, f"{jdk_dirname}/lib/modules": filler})
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz", compresslevel=1) as tar:
+        for name, data, mode in ((f"{jdk_dirname}/bin/java", java_script, 0o755),
+                                 (f"{jdk_dirname}/lib/modules", filler, 0o644)):
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            info.mode = mode
+            tar.addfile(info, io.BytesIO(data))
+    return buffer.getvalue()
+
+def generate_fixture(www, launcher, args):
+    """Lay out a fake upstream under www/<host>/<path> for one version, its libraries and a JDK."""
+    libraries = []
+    for i in range(args.libraries):
+        path = f"com/example/bench/lib{i}/1.0/lib{i}-1.0.jar"
+        data = make_jar(args.library_kb * 1024)
+        sha1 = write_file(os.path.join(www, "libraries.minecraft.net", path), data)
+        libraries.append({
+            "name": f"com.example.bench:lib{i}:1.0",
+            "downloads": {"artifact": {"path": path, "url": f"https://libraries.minecraft.net/{path}",
+                                       "sha1": sha1, "size": len(data)}},
+        })
+
+    classifiers = {}
+    for os_name in ("linux", "windows", "osx"):
+        path = f"org/lwjgl/lwjgl-platform/2.9.4/lwjgl-platform-2.9.4-natives-{os_name}.jar"
+        data = make_zip({f"liblwjgl-{os_name}-{n}.so": os.urandom(64 * 1024) for n in range(args.natives)})
+        sha1 = write_file(os.path.join(www, "libraries.minecraft.net", path), data)
+        classifiers[f"natives-{os_name}"] = {"path": path, "url": f"https://libraries.minecraft.net/{path}",
+                                             "sha1": sha1, "size": len(data)}
+    libraries.append({
+        "name": "org.lwjgl.lwjgl:lwjgl-platform:2.9.4",
+        "natives": {"linux": "natives-linux", "windows": "natives-windows", "osx": "natives-osx"},
+        "downloads": {"classifiers": classifiers},
+    })
+
+    client = make_jar(args.client_mb * 1024 * 1024)
+    client_sha1 = hashlib.sha1(client).hexdigest()
+    write_file(os.path.join(www, "piston-data.mojang.com", "v1", "objects", client_sha1, "client.jar"), client)
+
+    objects = {}
+    for i in range(args.assets):
+        data = os.urandom(args.asset_kb * 1024)
+        sha1 = hashlib.sha1(data).hexdigest()
+        write_file(os.path.join(www, "resources.download.minecraft.net", sha1[:2], sha1), data)
+        objects[f"minecraft/sounds/bench/{i}.ogg"] = {"hash": sha1, "size": len(data)}
+    index_bytes = json.dumps({"objects": objects}).encode()
+    index_sha1 = write_file(os.path.join(www, "piston-meta.mojang.com", "v1", "packages", "bench-assets.json"),
+                            index_bytes)
+
+    version = {
+        "id": BENCH_VERSION,
+        "type": "release",
+        "mainClass": "net.minecraft.client.main.Main",
+        "assetIndex": {"id": "bench", "sha1": index_sha1, "size": len(index_bytes),
+                       "url": "https://piston-meta.mojang.com/v1/packages/bench-assets.json"},
+        "downloads": {"client": {"url": f"https://piston-data.mojang.com/v1/objects/{client_sha1}/client.jar",
+                                 "sha1": client_sha1, "size": len(client)}},
+        "libraries": libraries,
+        "arguments": {
+            "game": ["--username", "${auth_player_name}", "--version", "${version_name}",
+                     "--gameDir", "${game_directory}", "--assetsDir", "${assets_root}",
+                     "--assetIndex", "${assets_index_name}", "--uuid", "${auth_uuid}",
+                     "--accessToken", "${auth_access_token}", "--userType", "${user_type}"],
+            "jvm": [{"rules": [{"action": "allow", "os": {"name": "osx"}}], "value": ["-XstartOnFirstThread"]},
+                    "-Djava.library.path=${natives_directory}", "-cp", "${classpath}"],
+        },
+    }
+    version_bytes = json.dumps(version).encode()
+    version_sha1 = hashlib.sha1(version_bytes).hexdigest()
+    write_file(os.path.join(www, "piston-meta.mojang.com", "v1", "packages", version_sha1,
+                            f"{BENCH_VERSION}.json"), version_bytes)
+
+    entries = [{"id": BENCH_VERSION, "type": "release",
+                "url": f"https://piston-meta.mojang.com/v1/packages/{version_sha1}/{BENCH_VERSION}.json"}]
+    for i in range(args.manifest_entries):
+        entries.append({"id": f"bench-snapshot-{i}", "type": "snapshot" if i % 3 else "old_beta",
+                        "url": f"https://piston-meta.mojang.com/v1/packages/{i:040x}/bench-snapshot-{i}.json"})
+    manifest = {"latest": {"release": BENCH_VERSION, "snapshot": "bench-snapshot-0"}, "versions": entries}
+    write_file(os.path.join(www, "launchermeta.mojang.com", "mc", "game", "version_manifest.json"),
+               json.dumps(manifest).encode())
+
+    system = platform.system()
+    jdk_url = launcher.JDK_URLS.get(system, launcher.JDK_URLS["Linux"])
+    jdk_path = jdk_url.split("://", 1)[1]
+    jdk = make_jdk_archive(launcher.JDK_DIRNAME, args.jdk_mb, as_zip=jdk_url.endswith(".zip"))
+    # The fixture server unquotes request paths, so %2B in the URL is stored as '+'
+    jdk_file = os.path.join(www, *urllib.parse.unquote(jdk_path).split("/"))
+    write_file(jdk_file, jdk)
+    with open(jdk_file + launcher.JDK_CHECKSUM_SUFFIX, "w") as f:
+        f.write(f"{hashlib.sha256(jdk).hexdigest()}  {os.path.basename(jdk_file)}\n")
+
+class FixtureRequestHandler(http.server.SimpleHTTPRequestHandler):
+    """Quiet static file handler that counts the bytes it serves."""
+    bytes_served = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def copyfile(self, source, outputfile):
+        size = os.fstat(source.fileno()).st_size
+        super().copyfile(source, outputfile)
+        with self.bytes_served.get_lock():
+            self.bytes_served.value += size
+
+def run_fixture_server(www, bytes_served, port_queue):
+    """Serve www in a child process so its syscalls and memory stay out of the measurements."""
+    handler = type("BoundFixtureRequestHandler", (FixtureRequestHandler,), {"bytes_served": bytes_served})
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0),
+                                             lambda *a: handler(*a, directory=www))
+    port_queue.put(server.server_address[1])
+    server.serve_forever()
+
+def read_syscalls():
+    """Return (read, write) syscall counts of this process, or (0, 0) where /proc is missing."""
+    try:
+        with open("/proc/self/io") as f:
+            fields = dict(line.split(":", 1) for line in f)
+        return int(fields["syscr"]), int(fields["syscw"])
+    except (OSError, KeyError, ValueError):
+        return 0, 0
+
+def reset_peak_rss():
+    """Reset the kernel's high-water RSS mark so each phase reports its own peak."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+def read_peak_rss_kb():
+    """Return the peak RSS in KiB since the last reset."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+def measure(label, phase, bytes_served, func):
+    """Run func once and return its result row."""
+    reset_peak_rss()
+    reads_before, writes_before = read_syscalls()
+    served_before = bytes_served.value
+    start = time.perf_counter()
+    ok = func()
+    wall = time.perf_counter() - start
+    reads_after, writes_after = read_syscalls()
+    transferred = bytes_served.value - served_before
+    return {
+        "run": label,
+        "phase": phase,
+        "ok": bool(ok),
+        "wall_s": round(wall, 4),
+        "mb": round(transferred / 1e6, 2),
+        "mb_per_s": round(transferred / 1e6 / wall, 2) if wall > 0 else 0.0,
+        "peak_rss_mb": round(read_peak_rss_kb() / 1024, 1),
+        "read_syscalls": reads_after - reads_before,
+        "write_syscalls": writes_after - writes_before,
+    }
+
+def run_pipeline(launcher_module, label, bytes_served):
+    """Drive one cold or warm pass over the launch-preparation pipeline."""
+    launcher = launcher_module.CatLauncherMCv2025.headless_launcher()
+    rows = []
+
+    def manifest():
+        launcher.load_version_manifest()
+        return BENCH_VERSION in launcher.versions
+
+    def version_files():
+        launcher.download_version_files(BENCH_VERSION, launcher.versions[BENCH_VERSION])
+        return os.path.exists(os.path.join(launcher_module.VERSIONS_DIR, BENCH_VERSION, f"{BENCH_VERSION}.jar"))
+
+    def background_assets():
+        # download_version_files returns once launch-critical files are in; assets trail behind
+        launcher.download_scheduler.join()
+        index = os.path.join(launcher_module.MINECRAFT_DIR, "assets", "indexes", "bench.json")
+        return os.path.exists(index)
+
+    def prewarm():
+        return launcher_module.prewarm_files(launcher.prewarm_paths(BENCH_VERSION)) > 0
+
+    def readiness():
+        return launcher.is_version_ready(BENCH_VERSION)
+
+    def quick_check():
+        return not launcher.quick_check_version(BENCH_VERSION)
+
+    def java():
+        return launcher.install_java_if_needed(use_system_java=False)
+
+    def command():
+        return bool(launcher.build_launch_command(BENCH_VERSION, "Bench", 2))
+
+    for phase, func in (("load_version_manifest", manifest), ("download_version_files", version_files),
+                        ("background_assets", background_assets),
+                        ("is_version_ready", readiness), ("quick_check_version", quick_check),
+                        ("prewarm_files", prewarm), ("install_java_if_needed", java),
+                        ("build_launch_command", command)):
+        rows.append(measure(label, phase, bytes_served, func))
+    return rows
+
+def stress_manifest(entries):
+    """A version manifest with the given number of entries across every version type."""
+    types = ("release", "snapshot", "old_beta", "old_alpha")
+    versions = [{"id": f"stress-{i}", "type": types[i % 7 % 4],
+                 "url": f"https://piston-meta.mojang.com/v1/packages/{i:040x}/stress-{i}.json",
+                 "time": "2024-01-01T00:00:00+00:00", "releaseTime": f"{2009 + i % 16}-01-01T00:00:00+00:00",
+                 "sha1": f"{i:040x}", "complianceLevel": 1}
+                for i in range(entries)]
+    return {"latest": {"release": "stress-1", "snapshot": "stress-2"}, "versions": versions}
+
+def stress_rules(i):
+    """A rule list of the shapes real profiles use, varied by i so memoised verdicts cannot hide the cost."""
+    kind = i % 4
+    if kind == 0:
+        return [{"action": "allow"}, {"action": "disallow", "os": {"name": "osx"}}]
+    if kind == 1:
+        return [{"action": "allow", "os": {"name": "linux", "arch": f"x86(_64)?|arm{i % 97}"}}]
+    if kind == 2:
+        return [{"action": "allow"}, {"action": "disallow", "os": {"name": "windows", "version": f"^10\\.{i % 89}\\."}}]
+    return [{"action": "allow", "features": {f"has_feature_{i % 13}": i % 2 == 0}}, {"action": "allow"}]
+
+def stress_version(libraries, asset_index_id):
+    """A version profile with the given number of rule-laden libraries, every tenth with natives."""
+    libs = []
+    for i in range(libraries):
+        path = f"com/example/stress/lib{i}/1.{i % 10}/lib{i}-1.{i % 10}.jar"
+        lib = {"name": f"com.example.stress:lib{i}:1.{i % 10}", "rules": stress_rules(i),
+               "downloads": {"artifact": {"path": path, "url": f"https://libraries.minecraft.net/{path}",
+                                          "sha1": f"{i:040x}", "size": 1024}}}
+        if i % 10 == 0:
+            lib["natives"] = {"linux": "natives-linux", "windows": "natives-windows", "osx": "natives-osx"}
+        libs.append(lib)
+    jvm = [{"rules": stress_rules(i), "value": [f"-Dstress.{i}=true"]} for i in range(libraries // 10)]
+    return {
+        "id": STRESS_VERSION,
+        "type": "release",
+        "mainClass": "net.minecraft.client.main.Main",
+        "releaseTime": "2024-01-01T00:00:00+00:00",
+        "assetIndex": {"id": asset_index_id},
+        "downloads": {"client": {"sha1": "0" * 40, "size": 1}},
+        "libraries": libs,
+        "arguments": {"game": ["--username", "${auth_player_name}", "--version", "${version_name}"],
+                      "jvm": jvm + ["-Djava.library.path=${natives_directory}", "-cp", "${classpath}"]},
+    }
+
+def stress_asset_index(objects):
+    """An asset index with the given number of objects."""
+    return {"objects": {f"minecraft/stress/{i}.ogg": {"hash": hashlib.sha1(str(i).encode()).hexdigest(), "size": 4096}
+                        for i in range(objects)}}
+
+def time_best(func, setup=None, repeats=STRESS_REPEATS):
+    """Best wall time of func over repeats, running setup untimed before each.
+
+    The cyclic collector is paused while timing; its pauses depend on everything
+    else alive in the process and would swamp the growth being measured.
+    """
+    best = None
+    for _ in range(repeats):
+        if setup is not None:
+            setup()
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            func()
+            elapsed = time.perf_counter() - start
+        finally:
+            gc.enable()
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def growth_exponent(points, fit_points=STRESS_FIT_POINTS):
+    """Least-squares k for t ~ n**k over the largest (n, seconds) points, in log-log space."""
+    logs = [(math.log(n), math.log(t)) for n, t in points[-fit_points:] if n > 0 and t > 0]
+    if len(logs) < 2:
+        return 0.0
+    mean_x = sum(x for x, y in logs) / len(logs)
+    mean_y = sum(y for x, y in logs) / len(logs)
+    spread = sum((x - mean_x) ** 2 for x, y in logs)
+    return sum((x - mean_x) * (y - mean_y) for x, y in logs) / spread if spread else 0.0
+
+def write_stress_version(launcher_module, libraries, asset_objects):
+    """Install a synthetic version (JSON, empty library files, asset index) into the scratch .minecraft."""
+    shutil.rmtree(launcher_module.MINECRAFT_DIR, ignore_errors=True)
+    shutil.rmtree(launcher_module.METADATA_CACHE_DIR, ignore_errors=True)
+    version = stress_version(libraries, "stress")
+    write_file(os.path.join(launcher_module.VERSIONS_DIR, STRESS_VERSION, f"{STRESS_VERSION}.json"),
+               json.dumps(version).encode())
+    for lib in version["libraries"]:
+        write_file(os.path.join(launcher_module.MINECRAFT_DIR, "libraries", lib["downloads"]["artifact"]["path"]), b"")
+    write_file(os.path.join(launcher_module.MINECRAFT_DIR, "assets", "indexes", "stress.json"),
+               json.dumps(stress_asset_index(asset_objects)).encode())
+    return version
+
+class StubCombobox:
+    """The parts of ttk.Combobox that update_version_list uses, for machines without a display."""
+
+    def __init__(self, value=""):
+        self.value = value
+        self.options = {"values": ()}
+
+    def get(self):
+        return self.value
+
+    def set(self, value):
+        self.value = value
+
+    def current(self, index):
+        self.value = self.options["values"][index]
+
+    def __getitem__(self, key):
+        return self.options[key]
+
+    def __setitem__(self, key, value):
+        self.options[key] = tuple(value)
+
+class StubListbox:
+    """The parts of tk.Listbox that update_version_list uses, for machines without a display."""
+
+    def __init__(self):
+        self.items = []
+
+    def delete(self, first, last=None):
+        del self.items[first:None if last == "end" else (last if last is not None else first) + 1]
+
+    def insert(self, index, *items):
+        position = len(self.items) if index == "end" else index
+        self.items[position:position] = items
+
+def version_list_widgets(launcher):
+    """Give a headless launcher version widgets: real hidden ones with a display, else stand-ins.
+
+    Returns (Tk root or None, "tk" or "stub"). The stand-ins cost nothing, so
+    without a display only the launcher's own work is timed.
+    """
+    import tkinter as tk
+    from tkinter import ttk
+    launcher.headless = False
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        launcher.category_combo = StubCombobox("Release")
+        launcher.version_combo = StubCombobox()
+        launcher.version_listbox = StubListbox()
+        return None, "stub"
+    root.withdraw()
+    launcher.category_combo = ttk.Combobox(root, values=list(launcher.version_categories))
+    launcher.category_combo.set("Release")
+    launcher.version_combo = ttk.Combobox(root)
+    launcher.version_listbox = tk.Listbox(root)
+    return root, "tk"
+
+def check_breaker_half_open(launcher_module, www, port):
+    """Walk a circuit breaker through half-open probes that end in non-transient errors.
+
+    Each probe must settle the breaker, so a later request is still let through:
+    a TLS failure (the fixture server speaks plain HTTP) and a local error raised
+    by consume. Returns a summary row.
+    """
+    policy = launcher_module.FetchPolicy(launcher_module.ssl.create_default_context(), retries=0,
+                                         threshold=1, cooldown=0.0, timeout=5)
+    write_file(os.path.join(www, "breaker.txt"), b"up")
+    base = f"127.0.0.1:{port}"
+
+    def dropped(response):
+        raise ConnectionResetError("dropped")
+
+    def disk_full(response):
+        raise OSError("No space left on device")
+
+    steps = [("transient failure opens", f"http://{base}/breaker.txt", dropped),
+             ("TLS failure on probe", f"https://{base}/missing", None),
+             ("local error on probe", f"http://{base}/breaker.txt", disk_full),
+             ("host still probed", f"http://{base}/breaker.txt", None)]
+    for label, url, consume in steps:
+        try:
+            policy.fetch(url, consume)
+        except launcher_module.HostUnavailableError:
+            return {"scenario": "circuit breaker half-open", "exponent": None, "margin": None, "result": "fail",
+                    "note": f"probe never released before: {label}"}
+        except Exception:
+            pass
+    return {"scenario": "circuit breaker half-open", "exponent": None, "margin": None, "result": "pass",
+            "note": "probes released after TLS and local errors"}
+
+def run_stress(launcher_module, www, args):
+    """Time each scenario at doubling sizes over several sweeps; returns (rows, summary rows).
+
+    A summary row's result is "pass" or "fail", judged on the median of the
+    sweeps' exponents; margin is how far that median sits below --max-exponent.
+    A scenario that cannot run fails.
+    """
+    scale = args.stress_scale
+    rows = []
+    summary = []
+    notes = {}  # scenario -> how it ran, when that varies by machine
+
+    def sizes(largest):
+        largest = max(STRESS_STEPS, int(largest * scale))
+        return [largest >> (STRESS_STEPS - 1 - step) for step in range(STRESS_STEPS)]
+
+    def manifest_scenario(n):
+        write_file(os.path.join(www, "launchermeta.mojang.com", "mc", "game", "version_manifest.json"),
+                   json.dumps(stress_manifest(n)).encode())
+        launchers = []
+
+        def setup():
+            # A first load: no previous snapshot to diff against or short-circuit on
+            for path in (launcher_module.MANIFEST_CACHE_PATH, launcher_module.MANIFEST_COMPACT_PATH):
+                if os.path.exists(path):
+                    os.remove(path)
+            launchers[:] = [launcher_module.CatLauncherMCv2025.headless_launcher()]
+
+        return time_best(lambda: launchers[0].load_version_manifest(), setup)
+
+    def rules_scenario(n):
+        version = stress_version(n, "stress")
+        launchers = []
+
+        def setup():
+            launchers[:] = [launcher_module.CatLauncherMCv2025.headless_launcher()]
+
+        def run():
+            launcher = launchers[0]
+            for lib in version["libraries"]:
+                launcher.is_library_allowed(lib)
+            for arg in version["arguments"]["jvm"]:
+                if isinstance(arg, dict):
+                    launcher.evaluate_rules(arg["rules"])
+
+        return time_best(run, setup)
+
+    def command_scenario(n):
+        write_stress_version(launcher_module, n, 1)
+        launchers = []
+
+        def setup():
+            # Cold: the compact metadata record is rebuilt from the JSON every time
+            shutil.rmtree(launcher_module.METADATA_CACHE_DIR, ignore_errors=True)
+            launchers[:] = [launcher_module.CatLauncherMCv2025.headless_launcher()]
+
+        return time_best(lambda: launchers[0].build_launch_command(STRESS_VERSION, "Stress", 2), setup)
+
+    def assets_scenario(n):
+        write_stress_version(launcher_module, 1, n)
+        launcher = launcher_module.CatLauncherMCv2025.headless_launcher()
+        return time_best(lambda: launcher.installed_artifacts(STRESS_VERSION))
+
+    def version_list_scenario(n):
+        launcher = launcher_module.CatLauncherMCv2025.headless_launcher()
+        root, notes["update_version_list"] = version_list_widgets(launcher)
+        try:
+            manifest = launcher_module.VersionManifest.from_json(json.dumps(stress_manifest(n)).encode())
+            launcher.version_categories.update(launcher_module.categorize_versions(manifest))
+            return time_best(launcher.update_version_list)
+        finally:
+            if root is not None:
+                root.destroy()
+
+    scenarios = [
+        ("load_version_manifest", "manifest entries", STRESS_MANIFEST_ENTRIES, manifest_scenario),
+        ("is_library_allowed+evaluate_rules", "libraries", STRESS_LIBRARIES, rules_scenario),
+        ("build_launch_command", "libraries", STRESS_LIBRARIES, command_scenario),
+        ("installed_artifacts", "asset objects", STRESS_ASSET_OBJECTS, assets_scenario),
+        ("update_version_list", "manifest entries", STRESS_MANIFEST_ENTRIES, version_list_scenario),
+    ]
+    for name, unit, largest, scenario in scenarios:
+        exponents = []
+        for trial in range(1, args.stress_trials + 1):
+            points = []
+            try:
+                for n in sizes(largest):
+                    seconds = scenario(n)
+                    points.append((n, seconds))
+                    rows.append({"scenario": name, "trial": trial, "n": n, "unit": unit,
+                                 "wall_s": round(seconds, 5)})
+            except Exception as e:
+                notes[name] = f"could not run: {e}"
+                break
+            exponents.append(growth_exponent(points))
+        if len(exponents) < args.stress_trials:
+            summary.append({"scenario": name, "exponent": None, "margin": None, "result": "fail",
+                            "note": notes[name]})
+            continue
+        exponent = statistics.median(exponents)
+        note = f"{points[-STRESS_FIT_POINTS:][0][0]}..{points[-1][0]} {unit}, " \
+               f"sweeps {' '.join(f'{e:.2f}' for e in exponents)}"
+        if name in notes:
+            note += f", {notes[name]} widgets"
+        summary.append({"scenario": name, "exponent": round(exponent, 2),
+                        "margin": round(args.max_exponent - exponent, 2),
+                        "result": "pass" if exponent <= args.max_exponent else "fail", "note": note})
+    return rows, summary
+
+def print_table(rows, columns=("run", "phase", "ok", "wall_s", "mb", "mb_per_s", "peak_rss_mb", "read_syscalls",
+                                "write_syscalls")):
+    """Print result rows as an aligned table."""
+    widths = {c: max(len(c), *(len(str(r[c])) for r in rows)) for c in columns}
+    print("  ".join(c.ljust(widths[c]) for c in columns))
+    for row in rows:
+        print("  ".join(str(row[c]).ljust(widths[c]) for c in columns))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--libraries", type=int, default=60, help="classpath libraries in the fake version")
+    parser.add_argument("--library-kb", type=int, default=256, help="size of each fake library")
+    parser.add_argument("--assets", type=int, default=400, help="asset objects, fetched in the background")
+    parser.add_argument("--asset-kb", type=int, default=16, help="size of each fake asset object")
+    parser.add_argument("--natives", type=int, default=8, help="native files per natives jar")
+    parser.add_argument("--client-mb", type=int, default=16, help="size of the fake client jar")
+    parser.add_argument("--jdk-mb", type=int, default=32, help="filler size inside the fake JDK archive")
+    parser.add_argument("--manifest-entries", type=int, default=800, help="extra versions in the manifest")
+    parser.add_argument("--runs", type=int, default=1, help="cold+warm passes to run")
+    parser.add_argument("--json", action="store_true", help="print results as JSON instead of a table")
+    parser.add_argument("--stress", action="store_true",
+                        help="run the synthetic scaling checks instead of the download pipeline")
+    parser.add_argument("--stress-scale", type=float, default=1.0,
+                        help="multiply the largest synthetic sizes (10k manifest entries, 2k libraries, "
+                             "100k asset objects)")
+    parser.add_argument("--stress-trials", type=int, default=STRESS_TRIALS,
+                        help="size sweeps per scenario; the median exponent is judged")
+    parser.add_argument("--max-exponent", type=float, default=STRESS_MAX_EXPONENT,
+                        help="with --stress, fail when time grows faster than n**E (linear is 1, quadratic 2)")
+    args = parser.parse_args()
+
+    scratch = tempfile.mkdtemp(prefix="catlauncher-bench-")
+    home = os.path.join(scratch, "home")
+    www = os.path.join(scratch, "www")
+    os.makedirs(home)
+    # The launcher resolves ~/.minecraft and ~/.catlauncher at import time
+    os.environ["HOME"] = home
+    os.environ["USERPROFILE"] = home
+    launcher_module = load_launcher_module()
+
+    bytes_served = multiprocessing.Value("q", 0)
+    if not args.stress:
+        generate_fixture(www, launcher_module, args)
+    else:
+        os.makedirs(www)
+    port_queue = multiprocessing.Queue()
+    server = multiprocessing.Process(target=run_fixture_server, args=(www, bytes_served, port_queue), daemon=True)
+    server.start()
+    port = port_queue.get(timeout=30)
+
+    os.makedirs(launcher_module.CATLAUNCHER_DIR, exist_ok=True)
+    with open(launcher_module.CONFIG_PATH, "w") as f:
+        f.write("[network]\nupstream_fallback = no\n\n[mirror_rules]\n")
+        for host in UPSTREAM_HOSTS:
+            f.write(f"https://{host}/ = http://127.0.0.1:{port}/{host}/\n")
+
+    if args.stress:
+        try:
+            rows, summary = run_stress(launcher_module, www, args)
+            summary.append(check_breaker_half_open(launcher_module, www, port))
+        finally:
+            server.terminate()
+            shutil.rmtree(scratch, ignore_errors=True)
+        if args.json:
+            print(json.dumps({"timings": rows, "summary": summary}, indent=2))
+        else:
+            print_table(rows, ("scenario", "trial", "n", "unit", "wall_s"))
+            print()
+            print_table(summary, ("scenario", "exponent", "margin", "result", "note"))
+        return 1 if any(row["result"] == "fail" for row in summary) else 0
+
+    rows = []
+    try:
+        for run in range(args.runs):
+            shutil.rmtree(launcher_module.MINECRAFT_DIR, ignore_errors=True)
+            shutil.rmtree(launcher_module.JAVA_DIR, ignore_errors=True)
+            rows.extend(run_pipeline(launcher_module, f"cold{run + 1}", bytes_served))
+            rows.extend(run_pipeline(launcher_module, f"warm{run + 1}", bytes_served))
+    finally:
+        server.terminate()
+        shutil.rmtree(scratch, ignore_errors=True)
+
+    if args.json:
+        print(json.dumps(rows, indent=2))
+    else:
+        print_table(rows)
+    return 0 if all(row["ok"] for row in rows) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())